@@ -1,51 +1,186 @@
 import asyncio
 import sys
+from functools import partial
 
 from dotenv import load_dotenv
 
-from src.core.logger import logger, setup_logger
+from src.core.checkpoint import SnapshotCheckpoint
+from src.core.logger import logger, setup_logger, shutdown_logger
+from src.core.match_board import (
+    CoalescingRenderer,
+    LiveMatchBoard,
+    build_initial_dashboard_content,
+    publish_dashboard_content,
+)
+from src.core.memory import BYTES_PER_MB, MemoryGovernor
+from src.core.metrics import FreshnessTracker, StageTimer
 from src.core.monitoring import (
-    build_initial_dashboard_html,
+    ScraperRuntime,
+    attach_scraper,
+    build_metrics_report,
+    build_status_report,
     command_loop,
     monitor_loop,
+    shutdown_runtimes,
     start_bet365_scraper,
     start_winamax_scraper,
 )
-from src.core.settings import DASHBOARD_CONFIG, TEAM_NAME_MAPPINGS_PATH
-from src.engine.team_name_normalizer import load_team_name_mappings
+from src.core.profiling import ProfileCapture
+from src.core.settings import (
+    ALERT_COOLDOWN_SECONDS,
+    ALERT_QUEUE_SIZE,
+    ALERT_RING_SIZE,
+    ALERT_WEBHOOK_URL,
+    ALERTS_LOG_PATH,
+    ARBITRAGE_MIN_MARGIN,
+    BROWSER_RSS_LIMIT_MB,
+    DASHBOARD_CONFIG,
+    FRESHNESS_MAX_AGE_MS,
+    LINE_MOVEMENT_LAG_THRESHOLD,
+    LINE_MOVEMENT_MOVE_THRESHOLD,
+    LINE_MOVEMENT_WINDOW_SECONDS,
+    LOG_STRUCTURED,
+    MEMORY_MAX_DEFER_SECONDS,
+    MEMORY_MIN_RECYCLE_SECONDS,
+    MEMORY_QUIET_SECONDS,
+    MEMORY_SAMPLE_SECONDS,
+    MEMORY_TRACEMALLOC_FRAMES,
+    PAGE_RECYCLE_HOURS,
+    PROFILE_MAX_SECONDS,
+    PROFILES_DIR,
+    SCRAPER_MODE,
+    SHUTDOWN_TIMEOUT_SECONDS,
+    SNAPSHOT_CHECKPOINT_MAX_AGE_SECONDS,
+    SNAPSHOT_CHECKPOINT_PATH,
+    SNAPSHOT_CHECKPOINT_SECONDS,
+    TEAM_NAME_MAPPINGS_COMPACT_EVERY,
+    TEAM_NAME_MAPPINGS_COMPACT_SECONDS,
+    TEAM_NAME_MAPPINGS_FLUSH_SECONDS,
+    TEAM_NAME_MAPPINGS_JOURNAL_PATH,
+    TEAM_NAME_MAPPINGS_PATH,
+    TEAM_NAME_MAPPINGS_RELOAD_SECONDS,
+)
+from src.core.workers import start_process_scraper
+from src.engine.alerts import (
+    AlertBus,
+    AlertSink,
+    ConsoleAlertSink,
+    DashboardAlertSink,
+    FileAlertSink,
+    WebhookAlertSink,
+)
+from src.engine.line_movement import LineMovementDetector
+from src.engine.team_name_journal import TeamNameMappingsJournal
+from src.engine.team_name_normalizer import TeamNameNormalizer
 from src.ui.dashboard_server import (
     DashboardState,
     load_dashboard_assets,
     open_dashboard_windows,
     start_dashboard_server,
+    stop_dashboard_server,
 )
 
 
+async def _capture_profile_payload(
+    profile_capture: ProfileCapture, seconds: float
+) -> dict[str, object] | None:
+    report = await profile_capture.capture(seconds)
+    return report.to_payload() if report is not None else None
+
+
 async def main() -> None:
-    setup_logger("INFO")
+    setup_logger("INFO", structured=LOG_STRUCTURED)
     load_dotenv()
-    team_name_mappings = load_team_name_mappings(TEAM_NAME_MAPPINGS_PATH)
-    dashboard_state = DashboardState(team_name_mappings, TEAM_NAME_MAPPINGS_PATH)
+    mappings_journal = TeamNameMappingsJournal(
+        mapping_file=TEAM_NAME_MAPPINGS_PATH,
+        journal_file=TEAM_NAME_MAPPINGS_JOURNAL_PATH,
+        flush_interval_seconds=TEAM_NAME_MAPPINGS_FLUSH_SECONDS,
+        compact_every_entries=TEAM_NAME_MAPPINGS_COMPACT_EVERY,
+        compact_interval_seconds=TEAM_NAME_MAPPINGS_COMPACT_SECONDS,
+    )
+    team_name_normalizer = TeamNameNormalizer(
+        mappings_journal.load(),
+        mapping_file=TEAM_NAME_MAPPINGS_PATH,
+        loader=mappings_journal.load,
+    )
+    dashboard_state = DashboardState(team_name_normalizer, mappings_journal)
     dashboard_assets = load_dashboard_assets(DASHBOARD_CONFIG)
+    alert_sinks: list[AlertSink] = [
+        ConsoleAlertSink(),
+        FileAlertSink(ALERTS_LOG_PATH),
+        DashboardAlertSink(dashboard_state.push_alert),
+    ]
+    if ALERT_WEBHOOK_URL:
+        alert_sinks.append(WebhookAlertSink(ALERT_WEBHOOK_URL))
+    alert_bus = AlertBus(
+        alert_sinks,
+        cooldown_seconds=ALERT_COOLDOWN_SECONDS,
+        ring_size=ALERT_RING_SIZE,
+        queue_size=ALERT_QUEUE_SIZE,
+    )
+    stage_timer = StageTimer()
+    freshness = FreshnessTracker()
+    memory_governor = MemoryGovernor(
+        browser_rss_limit_bytes=int(BROWSER_RSS_LIMIT_MB * BYTES_PER_MB),
+        recycle_after_seconds=PAGE_RECYCLE_HOURS * 3600,
+        sample_seconds=MEMORY_SAMPLE_SECONDS,
+        quiet_seconds=MEMORY_QUIET_SECONDS,
+        max_defer_seconds=MEMORY_MAX_DEFER_SECONDS,
+        min_recycle_interval_seconds=MEMORY_MIN_RECYCLE_SECONDS,
+        tracemalloc_frames=MEMORY_TRACEMALLOC_FRAMES,
+    )
+    memory_governor.start_tracing()
+    profile_capture = ProfileCapture(stage_timer, PROFILES_DIR, max_seconds=PROFILE_MAX_SECONDS)
+    renderer = CoalescingRenderer(
+        dashboard_state,
+        dashboard_assets,
+        DASHBOARD_CONFIG,
+        stage_timer=stage_timer,
+    )
+    match_board = LiveMatchBoard(
+        team_name_normalizer,
+        dashboard_state,
+        dashboard_assets,
+        DASHBOARD_CONFIG,
+        alert_bus=alert_bus,
+        arbitrage_min_margin=ARBITRAGE_MIN_MARGIN,
+        line_movement=LineMovementDetector(
+            window_seconds=LINE_MOVEMENT_WINDOW_SECONDS,
+            move_threshold=LINE_MOVEMENT_MOVE_THRESHOLD,
+            lag_threshold=LINE_MOVEMENT_LAG_THRESHOLD,
+        ),
+        max_age_ms=FRESHNESS_MAX_AGE_MS,
+        freshness=freshness,
+        renderer=renderer,
+    )
+    dashboard_state.add_link_listener(match_board.apply_links)
     stop_event = asyncio.Event()
 
     logger.info("🚀 Iniciando monitor persistente Winamax + Bet365...")
-    winamax_runtime, bet365_runtime = await asyncio.gather(
-        start_winamax_scraper(), start_bet365_scraper()
+    publish_dashboard_content(
+        build_initial_dashboard_content(),
+        dashboard_state,
+        dashboard_assets,
+        DASHBOARD_CONFIG,
     )
-
-    if not winamax_runtime or not bet365_runtime:
-        logger.error("No se pudo inicializar uno o más scrapers. Abortando monitor.")
-        return
-
-    winamax_browser, winamax_scraper = winamax_runtime
-    bet365_browser, bet365_scraper = bet365_runtime
-
-    initial_html = build_initial_dashboard_html(
-        assets=dashboard_assets,
-        config=DASHBOARD_CONFIG,
+    winamax_runtime = ScraperRuntime("Winamax")
+    bet365_runtime = ScraperRuntime("Bet365")
+    snapshot_checkpoint = SnapshotCheckpoint(
+        SNAPSHOT_CHECKPOINT_PATH,
+        interval_seconds=SNAPSHOT_CHECKPOINT_SECONDS,
+        max_age_seconds=SNAPSHOT_CHECKPOINT_MAX_AGE_SECONDS,
     )
-    await dashboard_state.set_html(initial_html)
+    checkpoint = snapshot_checkpoint.load()
+    if checkpoint is not None:
+        for runtime in (winamax_runtime, bet365_runtime):
+            if runtime.name in checkpoint.matches_by_book:
+                runtime.restore(
+                    checkpoint.matches_by_book[runtime.name],
+                    expires_at=checkpoint.saved_at_by_book[runtime.name]
+                    + SNAPSHOT_CHECKPOINT_MAX_AGE_SECONDS,
+                )
+        match_board.restore(checkpoint, winamax_runtime.name, bet365_runtime.name)
+        logger.info(f"Dashboard restaurado con los datos de {checkpoint.saved_at_text}")
     dashboard_server = await start_dashboard_server(
         state=dashboard_state,
         config=DASHBOARD_CONFIG,
@@ -53,35 +188,87 @@ async def main() -> None:
     )
     open_dashboard_windows(DASHBOARD_CONFIG)
 
+    winamax_starter, bet365_starter = start_winamax_scraper, start_bet365_scraper
+    if SCRAPER_MODE == "process":
+        interval_seconds = DASHBOARD_CONFIG.scrape_interval_seconds
+        winamax_starter = partial(start_process_scraper, "winamax", interval_seconds)
+        bet365_starter = partial(start_process_scraper, "bet365", interval_seconds)
+    dashboard_state.set_metrics_provider(
+        lambda: build_metrics_report(
+            [winamax_runtime, bet365_runtime],
+            stage_timer,
+            freshness,
+            alert_bus,
+            memory_governor,
+            renderer,
+        )
+    )
+    dashboard_state.set_profile_provider(
+        lambda seconds: _capture_profile_payload(profile_capture, seconds)
+    )
+    attach_tasks = [
+        asyncio.create_task(attach_scraper(winamax_runtime, winamax_starter)),
+        asyncio.create_task(attach_scraper(bet365_runtime, bet365_starter)),
+    ]
+
     monitor_task = asyncio.create_task(
         monitor_loop(
-            winamax_scraper,
-            bet365_scraper,
-            team_name_mappings,
-            dashboard_state,
-            dashboard_assets,
+            winamax_runtime,
+            bet365_runtime,
+            match_board,
             DASHBOARD_CONFIG,
             stop_event,
+            stage_timer=stage_timer,
+            freshness=freshness,
+            memory_governor=memory_governor,
+            alert_bus=alert_bus,
         )
     )
     command_task = asyncio.create_task(
         command_loop(
             stop_event=stop_event,
             open_dashboard_callback=lambda: open_dashboard_windows(DASHBOARD_CONFIG),
+            status_callback=lambda: build_status_report(
+                [winamax_runtime, bet365_runtime], alert_bus, freshness, memory_governor
+            ),
+            profile_capture=profile_capture,
         )
     )
 
+    mappings_watch_task = asyncio.create_task(
+        team_name_normalizer.watch(stop_event, TEAM_NAME_MAPPINGS_RELOAD_SECONDS)
+    )
+    mappings_journal_task = asyncio.create_task(
+        mappings_journal.run(stop_event, team_name_normalizer)
+    )
+    alert_bus_task = asyncio.create_task(alert_bus.run(stop_event))
+    checkpoint_task = asyncio.create_task(
+        snapshot_checkpoint.run(stop_event, [winamax_runtime, bet365_runtime])
+    )
+
     try:
-        await asyncio.gather(monitor_task, command_task)
-    except KeyboardInterrupt:
-        stop_event.set()
+        await asyncio.gather(
+            monitor_task,
+            command_task,
+            mappings_watch_task,
+            mappings_journal_task,
+            alert_bus_task,
+            checkpoint_task,
+        )
     finally:
-        dashboard_server.close()
-        await dashboard_server.wait_closed()
-        await winamax_scraper.close()
-        await bet365_scraper.close()
-        await winamax_browser.stop()
-        await bet365_browser.stop()
+        # Con Ctrl+C asyncio.run cancela main() sin pasar por stop_event: los volcados
+        # finales del journal y del checkpoint se esperan antes de cerrar nada más
+        stop_event.set()
+        for attach_task in attach_tasks:
+            attach_task.cancel()
+        await asyncio.gather(mappings_journal_task, checkpoint_task, return_exceptions=True)
+        # Un arranque cancelado cierra su propio navegador o worker: se espera con el mismo plazo
+        await asyncio.wait(attach_tasks, timeout=SHUTDOWN_TIMEOUT_SECONDS)
+        await asyncio.gather(
+            stop_dashboard_server(dashboard_server, dashboard_state, SHUTDOWN_TIMEOUT_SECONDS),
+            shutdown_runtimes([winamax_runtime, bet365_runtime], SHUTDOWN_TIMEOUT_SECONDS),
+        )
+        shutdown_logger()
 
 
 if __name__ == "__main__":
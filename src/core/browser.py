@@ -1,39 +1,177 @@
-from camoufox.async_api import AsyncCamoufox
-from playwright.async_api import Browser, Page
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from src.core.logger import logger
+from src.core.memory import child_pids
+
+if TYPE_CHECKING:
+    from camoufox.async_api import AsyncCamoufox
+    from playwright.async_api import Browser, BrowserContext, Page
+
+DEFAULT_VIEWPORT = {"width": 1920, "height": 1080}
+LOW_RENDER_VIEWPORT = {"width": 1280, "height": 800}
+# Paneles multimedia que ningún selector lee (los iframes de login no se tocan)
+LOW_RENDER_HIDDEN_SELECTORS = (
+    "video",
+    "audio",
+    "iframe[src*='stream' i]",
+    "iframe[src*='video' i]",
+    "iframe[src*='player' i]",
+    "[class*='videoplayer' i]",
+    "[class*='mediaplayer' i]",
+    "[class*='livestream' i]",
+)
+# Se inyecta en cada documento del contexto antes de que cargue la SPA
+_LOW_RENDER_INIT_SCRIPT = """(() => {
+    const css = %s;
+    const apply = () => {
+        const style = document.createElement("style");
+        style.dataset.bethurtadom = "low-render";
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.documentElement) {
+        apply();
+    } else {
+        document.addEventListener("DOMContentLoaded", apply, { once: true });
+    }
+})();"""
+# Los arranques se serializan para atribuir a cada navegador los procesos hijos que crea
+_LAUNCH_LOCK = asyncio.Lock()
+
+
+@dataclass(frozen=True)
+class LowRenderProfile:
+    """Perfil de bajo coste de render para pestañas que solo se leen.
+
+    Sin animaciones ni transiciones, sin paneles multimedia, viewport menor y
+    Firefox limitado a `frame_rate` fotogramas por segundo. Los datos siguen en el
+    DOM con su texto visible: solo se ocultan elementos que ningún selector lee.
+    """
+
+    viewport: dict[str, int] = field(default_factory=lambda: dict(LOW_RENDER_VIEWPORT))
+    hidden_selectors: tuple[str, ...] = LOW_RENDER_HIDDEN_SELECTORS
+    frame_rate: int = 10
+
+    def css(self) -> str:
+        """Hoja de estilos que se inyecta en cada documento."""
+        rules = [
+            "*, *::before, *::after { animation: none !important; "
+            "transition: none !important; scroll-behavior: auto !important; }"
+        ]
+        if self.hidden_selectors:
+            rules.append(f"{', '.join(self.hidden_selectors)} {{ display: none !important; }}")
+        return "\n".join(rules)
+
+    def firefox_prefs(self) -> dict[str, object]:
+        """Preferencias de Firefox que recortan trabajo de pintado y multimedia."""
+        return {
+            "layout.frame_rate": self.frame_rate,
+            "ui.prefersReducedMotion": 1,
+            "image.animation_mode": "none",
+            "media.autoplay.default": 5,
+        }
 
 
 class BrowserManager:
-    """Gestiona el ciclo de vida del navegador con Camoufox y configuración estándar."""
+    """Gestiona el ciclo de vida del navegador con Camoufox y configuración estándar.
+
+    Camoufox y Playwright se importan al arrancar el navegador, no al importar el
+    módulo, para que el dashboard pueda servirse antes de cargar esas librerías.
 
-    def __init__(self, headless: bool = False) -> None:
+    Si se indica `profile_dir`, el navegador arranca con un directorio de usuario
+    persistente (cookies, localStorage, consentimientos) y exporta además el
+    `storage_state.json` al cerrar, de modo que los reinicios parten de la sesión
+    anterior en lugar de un perfil vacío.
+
+    Con `render_profile` todas las páginas del contexto usan el perfil de bajo
+    render (ver `LowRenderProfile`). `headless` admite `"virtual"` (pantalla
+    virtual de Camoufox), que no pinta en pantalla pero conserva la huella de un
+    navegador con ventana.
+    """
+
+    def __init__(
+        self,
+        headless: bool | str = False,
+        profile_dir: Path | None = None,
+        render_profile: LowRenderProfile | None = None,
+    ) -> None:
         self.headless = headless
+        self.profile_dir = profile_dir
+        self.render_profile = render_profile
         self._camoufox: AsyncCamoufox | None = None
         self._browser: Browser | None = None
+        self._context: BrowserContext | None = None
         self._page: Page | None = None
+        self._is_warm_profile = False
+        self.process_pids: list[int] = []
+
+    @property
+    def storage_state_path(self) -> Path | None:
+        """Ruta del `storage_state.json` del perfil, si hay perfil persistente."""
+        if self.profile_dir is None:
+            return None
+        return self.profile_dir / "storage_state.json"
+
+    @property
+    def viewport(self) -> dict[str, int]:
+        """Viewport de las páginas (menor con el perfil de bajo render)."""
+        if self.render_profile is not None:
+            return self.render_profile.viewport
+        return DEFAULT_VIEWPORT
+
+    def _launch_options(self) -> dict[str, object]:
+        options: dict[str, object] = {
+            "headless": self.headless,
+            "os": "windows",
+            "geoip": True,
+            "humanize": True,
+        }
+        if self.render_profile is not None:
+            options["firefox_user_prefs"] = self.render_profile.firefox_prefs()
+        return options
+
+    async def _apply_render_profile(self) -> None:
+        """Registra el CSS de bajo render para todos los documentos del contexto."""
+        if self.render_profile is None or not self._context:
+            return
+        await self._context.add_init_script(
+            _LOW_RENDER_INIT_SCRIPT % json.dumps(self.render_profile.css())
+        )
+        logger.info(
+            f"🪶 Perfil de bajo render activo ({self.viewport['width']}x"
+            f"{self.viewport['height']}, {self.render_profile.frame_rate} fps)"
+        )
+
+    async def _prepare_page(self, page: Page) -> Page:
+        await page.set_viewport_size(self.viewport)
+        if self.render_profile is not None:
+            await page.emulate_media(reduced_motion="reduce")
+        return page
+
+    @property
+    def is_warm_profile(self) -> bool:
+        """Indica si el perfil ya contenía datos de una sesión anterior."""
+        return self._is_warm_profile
 
     async def start(self) -> None:
         """Inicia Camoufox con resolución estándar humana."""
-        if not self._browser:
+        if not self._context:
             try:
                 logger.info("🦊 Lanzando Camoufox (Resolución Estándar)...")
+                async with _LAUNCH_LOCK:
+                    children_before = child_pids(os.getpid())
+                    if self.profile_dir is not None:
+                        await self._start_persistent()
+                    else:
+                        await self._start_ephemeral()
+                    self.process_pids = sorted(child_pids(os.getpid()) - children_before)
 
-                self._camoufox = AsyncCamoufox(
-                    headless=self.headless,
-                    os="windows",
-                    geoip=True,
-                    humanize=True,
-                )
-
-                self._browser = await self._camoufox.start()  # type: ignore
-
-                if self._browser:
-                    # Usamos una resolución estándar de 1080p
-                    context = await self._browser.new_context(
-                        viewport={"width": 1920, "height": 1080}
-                    )
-                    self._page = await context.new_page()
+                if self._page:
                     logger.info("✅ Camoufox iniciado correctamente.")
                 else:
                     logger.error("❌ El motor de Camoufox no devolvió un navegador válido.")
@@ -41,19 +179,112 @@ class BrowserManager:
             except Exception as e:
                 logger.error(f"❌ Error crítico al iniciar el navegador: {e}")
                 self._browser = None
+                self._context = None
                 self._page = None
                 raise
 
+    async def _start_ephemeral(self) -> None:
+        from camoufox.async_api import AsyncCamoufox
+
+        self._camoufox = AsyncCamoufox(**self._launch_options())
+        self._browser = await self._camoufox.start()  # type: ignore
+
+        if self._browser:
+            # Resolución estándar de 1080p salvo con el perfil de bajo render
+            self._context = await self._browser.new_context(viewport=self.viewport)
+            await self._apply_render_profile()
+            self._page = await self._prepare_page(await self._context.new_page())
+
+    async def _start_persistent(self) -> None:
+        user_data_dir = self.profile_dir / "user-data"
+        self._is_warm_profile = user_data_dir.exists() and any(user_data_dir.iterdir())
+        user_data_dir.mkdir(parents=True, exist_ok=True)
+        logger.info(
+            f"🗂️ Perfil persistente {'reutilizado' if self._is_warm_profile else 'nuevo'}: "
+            f"{user_data_dir}"
+        )
+
+        from camoufox.async_api import AsyncCamoufox
+
+        self._camoufox = AsyncCamoufox(
+            **self._launch_options(),
+            persistent_context=True,
+            user_data_dir=str(user_data_dir),
+        )
+        self._context = await self._camoufox.start()  # type: ignore
+
+        if self._context:
+            if not self._is_warm_profile:
+                await self._restore_cookies()
+            await self._apply_render_profile()
+            self._page = await self._prepare_page(
+                self._context.pages[0] if self._context.pages else await self._context.new_page()
+            )
+
+    async def _restore_cookies(self) -> None:
+        """Siembra un perfil nuevo con las cookies del último `storage_state.json`."""
+        storage_state_path = self.storage_state_path
+        if not self._context or not storage_state_path or not storage_state_path.exists():
+            return
+        try:
+            storage_state = json.loads(storage_state_path.read_text("utf-8"))
+            cookies = storage_state.get("cookies", [])
+            if cookies:
+                await self._context.add_cookies(cookies)
+                logger.info(f"🍪 Restauradas {len(cookies)} cookies desde {storage_state_path}")
+        except (OSError, ValueError) as error:
+            logger.warning(f"No se pudo restaurar storage_state: {error}")
+
+    async def save_storage_state(self) -> None:
+        """Exporta cookies y localStorage del contexto al perfil persistente."""
+        storage_state_path = self.storage_state_path
+        if not self._context or not storage_state_path:
+            return
+        try:
+            await self._context.storage_state(path=str(storage_state_path))
+            logger.debug(f"BrowserManager: storage_state guardado en {storage_state_path}")
+        except Exception as error:  # noqa: BLE001
+            logger.warning(f"No se pudo guardar storage_state: {error}")
+
     async def get_new_page(self) -> Page:
         """Devuelve la página activa."""
         if not self._page:
             await self.start()
         return self._page
 
+    async def open_page(self) -> Page:
+        """Abre una pestaña adicional en el mismo contexto (misma sesión y cookies)."""
+        if not self._context:
+            await self.start()
+        return await self._prepare_page(await self._context.new_page())
+
+    async def recycle_page(self) -> Page:
+        """Sustituye la página activa por una nueva en el mismo contexto y cierra la vieja.
+
+        La sesión (cookies, localStorage) se conserva; lo que se libera es el heap
+        de la SPA acumulado en la pestaña anterior.
+        """
+        if not self._context:
+            await self.start()
+            return self._page
+        old_page = self._page
+        self._page = await self._prepare_page(await self._context.new_page())
+        if old_page is not None:
+            try:
+                await old_page.close()
+            except Exception as error:  # noqa: BLE001
+                logger.warning(f"No se pudo cerrar la página reciclada: {error}")
+        return self._page
+
     async def stop(self) -> None:
-        """Cierra el navegador."""
+        """Guarda la sesión del perfil (si lo hay) y cierra el navegador."""
         logger.debug("BrowserManager: Cerrando recursos...")
+        await self.save_storage_state()
         if self._browser:
             await self._browser.close()
-            self._browser = None
-            self._page = None
+        elif self._context:
+            await self._context.close()
+        self._browser = None
+        self._context = None
+        self._page = None
+        self.process_pids = []
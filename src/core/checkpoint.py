@@ -0,0 +1,193 @@
+import asyncio
+import contextlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import ValidationError
+
+from src.core.logger import logger
+from src.models.odds import MatchInfo
+
+if TYPE_CHECKING:
+    from src.core.monitoring import ScraperRuntime
+
+CHECKPOINT_FORMAT_VERSION = 2
+
+
+@dataclass(frozen=True)
+class BoardCheckpoint:
+    """Últimos partidos conocidos de cada casa y cuándo se confirmaron en directo."""
+
+    saved_at_by_book: dict[str, float]
+    matches_by_book: dict[str, list[MatchInfo]]
+
+    @property
+    def saved_at(self) -> float:
+        """Epoch de la casa guardada más recientemente."""
+        return max(self.saved_at_by_book.values(), default=0.0)
+
+    @property
+    def saved_at_text(self) -> str:
+        """Hora de guardado legible para el dashboard."""
+        return datetime.fromtimestamp(self.saved_at).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def serialize_checkpoint(checkpoint: BoardCheckpoint) -> bytes:
+    """JSON compacto: sin espacios y sin los campos que tienen su valor por defecto."""
+    payload = {
+        "format": CHECKPOINT_FORMAT_VERSION,
+        "books": {
+            book: {
+                "saved_at": checkpoint.saved_at_by_book[book],
+                "matches": [match.model_dump(exclude_defaults=True) for match in matches],
+            }
+            for book, matches in checkpoint.matches_by_book.items()
+        },
+    }
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def parse_checkpoint(data: bytes) -> BoardCheckpoint | None:
+    """Reconstruye el checkpoint; None si el formato no es el esperado."""
+    try:
+        payload = json.loads(data)
+        if payload.get("format") != CHECKPOINT_FORMAT_VERSION:
+            return None
+        books = payload["books"]
+        return BoardCheckpoint(
+            saved_at_by_book={book: float(entry["saved_at"]) for book, entry in books.items()},
+            matches_by_book={
+                book: [MatchInfo.model_validate(match) for match in entry["matches"]]
+                for book, entry in books.items()
+            },
+        )
+    except json.JSONDecodeError, KeyError, TypeError, ValueError, ValidationError:
+        return None
+
+
+class SnapshotCheckpoint:
+    """Guarda periódicamente los últimos partidos de cada casa para arrancar en caliente.
+
+    Al arrancar, el dashboard y el emparejador salen con los últimos datos conocidos
+    marcados como no confirmados hasta que cada scraper entrega su primer tick en
+    directo. Cada casa guarda la hora en que sus partidos se vieron en directo por
+    última vez: una casa que sigue sin confirmar se vuelve a escribir con su hora
+    original, así que caduca a los `max_age_seconds` aunque la otra siga guardando.
+    Los enlaces resueltos no se guardan aquí: viven en el JSON y el journal de
+    mapeos, y el emparejado se recalcula con ellos al restaurar. La escritura va a
+    un temporal + `os.replace` en un hilo, así que un cierre a mitad deja intacto el
+    checkpoint anterior.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        interval_seconds: float = 30.0,
+        max_age_seconds: float = 1800.0,
+    ) -> None:
+        self._path = path
+        self._interval_seconds = interval_seconds
+        self._max_age_seconds = max_age_seconds
+        self._saved_lists: dict[str, list[MatchInfo]] = {}
+        self._saved_at_by_book: dict[str, float] = {}
+        self.saves = 0
+
+    def load(self) -> BoardCheckpoint | None:
+        """Lee el último checkpoint sin las casas demasiado viejas; None si no queda ninguna."""
+        try:
+            data = self._path.read_bytes()
+        except OSError:
+            return None
+        if not data:
+            return None
+
+        checkpoint = parse_checkpoint(data)
+        if checkpoint is None:
+            logger.warning(f"Checkpoint del dashboard ilegible, se ignora: {self._path}")
+            return None
+        now = time.time()
+        fresh_books = []
+        for book, saved_at in checkpoint.saved_at_by_book.items():
+            age_seconds = now - saved_at
+            if age_seconds > self._max_age_seconds:
+                logger.info(f"Checkpoint de {book} de hace {age_seconds / 60:.0f} min, se ignora")
+            else:
+                fresh_books.append(book)
+        if not fresh_books:
+            return None
+
+        self._saved_at_by_book = {book: checkpoint.saved_at_by_book[book] for book in fresh_books}
+        return BoardCheckpoint(
+            saved_at_by_book=dict(self._saved_at_by_book),
+            matches_by_book={book: checkpoint.matches_by_book[book] for book in fresh_books},
+        )
+
+    def _write(self, checkpoint: BoardCheckpoint) -> int:
+        data = serialize_checkpoint(checkpoint)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self._path.with_suffix(".tmp")
+        with temporary_path.open("wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self._path)
+        return len(data)
+
+    async def save(self, runtimes: list[ScraperRuntime]) -> bool:
+        """Guarda los partidos de las casas que ya tienen datos en directo (si cambiaron).
+
+        Las casas todavía sin confirmar conservan lo que había en el checkpoint
+        anterior con su hora original, porque su `last_matches` es precisamente eso.
+        """
+        if not any(runtime.ready and not runtime.stale for runtime in runtimes):
+            return False
+        now = time.time()
+        matches_by_book: dict[str, list[MatchInfo]] = {}
+        saved_at_by_book: dict[str, float] = {}
+        for runtime in runtimes:
+            if runtime.stale:
+                saved_at = self._saved_at_by_book.get(runtime.name)
+                if saved_at is None:
+                    continue
+            elif runtime.ready:
+                saved_at = now
+            else:
+                continue
+            matches_by_book[runtime.name] = runtime.last_matches
+            saved_at_by_book[runtime.name] = saved_at
+        # Las listas se sustituyen en cada tick: la misma lista = nada nuevo que guardar
+        if matches_by_book.keys() == self._saved_lists.keys() and all(
+            matches is self._saved_lists[book] for book, matches in matches_by_book.items()
+        ):
+            return False
+
+        size_bytes = await asyncio.to_thread(
+            self._write,
+            BoardCheckpoint(saved_at_by_book=saved_at_by_book, matches_by_book=matches_by_book),
+        )
+        self._saved_lists = matches_by_book
+        self._saved_at_by_book = saved_at_by_book
+        self.saves += 1
+        logger.debug(f"Checkpoint del dashboard guardado ({size_bytes / 1024:.0f} KB)")
+        return True
+
+    async def run(self, stop_event: asyncio.Event, runtimes: list[ScraperRuntime]) -> None:
+        """Guarda cada `interval_seconds` y una última vez al detener o cancelar el monitor."""
+        try:
+            while not stop_event.is_set():
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(stop_event.wait(), timeout=self._interval_seconds)
+                try:
+                    await self.save(runtimes)
+                except OSError as error:
+                    logger.error(f"No se pudo guardar el checkpoint del dashboard: {error}")
+        finally:
+            try:
+                await self.save(runtimes)
+            except OSError as error:
+                logger.error(f"No se pudo guardar el checkpoint del dashboard: {error}")
@@ -1,10 +1,18 @@
+import atexit
+import json
 import logging
+import queue
 import sys
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Literal
 
 # Definición de tipos para los niveles estándar
 LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR"]
 
+# Campos extra (logger.info(..., extra={...})) que se vuelcan en modo estructurado
+STRUCTURED_FIELDS = ("bookmaker", "stage", "stage_timings", "duration_ms")
+
 
 class ColorFormatter(logging.Formatter):
     """Formatter personalizado para añadir colores a los logs en consola."""
@@ -27,13 +35,50 @@ class ColorFormatter(logging.Formatter):
         logging.CRITICAL: BOLD_RED,
     }
 
+    def __init__(self) -> None:
+        super().__init__(self.FORMAT)
+        # Un formatter precompilado por nivel en lugar de uno nuevo por registro
+        self._level_formatters = {
+            level: logging.Formatter(f"{color}{self.FORMAT}{self.RESET}")
+            for level, color in self.LEVEL_COLORS.items()
+        }
+        self._default_formatter = logging.Formatter(f"{self.RESET}{self.FORMAT}{self.RESET}")
+
     def format(self, record: logging.LogRecord) -> str:
-        log_color = self.LEVEL_COLORS.get(record.levelno, self.RESET)
-        format_str = f"{log_color}{self.FORMAT}{self.RESET}"
-        formatter = logging.Formatter(format_str)
+        formatter = self._level_formatters.get(record.levelno, self._default_formatter)
         return formatter.format(record)
 
 
+class JsonLinesFormatter(logging.Formatter):
+    """Formatter estructurado: una línea JSON por registro con los campos extra conocidos."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, object] = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        for field_name in STRUCTURED_FIELDS:
+            if hasattr(record, field_name):
+                payload[field_name] = getattr(record, field_name)
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """`QueueHandler` que encola el registro tal cual, sin formatearlo.
+
+    El `prepare()` de la librería formatea en el hilo que llama y borra `exc_info`:
+    el traceback acabaría pegado a `message` y el formatter JSON nunca rellenaría
+    `exception`. La cola no sale del proceso, así que no hace falta que el registro
+    sea serializable; el hilo escritor lo formatea entero.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
 class InfoFilter(logging.Filter):
     """Filtro para permitir solo niveles INFO y DEBUG en stdout."""
 
@@ -41,12 +86,29 @@ class InfoFilter(logging.Filter):
         return record.levelno <= logging.INFO
 
 
-def setup_logger(level: LogLevel = "INFO") -> logging.Logger:
-    """Configura y devuelve el logger principal con nombres estándar y colores."""
+_listener: QueueListener | None = None
+
+
+def shutdown_logger() -> None:
+    """Vacía la cola de logs y detiene el hilo escritor."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logger(level: LogLevel = "INFO", structured: bool = False) -> logging.Logger:
+    """Configura y devuelve el logger principal con nombres estándar y colores.
+
+    El logger solo encola registros (`QueueHandler`); un hilo `QueueListener` los
+    formatea y escribe en stdout/stderr, así que el event loop nunca se bloquea
+    escribiendo en consola. Con `structured=True` cada línea es un objeto JSON.
+    """
     logger = logging.getLogger("bethurtadom")
 
     if logger.hasHandlers():
         logger.handlers.clear()
+    shutdown_logger()
 
     # Mapeo directo a constantes de logging
     level_map = {
@@ -57,22 +119,35 @@ def setup_logger(level: LogLevel = "INFO") -> logging.Logger:
     }
 
     logger.setLevel(level_map.get(level, logging.INFO))
-    formatter = ColorFormatter()
+    logger.propagate = False
+    formatter = JsonLinesFormatter() if structured else ColorFormatter()
 
     # Handler para STDOUT (DEBUG e INFO)
     stdout_handler = logging.StreamHandler(sys.stdout)
     stdout_handler.setFormatter(formatter)
     stdout_handler.addFilter(InfoFilter())
-    logger.addHandler(stdout_handler)
 
     # Handler para STDERR (WARNING y ERROR)
     stderr_handler = logging.StreamHandler(sys.stderr)
     stderr_handler.setFormatter(formatter)
     stderr_handler.setLevel(logging.WARNING)
-    logger.addHandler(stderr_handler)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    logger.addHandler(DeferredQueueHandler(log_queue))
+
+    global _listener
+    _listener = QueueListener(
+        log_queue,
+        stdout_handler,
+        stderr_handler,
+        respect_handler_level=True,
+    )
+    _listener.start()
 
     return logger
 
 
+atexit.register(shutdown_logger)
+
 # Instancia global por defecto
-logger = setup_logger("DEBUG")
+logger = setup_logger("INFO")
@@ -0,0 +1,526 @@
+import asyncio
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from functools import partial
+
+from src.core.checkpoint import BoardCheckpoint
+from src.core.logger import logger
+from src.core.metrics import FreshnessTracker, StageTimer
+from src.engine.alerts import AlertBus
+from src.engine.candidates import build_link_suggestions
+from src.engine.discrepancies import (
+    build_pair_key,
+    detect_score_mismatches,
+    filter_fresh_pairs,
+    format_pair_label,
+)
+from src.engine.line_movement import LineMovementDetector
+from src.engine.odds_matrix import OddsMatrix, build_arbitrage_alerts
+from src.engine.team_name_normalizer import TeamNameNormalizer, fold_team_name
+from src.models.odds import MatchInfo
+from src.ui.dashboard_renderer import (
+    DashboardContent,
+    build_dashboard_state,
+    build_dashboard_suggestions,
+    build_rows_by_linked_pairs,
+    build_rows_by_minute,
+    render_dashboard_html,
+)
+from src.ui.dashboard_server import (
+    DashboardAssets,
+    DashboardServerConfig,
+    DashboardSnapshot,
+    DashboardState,
+    LinkRequestPayload,
+    build_dashboard_snapshot,
+)
+
+
+def build_match_key(home_team: str, away_team: str) -> tuple[str, str]:
+    return (fold_team_name(home_team), fold_team_name(away_team))
+
+
+def split_linked_and_pending_matches(
+    winamax_raw_matches: list[MatchInfo],
+    winamax_normalized_matches: list[MatchInfo],
+    bet365_matches: list[MatchInfo],
+) -> tuple[
+    list[tuple[MatchInfo, MatchInfo]],
+    list[MatchInfo],
+    list[MatchInfo],
+    list[MatchInfo],
+    list[MatchInfo],
+    list[MatchInfo],
+]:
+    """Separa partidos enlazados por nombres normalizados y pendientes de enlazar."""
+    bet365_by_key: dict[tuple[str, str], deque[int]] = defaultdict(deque)
+    for bet365_index, bet365_match in enumerate(bet365_matches):
+        bet365_by_key[build_match_key(bet365_match.home_team, bet365_match.away_team)].append(
+            bet365_index
+        )
+
+    linked_pairs: list[tuple[MatchInfo, MatchInfo]] = []
+    linked_winamax: list[MatchInfo] = []
+    linked_bet365: list[MatchInfo] = []
+    pending_winamax_raw: list[MatchInfo] = []
+    pending_winamax_normalized: list[MatchInfo] = []
+    used_bet365_indexes: set[int] = set()
+
+    for index, normalized_match in enumerate(winamax_normalized_matches):
+        key = build_match_key(normalized_match.home_team, normalized_match.away_team)
+        available_indexes = bet365_by_key.get(key)
+
+        if available_indexes:
+            bet365_index = available_indexes.popleft()
+            linked_winamax.append(normalized_match)
+            linked_bet365.append(bet365_matches[bet365_index])
+            linked_pairs.append((normalized_match, bet365_matches[bet365_index]))
+            used_bet365_indexes.add(bet365_index)
+            continue
+
+        pending_winamax_raw.append(winamax_raw_matches[index])
+        pending_winamax_normalized.append(normalized_match)
+
+    pending_bet365 = [
+        bet365_match
+        for bet365_index, bet365_match in enumerate(bet365_matches)
+        if bet365_index not in used_bet365_indexes
+    ]
+
+    return (
+        linked_pairs,
+        linked_winamax,
+        linked_bet365,
+        pending_winamax_raw,
+        pending_winamax_normalized,
+        pending_bet365,
+    )
+
+
+def build_initial_dashboard_content() -> DashboardContent:
+    """Construye el contenido inicial mientras los scrapers cargan datos reales."""
+    return DashboardContent(
+        linked_rows=[
+            ("--", "No hay partidos enlazados todavía.", "No hay partidos enlazados todavía.")
+        ],
+        pending_rows=[("--", "Cargando Winamax...", "Cargando Bet365...")],
+        winamax_total=0,
+        bet365_total=0,
+        linked_total=0,
+        pending_total=0,
+        last_update="iniciando",
+        winamax_pending_raw_matches=[],
+        bet365_pending_matches=[],
+    )
+
+
+def publish_dashboard_content(
+    content: DashboardContent,
+    dashboard_state: DashboardState,
+    dashboard_assets: DashboardAssets,
+    dashboard_config: DashboardServerConfig,
+) -> None:
+    """Renderiza el contenido y lo publica como nuevo snapshot del dashboard."""
+    html_content = render_dashboard_html(
+        dashboard_template=dashboard_assets.template,
+        refresh_seconds=dashboard_config.refresh_seconds,
+        content=content,
+        client_rendering=dashboard_config.client_rendering,
+    )
+    dashboard_state.publish(
+        html_content,
+        build_dashboard_state(content),
+        build_dashboard_suggestions(content),
+    )
+
+
+def build_board_content(
+    linked_pairs: list[tuple[MatchInfo, MatchInfo]],
+    pending_winamax_raw: list[MatchInfo],
+    pending_winamax_normalized: list[MatchInfo],
+    pending_bet365: list[MatchInfo],
+    winamax_total: int,
+    bet365_total: int,
+    last_update: str,
+    stale_books: tuple[str, ...] = (),
+) -> DashboardContent:
+    """Construye filas, totales y sugerencias del dashboard a partir de un emparejamiento."""
+    return DashboardContent(
+        linked_rows=build_rows_by_linked_pairs(
+            linked_pairs,
+            empty_message="No hay partidos enlazados todavía.",
+        ),
+        pending_rows=build_rows_by_minute(
+            pending_winamax_normalized,
+            pending_bet365,
+            empty_message="No hay partidos pendientes por enlazar.",
+        ),
+        winamax_total=winamax_total,
+        bet365_total=bet365_total,
+        linked_total=len(linked_pairs),
+        pending_total=max(len(pending_winamax_normalized), len(pending_bet365)),
+        last_update=last_update,
+        winamax_pending_raw_matches=pending_winamax_raw,
+        bet365_pending_matches=pending_bet365,
+        link_suggestions=build_link_suggestions(pending_winamax_normalized, pending_bet365),
+        stale_books=stale_books,
+    )
+
+
+def render_dashboard_snapshot(
+    content: DashboardContent,
+    version: int,
+    dashboard_assets: DashboardAssets,
+    dashboard_config: DashboardServerConfig,
+) -> DashboardSnapshot:
+    """Renderiza HTML, estado y sugerencias y los codifica en un snapshot (sin tocar el bucle)."""
+    html_content = render_dashboard_html(
+        dashboard_template=dashboard_assets.template,
+        refresh_seconds=dashboard_config.refresh_seconds,
+        content=content,
+        client_rendering=dashboard_config.client_rendering,
+    )
+    return build_dashboard_snapshot(
+        version,
+        html_content,
+        build_dashboard_state(content),
+        build_dashboard_suggestions(content),
+    )
+
+
+class CoalescingRenderer:
+    """Renderiza el dashboard en un hilo y publica solo el último contenido pendiente.
+
+    `submit()` no bloquea: guarda la función que construye el contenido y, si no hay
+    un render en curso, lanza uno en `asyncio.to_thread` (filas, sugerencias, HTML y
+    JSON se calculan allí). Si llegan varios contenidos mientras se renderiza, solo
+    se conserva el último y los intermedios se descartan, así que un render lento
+    nunca retrasa el siguiente scrape ni las respuestas HTTP y la cola nunca pasa de
+    un render en curso más uno pendiente.
+    """
+
+    def __init__(
+        self,
+        dashboard_state: DashboardState,
+        dashboard_assets: DashboardAssets,
+        dashboard_config: DashboardServerConfig,
+        stage_timer: StageTimer | None = None,
+    ) -> None:
+        self._dashboard_state = dashboard_state
+        self._dashboard_assets = dashboard_assets
+        self._dashboard_config = dashboard_config
+        self._stage_timer = stage_timer or StageTimer()
+        self._pending: Callable[[], DashboardContent] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self.submitted = 0
+        self.rendered = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def rendering(self) -> bool:
+        """Indica si hay un render en curso."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def queue_depth(self) -> int:
+        """Contenidos aún sin publicar: el pendiente y el que se está renderizando."""
+        return (self._pending is not None) + self.rendering
+
+    def submit(self, build_content: Callable[[], DashboardContent]) -> None:
+        """Encola un contenido para renderizar; sustituye al pendiente si lo había."""
+        self.submitted += 1
+        if self._pending is not None:
+            self.dropped += 1
+        self._pending = build_content
+        if not self.rendering:
+            self._task = asyncio.create_task(self._drain(), name="dashboard-render")
+
+    async def _drain(self) -> None:
+        while self._pending is not None:
+            build_content, self._pending = self._pending, None
+            # Un solo render a la vez: la versión reservada no la puede adelantar nadie
+            version = self._dashboard_state.snapshot.version + 1
+            started_at = time.perf_counter()
+            try:
+                snapshot = await asyncio.to_thread(self._render, build_content, version)
+            except Exception as error:  # noqa: BLE001
+                self.failed += 1
+                logger.exception(f"Error renderizando el dashboard: {error}")
+                continue
+            self._stage_timer.record("render", (time.perf_counter() - started_at) * 1000)
+            if self._dashboard_state.publish_snapshot(snapshot):
+                self.rendered += 1
+
+    def _render(
+        self,
+        build_content: Callable[[], DashboardContent],
+        version: int,
+    ) -> DashboardSnapshot:
+        return render_dashboard_snapshot(
+            build_content(),
+            version,
+            self._dashboard_assets,
+            self._dashboard_config,
+        )
+
+    def snapshot(self) -> dict[str, object]:
+        """Contadores serializables para `/api/metrics`."""
+        return {
+            "queue_depth": self.queue_depth,
+            "rendering": self.rendering,
+            "submitted": self.submitted,
+            "rendered": self.rendered,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+class LiveMatchBoard:
+    """Último emparejamiento Winamax/Bet365 publicado en el dashboard.
+
+    Guarda las listas del último tick para poder re-emparejar al instante cuando
+    el usuario enlaza un partido, sin esperar a un nuevo scrape. Con `renderer` el
+    HTML se renderiza fuera del bucle de eventos; sin él, en línea.
+    """
+
+    def __init__(
+        self,
+        team_name_normalizer: TeamNameNormalizer,
+        dashboard_state: DashboardState,
+        dashboard_assets: DashboardAssets,
+        dashboard_config: DashboardServerConfig,
+        alert_bus: AlertBus | None = None,
+        odds_matrix: OddsMatrix | None = None,
+        arbitrage_min_margin: float = 0.0,
+        line_movement: LineMovementDetector | None = None,
+        max_age_ms: float | None = None,
+        freshness: FreshnessTracker | None = None,
+        renderer: CoalescingRenderer | None = None,
+    ) -> None:
+        self._team_name_normalizer = team_name_normalizer
+        self._alert_bus = alert_bus
+        self._odds_matrix = odds_matrix or OddsMatrix()
+        self._arbitrage_min_margin = arbitrage_min_margin
+        self._line_movement = line_movement or LineMovementDetector()
+        self._max_age_ms = max_age_ms
+        self._freshness = freshness
+        self._renderer = renderer
+        self._dashboard_state = dashboard_state
+        self._dashboard_assets = dashboard_assets
+        self._dashboard_config = dashboard_config
+        self._winamax_total = 0
+        self._bet365_total = 0
+        self._linked_pairs: list[tuple[MatchInfo, MatchInfo]] = []
+        self._pending_winamax_raw: list[MatchInfo] = []
+        self._pending_winamax_normalized: list[MatchInfo] = []
+        self._pending_bet365: list[MatchInfo] = []
+        self._last_update = "iniciando"
+        self._stale_books: tuple[str, ...] = ()
+
+    @property
+    def linked_pairs(self) -> list[tuple[MatchInfo, MatchInfo]]:
+        """Parejas enlazadas del último emparejamiento."""
+        return self._linked_pairs
+
+    def update(
+        self,
+        winamax_raw_matches: list[MatchInfo],
+        bet365_matches: list[MatchInfo],
+        stale_books: Sequence[str] = (),
+        updated_at: str | None = None,
+    ) -> None:
+        """Empareja un tick completo de ambos scrapers y publica el dashboard.
+
+        `stale_books` son las casas cuyos partidos aún vienen del checkpoint de la
+        sesión anterior: se pintan marcados y no pasan por los detectores.
+        """
+        winamax_matches = self._team_name_normalizer.normalize_matches(
+            "winamax",
+            [match.model_copy(deep=True) for match in winamax_raw_matches],
+        )
+
+        (
+            linked_pairs,
+            _linked_winamax,
+            _linked_bet365,
+            pending_winamax_raw,
+            pending_winamax_normalized,
+            pending_bet365,
+        ) = split_linked_and_pending_matches(
+            winamax_raw_matches,
+            winamax_matches,
+            bet365_matches,
+        )
+
+        self._winamax_total = len(winamax_matches)
+        self._bet365_total = len(bet365_matches)
+        self._linked_pairs = linked_pairs
+        self._pending_winamax_raw = pending_winamax_raw
+        self._pending_winamax_normalized = pending_winamax_normalized
+        self._pending_bet365 = pending_bet365
+        self._stale_books = tuple(stale_books)
+        self._last_update = updated_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if self._stale_books:
+            self._last_update += (
+                f" · ⚠️ sin confirmar ({', '.join(self._stale_books)}): datos de la sesión anterior"
+            )
+        linked_keys = [build_pair_key(winamax, bet365) for winamax, bet365 in linked_pairs]
+        self._odds_matrix.retain(linked_keys)
+        self._line_movement.retain(linked_keys)
+        if self._freshness is not None and not self._stale_books:
+            for winamax_match, bet365_match in linked_pairs:
+                if None not in (winamax_match.observed_at_ms, bet365_match.observed_at_ms):
+                    self._freshness.observe_skew(
+                        winamax_match.observed_at_ms - bet365_match.observed_at_ms
+                    )
+        self.detect(linked_pairs)
+        self.publish()
+
+    @property
+    def odds_matrix(self) -> OddsMatrix:
+        """Matriz de cuotas de los partidos enlazados."""
+        return self._odds_matrix
+
+    def detect(self, linked_pairs: list[tuple[MatchInfo, MatchInfo]]) -> None:
+        """Pasa las parejas enlazadas por los detectores y publica sus alertas.
+
+        Las cuotas de las parejas se vuelcan en la matriz y el arbitraje se evalúa
+        en una pasada vectorizada sobre todos los partidos enlazados; los cambios de
+        cuota alimentan además el detector de movimientos de línea. Si hay
+        `max_age_ms`, solo pasan las parejas con datos frescos en ambas casas.
+
+        El filtro de casas sin confirmar tras un reinicio es por casa: la que ya está
+        en directo sigue escribiendo sus cuotas en la matriz y solo la restaurada se
+        queda fuera. Las comparaciones entre casas esperan a que ambas confirmen.
+        """
+        stale_bookmakers = {book.lower() for book in self._stale_books}
+        fresh_pairs = filter_fresh_pairs(linked_pairs, self._max_age_ms)
+        fresh_keys = [build_pair_key(winamax, bet365) for winamax, bet365 in fresh_pairs]
+        # Cada casa confirmada siempre: una casa sin mercados borra sus cuotas anteriores
+        for (winamax_match, bet365_match), match_key in zip(fresh_pairs, fresh_keys, strict=True):
+            label = format_pair_label(bet365_match)
+            for bookmaker, match in (("winamax", winamax_match), ("bet365", bet365_match)):
+                if bookmaker not in stale_bookmakers:
+                    self._odds_matrix.upsert(match_key, bookmaker, match.markets, label)
+        if stale_bookmakers:
+            return
+        line_movement_alerts = self._line_movement.observe(fresh_pairs)
+
+        if self._alert_bus is None:
+            return
+        for alert in detect_score_mismatches(fresh_pairs):
+            self._alert_bus.publish(alert)
+        opportunities = self._odds_matrix.evaluate(self._arbitrage_min_margin, fresh_keys)
+        for alert in [*build_arbitrage_alerts(opportunities), *line_movement_alerts]:
+            self._alert_bus.publish(alert)
+
+    def restore(self, checkpoint: BoardCheckpoint, winamax_book: str, bet365_book: str) -> None:
+        """Publica los últimos partidos guardados antes de que arranquen los scrapers."""
+        self.update(
+            checkpoint.matches_by_book.get(winamax_book, []),
+            checkpoint.matches_by_book.get(bet365_book, []),
+            stale_books=[
+                book for book in (winamax_book, bet365_book) if book in checkpoint.matches_by_book
+            ],
+            updated_at=checkpoint.saved_at_text,
+        )
+
+    def apply_links(self, payloads: list[LinkRequestPayload]) -> None:
+        """Re-empareja solo los pendientes afectados por enlaces manuales y republica una vez."""
+        affected_names = {
+            fold_team_name(team_name)
+            for payload in payloads
+            for team_name in (payload.winamax_match.home_team, payload.winamax_match.away_team)
+        }
+        affected_indexes = [
+            index
+            for index, raw_match in enumerate(self._pending_winamax_raw)
+            if fold_team_name(raw_match.home_team) in affected_names
+            or fold_team_name(raw_match.away_team) in affected_names
+        ]
+        if not affected_indexes:
+            return
+
+        bet365_by_key = {
+            build_match_key(match.home_team, match.away_team): index
+            for index, match in enumerate(self._pending_bet365)
+        }
+        # Las listas nunca se modifican in situ: el hilo de render puede estar leyéndolas
+        pending_winamax_normalized = list(self._pending_winamax_normalized)
+        newly_linked_winamax: set[int] = set()
+        newly_linked_bet365: set[int] = set()
+        new_pairs: list[tuple[MatchInfo, MatchInfo]] = []
+        for index in affected_indexes:
+            normalized_match = self._team_name_normalizer.normalize_matches(
+                "winamax",
+                [self._pending_winamax_raw[index].model_copy(deep=True)],
+            )[0]
+            key = build_match_key(normalized_match.home_team, normalized_match.away_team)
+            bet365_index = bet365_by_key.get(key)
+            if bet365_index is None or bet365_index in newly_linked_bet365:
+                pending_winamax_normalized[index] = normalized_match
+                continue
+            new_pairs.append((normalized_match, self._pending_bet365[bet365_index]))
+            newly_linked_winamax.add(index)
+            newly_linked_bet365.add(bet365_index)
+
+        if not new_pairs:
+            self._pending_winamax_normalized = pending_winamax_normalized
+            self.publish()
+            return
+
+        self._linked_pairs = [*self._linked_pairs, *new_pairs]
+        self.detect(new_pairs)
+        self._pending_winamax_raw = [
+            match
+            for index, match in enumerate(self._pending_winamax_raw)
+            if index not in newly_linked_winamax
+        ]
+        self._pending_winamax_normalized = [
+            match
+            for index, match in enumerate(pending_winamax_normalized)
+            if index not in newly_linked_winamax
+        ]
+        self._pending_bet365 = [
+            match
+            for index, match in enumerate(self._pending_bet365)
+            if index not in newly_linked_bet365
+        ]
+        self.publish()
+
+    def content_builder(self) -> Callable[[], DashboardContent]:
+        """Construcción diferida del contenido sobre las listas del último emparejamiento.
+
+        Las listas del tablero se sustituyen, nunca se modifican in situ, así que la
+        función puede ejecutarse en otro hilo y ver una foto coherente.
+        """
+        return partial(
+            build_board_content,
+            self._linked_pairs,
+            self._pending_winamax_raw,
+            self._pending_winamax_normalized,
+            self._pending_bet365,
+            self._winamax_total,
+            self._bet365_total,
+            self._last_update,
+            self._stale_books,
+        )
+
+    def build_content(self) -> DashboardContent:
+        """Construye el contenido del dashboard a partir del último emparejamiento."""
+        return self.content_builder()()
+
+    def publish(self) -> None:
+        """Renderiza y publica el estado actual del emparejamiento."""
+        if self._renderer is not None:
+            self._renderer.submit(self.content_builder())
+            return
+        publish_dashboard_content(
+            self.build_content(),
+            self._dashboard_state,
+            self._dashboard_assets,
+            self._dashboard_config,
+        )
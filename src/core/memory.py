@@ -0,0 +1,405 @@
+import asyncio
+import gc
+import os
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.core.logger import logger
+
+if TYPE_CHECKING:
+    from src.core.monitoring import ScraperRuntime
+    from src.engine.alerts import AlertBus
+
+PROC_DIR = Path("/proc")
+BYTES_PER_MB = 1024 * 1024
+
+
+def read_rss_bytes(pid: int) -> int | None:
+    """RSS de un proceso desde `/proc/<pid>/status` (o psutil si no hay `/proc`)."""
+    try:
+        status = (PROC_DIR / str(pid) / "status").read_text(encoding="utf-8")
+    except OSError:
+        return _psutil_rss_bytes(pid)
+    for line in status.splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) * 1024
+    return None
+
+
+def read_cpu_seconds(pid: int) -> float | None:
+    """Tiempo de CPU (usuario + sistema) de un proceso desde `/proc/<pid>/stat`."""
+    try:
+        stat = (PROC_DIR / str(pid) / "stat").read_text(encoding="utf-8")
+    except OSError:
+        return _psutil_cpu_seconds(pid)
+    # Tras el nombre entre paréntesis: estado, ppid... utime y stime son los campos 14 y 15
+    fields = stat.rsplit(")", 1)[-1].split()
+    try:
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except IndexError, ValueError:
+        return None
+
+
+def _psutil_cpu_seconds(pid: int) -> float | None:
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        cpu_times = psutil.Process(pid).cpu_times()
+    except psutil.Error:
+        return None
+    return cpu_times.user + cpu_times.system
+
+
+def _psutil_rss_bytes(pid: int) -> int | None:
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        return psutil.Process(pid).memory_info().rss
+    except psutil.Error:
+        return None
+
+
+def read_children_by_parent() -> dict[int, list[int]]:
+    """Mapa `ppid -> [pid]` de todos los procesos visibles (una lectura de `/proc`)."""
+    children: dict[int, list[int]] = {}
+    try:
+        entries = [entry for entry in PROC_DIR.iterdir() if entry.name.isdigit()]
+    except OSError:
+        return _psutil_children_by_parent()
+    for entry in entries:
+        try:
+            stat = (entry / "stat").read_text(encoding="utf-8")
+        except OSError:
+            continue
+        # El nombre del proceso va entre paréntesis y puede contener espacios
+        fields = stat.rsplit(")", 1)[-1].split()
+        if len(fields) > 1:
+            children.setdefault(int(fields[1]), []).append(int(entry.name))
+    return children
+
+
+def _psutil_children_by_parent() -> dict[int, list[int]]:
+    try:
+        import psutil
+    except ImportError:
+        return {}
+    children: dict[int, list[int]] = {}
+    for process in psutil.process_iter(["ppid"]):
+        children.setdefault(process.info["ppid"], []).append(process.pid)
+    return children
+
+
+def child_pids(pid: int) -> set[int]:
+    """PIDs de los hijos directos de un proceso."""
+    return set(read_children_by_parent().get(pid, []))
+
+
+def collect_process_tree(
+    root_pids: list[int],
+    children_by_parent: dict[int, list[int]],
+) -> list[int]:
+    """Los PIDs raíz más todos sus descendientes."""
+    tree: list[int] = []
+    pending = list(root_pids)
+    seen: set[int] = set()
+    while pending:
+        pid = pending.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        tree.append(pid)
+        pending.extend(children_by_parent.get(pid, []))
+    return tree
+
+
+@dataclass(frozen=True)
+class MemorySample:
+    """Lectura de memoria de Python y de memoria y CPU de los navegadores de cada scraper."""
+
+    taken_at: float
+    python_rss_bytes: int | None
+    python_traced_bytes: int | None
+    browser_rss_bytes: dict[str, int]
+    browser_processes: dict[str, int]
+    gc_objects: int
+    # CPU acumulada (usuario + sistema) del árbol de procesos vivo de cada navegador
+    browser_cpu_seconds: dict[str, float] = field(default_factory=dict)
+    top_allocations: list[tuple[str, int]] = field(default_factory=list)
+
+
+class MemoryGovernor:
+    """Vigila la memoria del monitor y recicla la página de un scraper que se hincha.
+
+    Cada `sample_seconds` suma el RSS y el tiempo de CPU del árbol de procesos del
+    navegador de cada casa (leyendo `/proc`, sin tocar el bucle de eventos) y, si
+    `tracemalloc` está activo, los mayores asignadores de Python. Una casa se
+    recicla cuando su navegador supera `browser_rss_limit_bytes` o su página lleva
+    abierta más de `recycle_after_seconds`, pero solo en un momento tranquilo (sin
+    alertas en `quiet_seconds`); si el límite de RSS se sigue superando tras
+    `max_defer_seconds` se recicla igualmente para evitar un OOM.
+
+    Entre dos reciclados de una casa pasan al menos `min_recycle_interval_seconds`.
+    Tras un reciclado por RSS el disparador de memoria queda desarmado hasta que
+    el RSS baja del límite: si el navegador ya arranca por encima (límite demasiado
+    bajo para su base) se avisa una vez en lugar de reciclar en bucle.
+    """
+
+    def __init__(
+        self,
+        browser_rss_limit_bytes: int,
+        recycle_after_seconds: float = 0.0,
+        sample_seconds: float = 30.0,
+        quiet_seconds: float = 20.0,
+        max_defer_seconds: float = 300.0,
+        min_recycle_interval_seconds: float = 600.0,
+        tracemalloc_frames: int = 0,
+        top_allocations: int = 10,
+    ) -> None:
+        self.browser_rss_limit_bytes = browser_rss_limit_bytes
+        self.recycle_after_seconds = recycle_after_seconds
+        self.sample_seconds = sample_seconds
+        self.quiet_seconds = quiet_seconds
+        self.max_defer_seconds = max_defer_seconds
+        self.min_recycle_interval_seconds = min_recycle_interval_seconds
+        self._tracemalloc_frames = tracemalloc_frames
+        self._top_allocations = top_allocations
+        self._last_sample: MemorySample | None = None
+        self._previous_sample: MemorySample | None = None
+        self._last_sample_at = -float("inf")
+        self._page_started_at: dict[str, float] = {}
+        self._over_limit_since: dict[str, float] = {}
+        self._last_recycle_at: dict[str, float] = {}
+        # Casas recicladas por RSS: sin disparador de memoria hasta que bajen del límite
+        self._rss_disarmed: set[str] = set()
+        self._rss_to_verify: set[str] = set()
+        self._recycles: dict[str, int] = {}
+        self._recycle_tasks: dict[str, asyncio.Task[None]] = {}
+
+    def start_tracing(self) -> None:
+        """Activa `tracemalloc` si se pidió (tiene coste: solo para diagnosticar fugas)."""
+        if self._tracemalloc_frames > 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(self._tracemalloc_frames)
+            logger.info(f"tracemalloc activo ({self._tracemalloc_frames} frame/s por asignación)")
+
+    def sample(self, process_pids: dict[str, list[int]]) -> MemorySample:
+        """Lee la memoria de Python y del árbol de procesos de cada casa (bloqueante)."""
+        children_by_parent = read_children_by_parent()
+        browser_rss_bytes: dict[str, int] = {}
+        browser_processes: dict[str, int] = {}
+        browser_cpu_seconds: dict[str, float] = {}
+        for name, root_pids in process_pids.items():
+            tree = collect_process_tree(root_pids, children_by_parent)
+            browser_rss_bytes[name] = sum(read_rss_bytes(pid) or 0 for pid in tree)
+            browser_processes[name] = len(tree)
+            browser_cpu_seconds[name] = sum(read_cpu_seconds(pid) or 0.0 for pid in tree)
+
+        traced_bytes: int | None = None
+        top_allocations: list[tuple[str, int]] = []
+        if tracemalloc.is_tracing():
+            traced_bytes = tracemalloc.get_traced_memory()[0]
+            statistics = tracemalloc.take_snapshot().statistics("lineno")
+            top_allocations = [
+                (str(statistic.traceback[0]), statistic.size)
+                for statistic in statistics[: self._top_allocations]
+            ]
+
+        return MemorySample(
+            taken_at=time.perf_counter(),
+            python_rss_bytes=read_rss_bytes(os.getpid()),
+            python_traced_bytes=traced_bytes,
+            browser_rss_bytes=browser_rss_bytes,
+            browser_processes=browser_processes,
+            gc_objects=len(gc.get_objects()),
+            browser_cpu_seconds=browser_cpu_seconds,
+            top_allocations=top_allocations,
+        )
+
+    def browser_cpu_percent(self, name: str) -> float | None:
+        """CPU del navegador entre las dos últimas muestras, en % de un núcleo.
+
+        Si el árbol perdió procesos entre muestras (p. ej. tras un reciclado) el
+        acumulado baja y la lectura se descarta.
+        """
+        previous, current = self._previous_sample, self._last_sample
+        if previous is None or current is None:
+            return None
+        if name not in previous.browser_cpu_seconds or name not in current.browser_cpu_seconds:
+            return None
+        cpu_delta = current.browser_cpu_seconds[name] - previous.browser_cpu_seconds[name]
+        wall_delta = current.taken_at - previous.taken_at
+        if cpu_delta < 0 or wall_delta <= 0:
+            return None
+        return round(cpu_delta / wall_delta * 100, 1)
+
+    def _is_over_limit(self, name: str, sample: MemorySample) -> bool:
+        rss_bytes = sample.browser_rss_bytes.get(name, 0)
+        return self.browser_rss_limit_bytes > 0 and rss_bytes > self.browser_rss_limit_bytes
+
+    def _verify_recycled(self, sample: MemorySample) -> None:
+        """Avisa si un reciclado por RSS no dejó al navegador por debajo del límite."""
+        for name in list(self._rss_to_verify):
+            task = self._recycle_tasks.get(name)
+            if (task is not None and not task.done()) or name not in sample.browser_rss_bytes:
+                continue
+            self._rss_to_verify.discard(name)
+            if self._is_over_limit(name, sample):
+                logger.warning(
+                    f"{name}: el reciclado no bajó el navegador del límite de RSS "
+                    f"({sample.browser_rss_bytes[name] / BYTES_PER_MB:.0f} MB > "
+                    f"{self.browser_rss_limit_bytes / BYTES_PER_MB:.0f} MB); no se vuelve a "
+                    "reciclar por memoria hasta que baje"
+                )
+
+    def _recycle_reason(self, name: str, sample: MemorySample, now: float) -> str | None:
+        if not self._is_over_limit(name, sample):
+            self._over_limit_since.pop(name, None)
+            self._rss_disarmed.discard(name)
+        elif name not in self._rss_disarmed:
+            self._over_limit_since.setdefault(name, now)
+            rss_bytes = sample.browser_rss_bytes[name]
+            return f"RSS del navegador {rss_bytes / BYTES_PER_MB:.0f} MB"
+
+        page_age = now - self._page_started_at.get(name, now)
+        if self.recycle_after_seconds > 0 and page_age > self.recycle_after_seconds:
+            return f"página abierta {page_age / 3600:.1f} h"
+        return None
+
+    def _is_quiet(self, alert_bus: AlertBus | None, now: float) -> bool:
+        last_alert_at = alert_bus.last_published_at if alert_bus is not None else None
+        return last_alert_at is None or now - last_alert_at >= self.quiet_seconds
+
+    async def tick(
+        self,
+        runtimes: list[ScraperRuntime],
+        alert_bus: AlertBus | None = None,
+    ) -> None:
+        """Muestrea si toca y lanza en segundo plano el reciclado de las casas que lo necesiten.
+
+        Se llama entre dos ticks del monitor, así que ningún scraper está extrayendo
+        cuando empieza un reciclado; mientras dura, su runtime sirve los últimos
+        partidos conocidos y la otra casa sigue su ritmo.
+        """
+        now = time.perf_counter()
+        if now - self._last_sample_at < self.sample_seconds:
+            return
+        self._last_sample_at = now
+
+        ready_runtimes = [runtime for runtime in runtimes if runtime.ready]
+        for runtime in ready_runtimes:
+            self._page_started_at.setdefault(runtime.name, now)
+        self._previous_sample = self._last_sample
+        self._last_sample = await asyncio.to_thread(
+            self.sample,
+            {runtime.name: runtime.process_pids for runtime in ready_runtimes},
+        )
+
+        self._verify_recycled(self._last_sample)
+        quiet = self._is_quiet(alert_bus, now)
+        for runtime in ready_runtimes:
+            task = self._recycle_tasks.get(runtime.name)
+            if task is not None and not task.done():
+                continue
+            reason = self._recycle_reason(runtime.name, self._last_sample, now)
+            if reason is None:
+                continue
+            since_recycle = now - self._last_recycle_at.get(runtime.name, -float("inf"))
+            if since_recycle < self.min_recycle_interval_seconds:
+                logger.debug(
+                    f"{runtime.name}: reciclado aplazado ({reason}), último hace "
+                    f"{since_recycle:.0f}s"
+                )
+                continue
+            over_limit_for = now - self._over_limit_since.get(runtime.name, now)
+            if not quiet and over_limit_for < self.max_defer_seconds:
+                logger.debug(
+                    f"{runtime.name}: reciclado aplazado ({reason}), hay alertas recientes"
+                )
+                continue
+            rss_triggered = runtime.name in self._over_limit_since
+            self._recycle_tasks[runtime.name] = asyncio.create_task(
+                self._recycle(runtime, reason, rss_triggered)
+            )
+
+    async def _recycle(self, runtime: ScraperRuntime, reason: str, rss_triggered: bool) -> None:
+        logger.warning(f"{runtime.name}: reciclando página ({reason})")
+        if rss_triggered:
+            self._rss_disarmed.add(runtime.name)
+            self._rss_to_verify.add(runtime.name)
+        started_at = time.perf_counter()
+        recycled = await runtime.recycle()
+        # Los objetos de la página anterior (listeners, partidos, tramas) ya no tienen dueño
+        gc.collect()
+        self._page_started_at[runtime.name] = time.perf_counter()
+        self._last_recycle_at[runtime.name] = self._page_started_at[runtime.name]
+        self._over_limit_since.pop(runtime.name, None)
+        if recycled:
+            self._recycles[runtime.name] = self._recycles.get(runtime.name, 0) + 1
+            duration_ms = (time.perf_counter() - started_at) * 1000
+            logger.info(
+                f"{runtime.name}: página reciclada en {duration_ms / 1000:.1f}s",
+                extra={
+                    "bookmaker": runtime.name,
+                    "stage": "recycle",
+                    "duration_ms": round(duration_ms),
+                },
+            )
+        else:
+            logger.error(f"{runtime.name}: no se pudo reciclar la página")
+
+    def snapshot(self) -> dict[str, object]:
+        """Medidores de memoria serializables para `/api/metrics`."""
+        sample = self._last_sample
+        if sample is None:
+            return {}
+        now = time.perf_counter()
+        return {
+            "sampled_seconds_ago": round(now - sample.taken_at, 1),
+            "python_rss_mb": _to_mb(sample.python_rss_bytes),
+            "python_traced_mb": _to_mb(sample.python_traced_bytes),
+            "gc_objects": sample.gc_objects,
+            "browsers": {
+                name: {
+                    "rss_mb": _to_mb(rss_bytes),
+                    "processes": sample.browser_processes.get(name, 0),
+                    "cpu_seconds": round(sample.browser_cpu_seconds.get(name, 0.0), 1),
+                    "cpu_percent": self.browser_cpu_percent(name),
+                    "page_age_seconds": round(now - self._page_started_at.get(name, now)),
+                    "recycles": self._recycles.get(name, 0),
+                    "rss_trigger_armed": name not in self._rss_disarmed,
+                }
+                for name, rss_bytes in sample.browser_rss_bytes.items()
+            },
+            "top_allocations": [
+                {"site": site, "mb": _to_mb(size)} for site, size in sample.top_allocations
+            ],
+        }
+
+    def describe(self) -> str:
+        """Resumen corto para el comando `status`."""
+        sample = self._last_sample
+        if sample is None:
+            return "- Memoria: sin muestras todavía"
+        browsers = ", ".join(
+            f"{name}={_to_mb(rss_bytes)} MB, CPU {_format_percent(self.browser_cpu_percent(name))} "
+            f"({self._recycles.get(name, 0)} reciclados)"
+            for name, rss_bytes in sample.browser_rss_bytes.items()
+        )
+        return (
+            f"- Memoria: Python {_to_mb(sample.python_rss_bytes)} MB | "
+            f"navegadores: {browsers or '-'}"
+        )
+
+
+def _format_percent(value: float | None) -> str:
+    return "-" if value is None else f"{value:.0f}%"
+
+
+def _to_mb(size_bytes: int | None) -> float | None:
+    return None if size_bytes is None else round(size_bytes / BYTES_PER_MB, 1)
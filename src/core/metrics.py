@@ -0,0 +1,155 @@
+import bisect
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from src.models.odds import MatchInfo
+
+DEFAULT_LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Histograma de latencias en milisegundos con buckets fijos (O(log b) por muestra)."""
+
+    def __init__(self, bounds_ms: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_MS) -> None:
+        self.bounds_ms = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        """Registra una muestra de latencia."""
+        self.counts[bisect.bisect_left(self.bounds_ms, value_ms)] += 1
+        self.total += 1
+        self.sum_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Aproxima un percentil devolviendo el límite superior de su bucket."""
+        if not self.total:
+            return None
+        threshold = fraction * self.total
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= threshold:
+                return self.bounds_ms[index] if index < len(self.bounds_ms) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> dict[str, object]:
+        """Resumen serializable del histograma."""
+        return {
+            "count": self.total,
+            "avg_ms": round(self.sum_ms / self.total, 2) if self.total else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 2),
+            "buckets_ms": {
+                **{
+                    f"le_{bound}": count
+                    for bound, count in zip(self.bounds_ms, self.counts[:-1], strict=True)
+                },
+                "inf": self.counts[-1],
+            },
+        }
+
+    def describe(self) -> str:
+        """Resumen corto en una línea para la consola."""
+        if not self.total:
+            return "sin muestras"
+        return (
+            f"n={self.total} p50≤{self.percentile(0.5)}ms p95≤{self.percentile(0.95)}ms "
+            f"max={self.max_ms:.0f}ms"
+        )
+
+
+class StageTimer:
+    """Acumula duraciones por etapa del pipeline (scrape, emparejado, publicación...)."""
+
+    def __init__(self) -> None:
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self.last_timings_ms: dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Mide el bloque `with` y lo registra bajo el nombre de la etapa."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - started_at) * 1000)
+
+    def record(self, stage: str, duration_ms: float) -> None:
+        """Registra una duración ya medida para una etapa."""
+        self._histograms.setdefault(stage, LatencyHistogram()).observe(duration_ms)
+        self.last_timings_ms[stage] = round(duration_ms, 2)
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        """Resumen serializable por etapa."""
+        return {stage: histogram.snapshot() for stage, histogram in self._histograms.items()}
+
+    def totals(self) -> dict[str, tuple[int, float]]:
+        """Muestras y suma de milisegundos acumuladas por etapa (para medir ventanas)."""
+        return {
+            stage: (histogram.total, histogram.sum_ms)
+            for stage, histogram in self._histograms.items()
+        }
+
+    def describe(self) -> str:
+        """Resumen por etapa en varias líneas para la consola."""
+        return "\n".join(
+            f"  · {stage}: {histogram.describe()}" for stage, histogram in self._histograms.items()
+        )
+
+
+class FreshnessTracker:
+    """Latencias de frescura por casa de apuestas.
+
+    Por cada registro mide `ingest` (lectura en la página → llegada a Python) y
+    `age` (lectura en la página → uso en el monitor); por cada pareja enlazada, el
+    desfase entre las lecturas de ambas casas (`cross_book_skew`).
+    """
+
+    def __init__(self) -> None:
+        self._ingest: dict[str, LatencyHistogram] = {}
+        self._age: dict[str, LatencyHistogram] = {}
+        self._cross_book_skew = LatencyHistogram()
+
+    def observe_matches(
+        self,
+        bookmaker: str,
+        matches: list[MatchInfo],
+        now_ms: float | None = None,
+    ) -> None:
+        """Registra la frescura de los partidos de un tick de una casa."""
+        now_ms = time.time() * 1000 if now_ms is None else now_ms
+        ingest = self._ingest.setdefault(bookmaker, LatencyHistogram())
+        age = self._age.setdefault(bookmaker, LatencyHistogram())
+        for match in matches:
+            if match.observed_at_ms is None:
+                continue
+            if match.received_at_ms is not None:
+                ingest.observe(max(match.received_at_ms - match.observed_at_ms, 0.0))
+            age.observe(max(now_ms - match.observed_at_ms, 0.0))
+
+    def observe_skew(self, skew_ms: float) -> None:
+        """Registra el desfase entre las lecturas de las dos casas de una pareja."""
+        self._cross_book_skew.observe(abs(skew_ms))
+
+    def snapshot(self) -> dict[str, object]:
+        """Resumen serializable por casa y desfase entre casas."""
+        return {
+            "ingest": {book: histogram.snapshot() for book, histogram in self._ingest.items()},
+            "age": {book: histogram.snapshot() for book, histogram in self._age.items()},
+            "cross_book_skew": self._cross_book_skew.snapshot(),
+        }
+
+    def describe(self) -> str:
+        """Resumen por casa en varias líneas para la consola."""
+        lines = [
+            f"  · {book}: ingesta {self._ingest[book].describe()} | edad {histogram.describe()}"
+            for book, histogram in self._age.items()
+        ]
+        lines.append(f"  · desfase entre casas: {self._cross_book_skew.describe()}")
+        return "\n".join(lines)
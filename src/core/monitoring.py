@@ -1,196 +1,282 @@
 import asyncio
-from collections import defaultdict, deque
-from collections.abc import Callable
-from datetime import datetime
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
-from src.core.browser import BrowserManager
+from src.core.browser import BrowserManager, LowRenderProfile
 from src.core.logger import logger
-from src.engine.team_name_normalizer import normalize_matches_team_names
-from src.models.odds import MatchInfo
-from src.scrapers.bet365 import Bet365Scraper
-from src.scrapers.winamax import WinamaxScraper
-from src.ui.dashboard_renderer import (
-    build_rows_by_linked_pairs,
-    build_rows_by_minute,
-    render_dashboard_html,
+from src.core.match_board import CoalescingRenderer, LiveMatchBoard
+from src.core.memory import MemoryGovernor
+from src.core.metrics import FreshnessTracker, StageTimer
+from src.core.profiling import ProfileCapture, parse_profile_seconds
+from src.core.settings import (
+    BET365_FEED_MAX_SILENCE_MS,
+    BET365_FEED_RECORDING_PATH,
+    BET365_FIXTURES_PER_SHARD,
+    BET365_MAX_SHARDS,
+    BET365_USE_FEED,
+    BROWSER_PROFILES_DIR,
+    DASHBOARD_CONFIG,
+    HEADLESS_BOOKS,
+    LOW_RENDER_BOOKS,
+    WINAMAX_AUTO_LOGIN,
 )
-from src.ui.dashboard_server import DashboardAssets, DashboardServerConfig, DashboardState
-
-
-def _build_match_key(home_team: str, away_team: str) -> tuple[str, str]:
-    return (home_team.strip().lower(), away_team.strip().lower())
-
-
-def _split_linked_and_pending_matches(
-    winamax_raw_matches: list[MatchInfo],
-    winamax_normalized_matches: list[MatchInfo],
-    bet365_matches: list[MatchInfo],
-) -> tuple[
-    list[tuple[MatchInfo, MatchInfo]],
-    list[MatchInfo],
-    list[MatchInfo],
-    list[MatchInfo],
-    list[MatchInfo],
-    list[MatchInfo],
-]:
-    """Separa partidos enlazados por nombres normalizados y pendientes de enlazar."""
-    bet365_by_key: dict[tuple[str, str], deque[int]] = defaultdict(deque)
-    for bet365_index, bet365_match in enumerate(bet365_matches):
-        bet365_by_key[_build_match_key(bet365_match.home_team, bet365_match.away_team)].append(
-            bet365_index
-        )
+from src.engine.alerts import AlertBus
+from src.models.odds import MatchInfo
+from src.scrapers.base import BaseScraper
+from src.ui.dashboard_server import DashboardServerConfig
 
-    linked_pairs: list[tuple[MatchInfo, MatchInfo]] = []
-    linked_winamax: list[MatchInfo] = []
-    linked_bet365: list[MatchInfo] = []
-    pending_winamax_raw: list[MatchInfo] = []
-    pending_winamax_normalized: list[MatchInfo] = []
-    used_bet365_indexes: set[int] = set()
-
-    for index, normalized_match in enumerate(winamax_normalized_matches):
-        key = _build_match_key(normalized_match.home_team, normalized_match.away_team)
-        available_indexes = bet365_by_key.get(key)
-
-        if available_indexes:
-            bet365_index = available_indexes.popleft()
-            linked_winamax.append(normalized_match)
-            linked_bet365.append(bet365_matches[bet365_index])
-            linked_pairs.append((normalized_match, bet365_matches[bet365_index]))
-            used_bet365_indexes.add(bet365_index)
-            continue
+if TYPE_CHECKING:
+    from src.scrapers.bet365 import Bet365Scraper, Bet365ShardedScraper
+    from src.scrapers.winamax import WinamaxScraper
+
+
+@dataclass
+class ScraperRuntime:
+    """Scraper de una casa de apuestas que se conecta al monitor cuando está listo."""
+
+    name: str
+    browser: BrowserManager | None = None
+    scraper: BaseScraper | None = None
+    last_matches: list[MatchInfo] = field(default_factory=list)
+    recycling: bool = False
+    # `last_matches` viene del checkpoint de la sesión anterior y aún no se ha confirmado
+    stale: bool = False
+    # Hora (`time.time()`) a la que se retiran los partidos restaurados si nadie los confirma
+    stale_expires_at: float = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """Indica si el scraper ya terminó de arrancar."""
+        return self.scraper is not None
+
+    @property
+    def process_pids(self) -> list[int]:
+        """PIDs raíz del navegador y del scraper de esta casa (para medir su memoria)."""
+        browser_pids = self.browser.process_pids if self.browser is not None else []
+        scraper_pids = self.scraper.process_pids if self.scraper is not None else []
+        return [*browser_pids, *scraper_pids]
+
+    async def fetch_matches(self) -> list[MatchInfo]:
+        """Extrae partidos si está listo; si no (o si recicla), devuelve los últimos conocidos."""
+        if self.scraper is not None and not self.recycling:
+            self.last_matches = await self.scraper.get_live_matches()
+            self.stale = False
+        return self.last_matches
+
+    def restore(self, matches: list[MatchInfo], expires_at: float) -> None:
+        """Siembra los últimos partidos conocidos, marcados como no confirmados hasta `expires_at`."""
+        self.last_matches = matches
+        self.stale = True
+        self.stale_expires_at = expires_at
+
+    def expire_restored(self, now: float | None = None) -> bool:
+        """Retira los partidos restaurados que caducaron sin confirmarse; True si los retiró."""
+        now = time.time() if now is None else now
+        if not self.stale or now < self.stale_expires_at:
+            return False
+        logger.warning(f"{self.name}: los datos de la sesión anterior caducan sin confirmar")
+        self.last_matches = []
+        self.stale = False
+        return True
+
+    async def recycle(self) -> bool:
+        """Recicla la página del scraper; mientras tanto se sirven los últimos partidos."""
+        if self.scraper is None:
+            return False
+        self.recycling = True
+        try:
+            return await self.scraper.recycle()
+        except Exception as error:  # noqa: BLE001
+            logger.exception(f"{self.name}: error al reciclar la página: {error}")
+            return False
+        finally:
+            self.recycling = False
 
-        pending_winamax_raw.append(winamax_raw_matches[index])
-        pending_winamax_normalized.append(normalized_match)
-
-    pending_bet365 = [
-        bet365_match
-        for bet365_index, bet365_match in enumerate(bet365_matches)
-        if bet365_index not in used_bet365_indexes
-    ]
-
-    return (
-        linked_pairs,
-        linked_winamax,
-        linked_bet365,
-        pending_winamax_raw,
-        pending_winamax_normalized,
-        pending_bet365,
+    async def stop(self) -> None:
+        """Cierra scraper y navegador de este runtime."""
+        if self.scraper is not None:
+            await self.scraper.close()
+        if self.browser is not None:
+            await self.browser.stop()
+        self.scraper = None
+        self.browser = None
+
+
+def build_browser_manager(book: str) -> BrowserManager:
+    """Navegador de una casa con su perfil persistente y sus opciones de render."""
+    return BrowserManager(
+        headless=HEADLESS_BOOKS.get(book, False),
+        profile_dir=BROWSER_PROFILES_DIR / book,
+        render_profile=LowRenderProfile() if book in LOW_RENDER_BOOKS else None,
     )
 
 
+async def discard_scraper(browser: BrowserManager | None, scraper: BaseScraper) -> None:
+    """Cierra un scraper que no llegó a engancharse al monitor y su navegador."""
+    await scraper.close()
+    if browser is not None:
+        await browser.stop()
+
+
 async def start_winamax_scraper() -> tuple[BrowserManager, WinamaxScraper] | None:
     """Inicia Winamax una sola vez para monitoreo continuo."""
-    browser = BrowserManager(headless=False)
+    from src.scrapers.winamax import WinamaxScraper
+
+    browser = build_browser_manager("winamax")
     scraper = WinamaxScraper(browser)
-    if not await scraper.start():
-        logger.error("Winamax: no se pudo iniciar el scraper.")
-        await scraper.close()
-        await browser.stop()
-        return None
-    if not await scraper.navigate_to_live():
-        logger.error("Winamax: no se pudo navegar a fútbol en vivo.")
-        await scraper.close()
-        await browser.stop()
-        return None
+    try:
+        if not await scraper.start():
+            logger.error("Winamax: no se pudo iniciar el scraper.")
+            await discard_scraper(browser, scraper)
+            return None
+        if WINAMAX_AUTO_LOGIN and not await scraper.ensure_session():
+            logger.warning("Winamax: sin sesión iniciada, se continúa como invitado.")
+        if not await scraper.navigate_to_live():
+            logger.error("Winamax: no se pudo navegar a fútbol en vivo.")
+            await discard_scraper(browser, scraper)
+            return None
+    except asyncio.CancelledError:
+        # Cancelado a mitad de arranque: el runtime aún no tiene el navegador para cerrarlo
+        logger.info("Winamax: arranque cancelado, se cierra el navegador.")
+        await discard_scraper(browser, scraper)
+        raise
     return browser, scraper
 
 
-async def start_bet365_scraper() -> tuple[BrowserManager, Bet365Scraper] | None:
-    """Inicia Bet365 una sola vez para monitoreo continuo."""
-    browser = BrowserManager(headless=False)
-    scraper = Bet365Scraper(browser)
-    if not await scraper.start():
-        logger.error("Bet365: no se pudo iniciar el scraper.")
-        await scraper.close()
-        await browser.stop()
-        return None
+async def start_bet365_scraper() -> (
+    tuple[BrowserManager, Bet365Scraper | Bet365ShardedScraper] | None
+):
+    """Inicia Bet365 una sola vez para monitoreo continuo (con shards si están activados)."""
+    from src.scrapers.bet365 import Bet365Scraper, Bet365ShardedScraper
+    from src.scrapers.sharding import ShardPlanner
+
+    browser = build_browser_manager("bet365")
+    if BET365_MAX_SHARDS > 0:
+        scraper = Bet365ShardedScraper(
+            browser,
+            planner=ShardPlanner(
+                max_fixtures_per_shard=BET365_FIXTURES_PER_SHARD,
+                max_shards=BET365_MAX_SHARDS,
+            ),
+            base_interval_seconds=DASHBOARD_CONFIG.scrape_interval_seconds,
+        )
+    else:
+        scraper = Bet365Scraper(
+            browser,
+            use_feed=BET365_USE_FEED,
+            feed_recording=BET365_FEED_RECORDING_PATH,
+            feed_max_silence_ms=BET365_FEED_MAX_SILENCE_MS,
+        )
+    try:
+        if not await scraper.start():
+            logger.error("Bet365: no se pudo iniciar el scraper.")
+            await discard_scraper(browser, scraper)
+            return None
+    except asyncio.CancelledError:
+        logger.info("Bet365: arranque cancelado, se cierra el navegador.")
+        await discard_scraper(browser, scraper)
+        raise
     return browser, scraper
 
 
-def build_initial_dashboard_html(
-    assets: DashboardAssets,
-    config: DashboardServerConfig,
-) -> str:
-    """Construye HTML inicial mientras los scrapers cargan datos reales."""
-    return render_dashboard_html(
-        dashboard_template=assets.template,
-        refresh_seconds=config.refresh_seconds,
-        linked_rows=[
-            ("--", "No hay partidos enlazados todavía.", "No hay partidos enlazados todavía.")
-        ],
-        pending_rows=[("--", "Cargando Winamax...", "Cargando Bet365...")],
-        winamax_total=0,
-        bet365_total=0,
-        linked_total=0,
-        pending_total=0,
-        last_update="iniciando",
-        winamax_pending_raw_matches=[],
-        bet365_pending_matches=[],
+async def attach_scraper(
+    runtime: ScraperRuntime,
+    starter: Callable[[], Awaitable[tuple[BrowserManager | None, BaseScraper] | None]],
+) -> bool:
+    """Arranca un scraper en segundo plano y lo engancha al monitor cuando está listo.
+
+    Si la tarea se cancela durante el arranque, es el `starter` quien cierra lo que
+    ya hubiera abierto: el runtime solo recibe el navegador cuando el arranque acaba.
+    """
+    started_at = time.perf_counter()
+    try:
+        started = await starter()
+    except Exception as error:  # noqa: BLE001
+        logger.exception(f"{runtime.name}: error inesperado al arrancar: {error}")
+        started = None
+
+    if started is None:
+        # Nadie va a confirmar los datos restaurados: el monitor los retira en su próximo tick
+        runtime.stale_expires_at = 0.0
+        return False
+
+    runtime.browser, runtime.scraper = started
+    duration_ms = (time.perf_counter() - started_at) * 1000
+    logger.info(
+        f"{runtime.name}: scraper listo en {duration_ms / 1000:.1f}s",
+        extra={"bookmaker": runtime.name, "stage": "attach", "duration_ms": round(duration_ms)},
     )
+    return True
+
+
+async def shutdown_runtimes(runtimes: list[ScraperRuntime], timeout_seconds: float) -> None:
+    """Cierra todos los scrapers y navegadores en paralelo con un plazo máximo."""
+    results = asyncio.gather(
+        *(runtime.stop() for runtime in runtimes),
+        return_exceptions=True,
+    )
+    try:
+        for runtime, result in zip(
+            runtimes, await asyncio.wait_for(results, timeout_seconds), strict=True
+        ):
+            if isinstance(result, Exception):
+                logger.warning(f"{runtime.name}: error al cerrar: {result}")
+    except TimeoutError:
+        logger.warning(f"Cierre de scrapers superó {timeout_seconds:.0f}s; se abandona la espera.")
 
 
 async def monitor_loop(
-    winamax_scraper: WinamaxScraper,
-    bet365_scraper: Bet365Scraper,
-    team_name_mappings: dict[str, dict[str, str]],
-    dashboard_state: DashboardState,
-    dashboard_assets: DashboardAssets,
+    winamax_runtime: ScraperRuntime,
+    bet365_runtime: ScraperRuntime,
+    match_board: LiveMatchBoard,
     dashboard_config: DashboardServerConfig,
     stop_event: asyncio.Event,
+    stage_timer: StageTimer | None = None,
+    freshness: FreshnessTracker | None = None,
+    memory_governor: MemoryGovernor | None = None,
+    alert_bus: AlertBus | None = None,
 ) -> None:
-    """Mantiene actualizado el dashboard en tiempo real."""
-    while not stop_event.is_set():
-        winamax_raw_matches, bet365_matches = await asyncio.gather(
-            winamax_scraper.get_live_matches(),
-            bet365_scraper.get_live_matches(),
-        )
+    """Mantiene actualizado el dashboard en tiempo real con los scrapers ya conectados.
 
-        winamax_matches = normalize_matches_team_names(
-            "winamax",
-            [match.model_copy(deep=True) for match in winamax_raw_matches],
-            team_name_mappings,
-        )
+    Entre tick y tick el gobernador de memoria (si lo hay) muestrea y decide si
+    recicla la página de alguna casa.
+    """
+    stage_timer = stage_timer or StageTimer()
+    freshness = freshness or FreshnessTracker()
+    while not stop_event.is_set():
+        now = time.time()
+        expired = [runtime.expire_restored(now) for runtime in (winamax_runtime, bet365_runtime)]
+        if winamax_runtime.ready or bet365_runtime.ready or any(expired):
+            with stage_timer.measure("scrape"):
+                winamax_raw_matches, bet365_matches = await asyncio.gather(
+                    winamax_runtime.fetch_matches(),
+                    bet365_runtime.fetch_matches(),
+                )
+            if winamax_runtime.ready:
+                freshness.observe_matches("winamax", winamax_raw_matches)
+            if bet365_runtime.ready:
+                freshness.observe_matches("bet365", bet365_matches)
 
-        (
-            linked_pairs,
-            linked_winamax,
-            linked_bet365,
-            pending_winamax_raw,
-            pending_winamax_normalized,
-            pending_bet365,
-        ) = _split_linked_and_pending_matches(
-            winamax_raw_matches,
-            winamax_matches,
-            bet365_matches,
-        )
+            with stage_timer.measure("match_publish"):
+                match_board.update(
+                    winamax_raw_matches,
+                    bet365_matches,
+                    stale_books=[
+                        runtime.name
+                        for runtime in (winamax_runtime, bet365_runtime)
+                        if runtime.stale
+                    ],
+                )
 
-        linked_rows = build_rows_by_linked_pairs(
-            linked_pairs,
-            empty_message="No hay partidos enlazados todavía.",
-        )
-        pending_rows = build_rows_by_minute(
-            pending_winamax_normalized,
-            pending_bet365,
-            empty_message="No hay partidos pendientes por enlazar.",
-        )
-        html_content = render_dashboard_html(
-            dashboard_template=dashboard_assets.template,
-            refresh_seconds=dashboard_config.refresh_seconds,
-            linked_rows=linked_rows,
-            pending_rows=pending_rows,
-            winamax_total=len(winamax_matches),
-            bet365_total=len(bet365_matches),
-            linked_total=len(linked_winamax),
-            pending_total=max(len(pending_winamax_normalized), len(pending_bet365)),
-            last_update=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            winamax_pending_raw_matches=pending_winamax_raw,
-            bet365_pending_matches=pending_bet365,
-        )
-        await dashboard_state.set_html(html_content)
+            logger.info(
+                f"Dashboard actualizado | Winamax={len(winamax_raw_matches)} | Bet365={len(bet365_matches)}",
+                extra={"stage_timings": dict(stage_timer.last_timings_ms)},
+            )
 
-        logger.info(
-            f"Dashboard actualizado | Winamax={len(winamax_matches)} | Bet365={len(bet365_matches)}"
-        )
+        if memory_governor is not None:
+            await memory_governor.tick([winamax_runtime, bet365_runtime], alert_bus)
 
         try:
             await asyncio.wait_for(
@@ -201,16 +287,83 @@ async def monitor_loop(
             continue
 
 
+def build_status_report(
+    runtimes: list[ScraperRuntime],
+    alert_bus: AlertBus | None = None,
+    freshness: FreshnessTracker | None = None,
+    memory_governor: MemoryGovernor | None = None,
+) -> str:
+    """Resume el estado de cada scraper (frescura, memoria y alertas) para el comando `status`."""
+    lines = ["Monitor activo. Dashboard actualizándose en tiempo real."]
+    for runtime in runtimes:
+        if runtime.scraper is None:
+            restored_text = (
+                f" (mostrando {len(runtime.last_matches)} partidos de la sesión anterior)"
+                if runtime.stale
+                else ""
+            )
+            lines.append(f"- {runtime.name}: arrancando...{restored_text}")
+            continue
+        if runtime.recycling:
+            lines.append(f"- {runtime.name}: reciclando página...")
+            continue
+        counters = runtime.scraper.overlay_counters
+        overlays_text = ", ".join(f"{name}={count}" for name, count in counters.items()) or "-"
+        lines.append(
+            f"- {runtime.name}: {len(runtime.last_matches)} partidos | overlays cerrados: "
+            f"{overlays_text}"
+        )
+    if freshness is not None:
+        lines.append("- Frescura (lectura en página → monitor):")
+        lines.append(freshness.describe())
+    if memory_governor is not None:
+        lines.append(memory_governor.describe())
+    if alert_bus is not None:
+        lines.append(alert_bus.describe())
+    return "\n".join(lines)
+
+
+def build_metrics_report(
+    runtimes: list[ScraperRuntime],
+    stage_timer: StageTimer,
+    freshness: FreshnessTracker,
+    alert_bus: AlertBus | None = None,
+    memory_governor: MemoryGovernor | None = None,
+    renderer: CoalescingRenderer | None = None,
+) -> dict[str, object]:
+    """Métricas serializables del monitor para `GET /api/metrics`."""
+    return {
+        "scrapers": {
+            runtime.name: {
+                "ready": runtime.ready,
+                "recycling": runtime.recycling,
+                "stale": runtime.stale,
+                "low_render": runtime.name.lower() in LOW_RENDER_BOOKS,
+                "matches": len(runtime.last_matches),
+            }
+            for runtime in runtimes
+        },
+        "stages": stage_timer.snapshot(),
+        "freshness": freshness.snapshot(),
+        "memory": memory_governor.snapshot() if memory_governor is not None else {},
+        "render": renderer.snapshot() if renderer is not None else {},
+        "alerts": alert_bus.stats() if alert_bus is not None else {},
+    }
+
+
 async def command_loop(
     stop_event: asyncio.Event,
     open_dashboard_callback: Callable[[], None],
+    status_callback: Callable[[], str] | None = None,
+    profile_capture: ProfileCapture | None = None,
 ) -> None:
     """Mantiene la consola principal para comandos de control."""
     help_text = (
-        "Comandos disponibles: help | status | open | exit\n"
+        "Comandos disponibles: help | status | open | profile [segundos] | exit\n"
         "- help: muestra esta ayuda\n"
-        "- status: confirma que el monitor sigue activo\n"
+        "- status: muestra el estado de cada scraper\n"
         "- open: abre otra ventana del dashboard\n"
+        "- profile: muestrea el monitor N segundos (10 por defecto) y guarda el perfil\n"
         "- exit: detiene el monitor y cierra"
     )
     print(help_text)
@@ -225,11 +378,22 @@ async def command_loop(
             print(help_text)
             continue
         if command == "status":
-            print("Monitor activo. Dashboard actualizándose en tiempo real.")
+            if status_callback is None:
+                print("Monitor activo. Dashboard actualizándose en tiempo real.")
+            else:
+                print(status_callback())
             continue
         if command == "open":
             open_dashboard_callback()
             print("Ventana del dashboard abierta.")
             continue
+        if (command == "profile" or command.startswith("profile ")) and profile_capture:
+            seconds = parse_profile_seconds(command.removeprefix("profile").strip())
+            if seconds is None:
+                print("Uso: profile <segundos>")
+                continue
+            report = await profile_capture.capture(seconds)
+            print(report.describe() if report else "Ya hay una captura de perfil en curso.")
+            continue
         if command:
             print("Comando no reconocido. Usa 'help'.")
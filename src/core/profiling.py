@@ -0,0 +1,260 @@
+import asyncio
+import io
+import math
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+
+from src.core.logger import logger
+from src.core.metrics import StageTimer
+
+TRUNCATED_STACK = "[pilas truncadas]"
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame: FrameType | None, max_depth: int) -> list[str]:
+    """Pila de un frame de la raíz a la hoja, como etiquetas `función (fichero:línea)`."""
+    labels: list[str] = []
+    while frame is not None and len(labels) < max_depth:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class SamplingProfiler:
+    """Perfilador por muestreo de todos los hilos con `sys._current_frames()`.
+
+    Un hilo demonio toma una foto de las pilas cada `interval_seconds` y acumula
+    cuántas veces aparece cada pila completa, que es justo el formato "collapsed"
+    que consumen `flamegraph.pl` y speedscope. No instrumenta llamadas, así que el
+    coste es proporcional a la frecuencia de muestreo y no a lo que hace el monitor.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = 0.01,
+        max_depth: int = 64,
+        max_stacks: int = 20000,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Arranca el hilo de muestreo."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Detiene el muestreo y espera al hilo."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own_thread_id = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread_id:
+                    continue
+                stack = [
+                    thread_names.get(thread_id, str(thread_id)),
+                    *collapse_stack(frame, self.max_depth),
+                ]
+                key = ";".join(stack)
+                # Límite de pilas distintas: la memoria del perfil no crece sin control
+                if key not in self.stacks and len(self.stacks) >= self.max_stacks:
+                    key = f"{stack[0]};{TRUNCATED_STACK}"
+                self.stacks[key] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Pilas en formato collapsed (`marco;marco;marco N` por línea)."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top_frames(self, limit: int = 20, thread_name: str | None = None) -> list[tuple[str, int]]:
+        """Marcos hoja con más muestras, opcionalmente solo de un hilo.
+
+        El muestreo es de reloj de pared: en el hilo del bucle, un `select` arriba
+        significa que el bucle estaba ocioso.
+        """
+        leaves: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            thread, _, _ = stack.partition(";")
+            if thread_name is None or thread == thread_name:
+                leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(limit)
+
+
+def format_task_stacks(limit: int = 12) -> str:
+    """Pila de cada tarea asyncio viva (debe llamarse desde el bucle de eventos)."""
+    buffer = io.StringIO()
+    tasks = sorted(asyncio.all_tasks(), key=lambda task: task.get_name())
+    buffer.write(f"{len(tasks)} tareas asyncio\n")
+    for task in tasks:
+        buffer.write(f"\n--- {task.get_name()} ---\n")
+        task.print_stack(limit=limit, file=buffer)
+    return buffer.getvalue()
+
+
+def summarize_stage_window(
+    before: dict[str, tuple[int, float]],
+    after: dict[str, tuple[int, float]],
+) -> dict[str, dict[str, float | int | None]]:
+    """Llamadas y duración media por etapa entre dos lecturas de `StageTimer.totals()`."""
+    summary: dict[str, dict[str, float | int | None]] = {}
+    for stage, (count_after, sum_after) in after.items():
+        count_before, sum_before = before.get(stage, (0, 0.0))
+        calls = count_after - count_before
+        summary[stage] = {
+            "calls": calls,
+            "avg_ms": round((sum_after - sum_before) / calls, 2) if calls else None,
+        }
+    return summary
+
+
+@dataclass(frozen=True)
+class ProfileReport:
+    """Resultado de una captura: ficheros escritos y resumen."""
+
+    collapsed_path: Path
+    summary_path: Path
+    seconds: float
+    samples: int
+    stages: dict[str, dict[str, float | int | None]]
+    top_frames: list[tuple[str, int]]
+
+    def to_payload(self) -> dict[str, object]:
+        """Resumen serializable para la respuesta HTTP."""
+        return {
+            "collapsed_path": str(self.collapsed_path),
+            "summary_path": str(self.summary_path),
+            "seconds": self.seconds,
+            "samples": self.samples,
+            "stages": self.stages,
+            "top_frames": [{"frame": frame, "samples": count} for frame, count in self.top_frames],
+        }
+
+    def describe(self) -> str:
+        """Resumen para la consola."""
+        lines = [
+            f"Perfil de {self.seconds:.0f}s: {self.samples} muestras",
+            f"- Pilas (collapsed): {self.collapsed_path}",
+            f"- Resumen y tareas asyncio: {self.summary_path}",
+            "- Etapas en la ventana:",
+        ]
+        lines.extend(
+            f"  · {stage}: {values['calls']} llamadas, media {values['avg_ms']} ms"
+            for stage, values in self.stages.items()
+        )
+        lines.append("- Marcos con más muestras en el hilo del bucle de eventos:")
+        lines.extend(f"  · {count:>6} {frame}" for frame, count in self.top_frames[:5])
+        return "\n".join(lines)
+
+
+class ProfileCapture:
+    """Capturas de perfil bajo demanda, seguras para lanzarlas en producción.
+
+    Solo hay una captura a la vez, la duración se recorta a `max_seconds` y en
+    `output_dir` se conservan como mucho `keep_profiles` capturas. El bucle de
+    eventos sigue funcionando mientras se muestrea; la escritura de ficheros va a
+    un hilo. En modo `process` solo se perfila el proceso principal.
+    """
+
+    def __init__(
+        self,
+        stage_timer: StageTimer,
+        output_dir: Path,
+        max_seconds: float = 60.0,
+        keep_profiles: int = 20,
+        interval_seconds: float = 0.01,
+    ) -> None:
+        self._stage_timer = stage_timer
+        self._output_dir = output_dir
+        self.max_seconds = max_seconds
+        self._keep_profiles = keep_profiles
+        self._interval_seconds = interval_seconds
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        """Indica si hay una captura en curso."""
+        return self._running
+
+    async def capture(self, seconds: float) -> ProfileReport | None:
+        """Muestrea `seconds` segundos y escribe los ficheros; None si ya hay otra captura.
+
+        Raises:
+            ValueError: Si `seconds` no es un número finito (NaN haría esperar para siempre).
+        """
+        if not math.isfinite(seconds):
+            raise ValueError(f"Duración de perfil no válida: {seconds}")
+        if self._running:
+            return None
+        self._running = True
+        seconds = min(max(seconds, 1.0), self.max_seconds)
+        try:
+            profiler = SamplingProfiler(self._interval_seconds)
+            stages_before = self._stage_timer.totals()
+            logger.info(f"Perfilando el monitor durante {seconds:.0f}s...")
+            profiler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                await asyncio.to_thread(profiler.stop)
+            stages = summarize_stage_window(stages_before, self._stage_timer.totals())
+            task_stacks = format_task_stacks()
+
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            report = ProfileReport(
+                collapsed_path=self._output_dir / f"profile-{stamp}.collapsed",
+                summary_path=self._output_dir / f"profile-{stamp}.txt",
+                seconds=seconds,
+                samples=profiler.samples,
+                stages=stages,
+                top_frames=profiler.top_frames(thread_name=threading.current_thread().name),
+            )
+            await asyncio.to_thread(self._write, report, profiler.collapsed(), task_stacks)
+            logger.info(f"Perfil guardado en {report.collapsed_path}")
+            return report
+        finally:
+            self._running = False
+
+    def _write(self, report: ProfileReport, collapsed: str, task_stacks: str) -> None:
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        report.collapsed_path.write_text(collapsed, encoding="utf-8")
+        report.summary_path.write_text(
+            f"{report.describe()}\n\n{task_stacks}",
+            encoding="utf-8",
+        )
+        profiles = sorted(self._output_dir.glob("profile-*.collapsed"))
+        for old_collapsed in profiles[: -self._keep_profiles]:
+            old_collapsed.unlink(missing_ok=True)
+            old_collapsed.with_suffix(".txt").unlink(missing_ok=True)
+
+
+def parse_profile_seconds(text: str, default: float = 10.0) -> float | None:
+    """Lee los segundos de `profile <segundos>`; None si no es un número positivo."""
+    if not text:
+        return default
+    try:
+        seconds = float(text)
+    except ValueError:
+        return None
+    return seconds if math.isfinite(seconds) and seconds > 0 else None
@@ -1,9 +1,88 @@
+import os
 from pathlib import Path
 
+from dotenv import load_dotenv
+
 from src.ui.dashboard_server import DashboardServerConfig
 
+# Las variables BETHURTADOM_* se leen al importar este módulo, antes de main()
+load_dotenv()
+
+
+def parse_book_options(value: str) -> dict[str, str]:
+    """Lee una lista por casa como `winamax,bet365:virtual` -> `{"winamax": "", "bet365": "virtual"}`."""
+    options: dict[str, str] = {}
+    for item in value.split(","):
+        book, _, option = item.strip().lower().partition(":")
+        if book:
+            options[book] = option
+    return options
+
+
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
+BROWSER_PROFILES_DIR = PROJECT_ROOT / ".profiles"
+# Casas cuyas pestañas usan el perfil de bajo render (sin animaciones, viewport menor, 10 fps)
+LOW_RENDER_BOOKS = set(parse_book_options(os.getenv("BETHURTADOM_LOW_RENDER", "")))
+# Casas con navegador sin ventana: `casa` = headless real, `casa:virtual` = pantalla virtual
+# (Xvfb), que conserva la huella de un navegador con ventana frente a los antibots
+HEADLESS_BOOKS = {
+    book: "virtual" if option == "virtual" else True
+    for book, option in parse_book_options(os.getenv("BETHURTADOM_HEADLESS", "")).items()
+}
 TEAM_NAME_MAPPINGS_PATH = PROJECT_ROOT / "src" / "engine" / "team_name_mappings.json"
+TEAM_NAME_MAPPINGS_JOURNAL_PATH = TEAM_NAME_MAPPINGS_PATH.with_suffix(".journal")
+TEAM_NAME_MAPPINGS_RELOAD_SECONDS = 2.0
+TEAM_NAME_MAPPINGS_FLUSH_SECONDS = 0.25
+TEAM_NAME_MAPPINGS_COMPACT_EVERY = 200
+TEAM_NAME_MAPPINGS_COMPACT_SECONDS = 300.0
+SHUTDOWN_TIMEOUT_SECONDS = 5.0
+# Últimos partidos de cada casa para arrancar el dashboard con datos (marcados sin confirmar)
+SNAPSHOT_CHECKPOINT_PATH = PROJECT_ROOT / ".state" / "last_snapshot.json"
+SNAPSHOT_CHECKPOINT_SECONDS = 30.0
+# Un checkpoint más viejo que esto no se restaura (sus partidos en vivo ya no se parecen al directo)
+SNAPSHOT_CHECKPOINT_MAX_AGE_SECONDS = 1800.0
+LOG_STRUCTURED = os.getenv("BETHURTADOM_LOG_FORMAT", "text").lower() == "json"
+# "inprocess": ambos scrapers en el bucle principal | "process": un proceso worker por casa
+SCRAPER_MODE = os.getenv("BETHURTADOM_SCRAPER_MODE", "inprocess").lower()
+# Máximo de pestañas shard para Bet365 (0 = una sola pestaña con todo el directo)
+BET365_MAX_SHARDS = int(os.getenv("BETHURTADOM_BET365_SHARDS", "0"))
+BET365_FIXTURES_PER_SHARD = 40
+# Login automático en Winamax al arrancar si el perfil no conserva la sesión (usa el .env)
+WINAMAX_AUTO_LOGIN = os.getenv("BETHURTADOM_WINAMAX_AUTO_LOGIN", "0") == "1"
+# Ingesta de Bet365 desde su websocket en vez del DOM (el DOM queda como respaldo)
+BET365_USE_FEED = os.getenv("BETHURTADOM_BET365_FEED", "0") == "1"
+_bet365_feed_recording = os.getenv("BETHURTADOM_BET365_FEED_RECORD")
+BET365_FEED_RECORDING_PATH = Path(_bet365_feed_recording) if _bet365_feed_recording else None
+
+ALERTS_LOG_PATH = PROJECT_ROOT / "logs" / "alerts.jsonl"
+PROFILES_DIR = PROJECT_ROOT / "logs" / "profiles"
+PROFILE_MAX_SECONDS = 60.0
+ALERT_WEBHOOK_URL = os.getenv("BETHURTADOM_ALERT_WEBHOOK")
+ALERT_COOLDOWN_SECONDS = 30.0
+ALERT_RING_SIZE = 500
+ALERT_QUEUE_SIZE = 256
+# Margen mínimo (1 - suma de inversas de las mejores cuotas) para alertar arbitraje
+ARBITRAGE_MIN_MARGIN = 0.0
+# Movimiento de línea: variación relativa en la ventana que dispara y la que se considera "quieta"
+LINE_MOVEMENT_WINDOW_SECONDS = 10.0
+LINE_MOVEMENT_MOVE_THRESHOLD = 0.05
+LINE_MOVEMENT_LAG_THRESHOLD = 0.01
+# Edad máxima (ms) de los datos de ambas casas para que una pareja pase por los detectores
+_freshness_max_age = os.getenv("BETHURTADOM_MAX_AGE_MS")
+FRESHNESS_MAX_AGE_MS = float(_freshness_max_age) if _freshness_max_age else None
+# Sin tramas del feed de Bet365 en este plazo, el feed se da por muerto y se lee el DOM
+BET365_FEED_MAX_SILENCE_MS = FRESHNESS_MAX_AGE_MS or 10000.0
+# Gobernador de memoria: RSS máximo del árbol de procesos de cada navegador (0 = sin límite)
+# y reciclado preventivo de la página cada N horas (0 = nunca)
+BROWSER_RSS_LIMIT_MB = float(os.getenv("BETHURTADOM_BROWSER_RSS_LIMIT_MB", "2048"))
+PAGE_RECYCLE_HOURS = float(os.getenv("BETHURTADOM_PAGE_RECYCLE_HOURS", "6"))
+MEMORY_SAMPLE_SECONDS = 30.0
+MEMORY_QUIET_SECONDS = 20.0
+MEMORY_MAX_DEFER_SECONDS = 300.0
+# Mínimo entre dos reciclados de la misma casa (evita reciclar en bucle)
+MEMORY_MIN_RECYCLE_SECONDS = 600.0
+# Frames por asignación para tracemalloc (0 = desactivado; solo para buscar fugas)
+MEMORY_TRACEMALLOC_FRAMES = int(os.getenv("BETHURTADOM_TRACEMALLOC", "0"))
 
 DASHBOARD_CONFIG = DashboardServerConfig(
     host="127.0.0.1",
@@ -13,4 +92,5 @@ DASHBOARD_CONFIG = DashboardServerConfig(
     template_path=PROJECT_ROOT / "src" / "ui" / "dashboard_template.html",
     css_path=PROJECT_ROOT / "src" / "ui" / "dashboard.css",
     js_path=PROJECT_ROOT / "src" / "ui" / "dashboard.js",
+    client_rendering=os.getenv("BETHURTADOM_DASHBOARD_RENDER", "server").lower() == "client",
 )
@@ -0,0 +1,304 @@
+import asyncio
+import contextlib
+import json
+import multiprocessing
+from collections.abc import Awaitable, Callable
+from multiprocessing.connection import Connection
+from typing import TYPE_CHECKING
+
+from src.core.logger import logger
+from src.models.odds import MatchInfo
+from src.scrapers.base import BaseScraper
+
+if TYPE_CHECKING:
+    from src.core.browser import BrowserManager
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dependencia opcional
+    msgpack = None
+
+MatchKey = str
+WorkerMessage = dict[str, object]
+
+_MSGPACK_TAG = b"M"
+_JSON_TAG = b"J"
+
+
+def encode_message(message: WorkerMessage) -> bytes:
+    """Serializa un mensaje worker -> agregador (msgpack si está disponible, si no JSON)."""
+    if msgpack is not None:
+        return _MSGPACK_TAG + msgpack.packb(message, use_bin_type=True)
+    return _JSON_TAG + json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def decode_message(payload: bytes) -> WorkerMessage:
+    """Deserializa un mensaje producido por `encode_message`."""
+    tag, body = payload[:1], payload[1:]
+    if tag == _MSGPACK_TAG:
+        if msgpack is None:
+            raise RuntimeError("Mensaje msgpack recibido pero msgpack no está instalado.")
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body)
+
+
+def build_worker_match_key(match: MatchInfo) -> MatchKey:
+    """Clave estable de un partido dentro del flujo de deltas de un worker."""
+    if match.match_url:
+        return match.match_url
+    return f"{match.competition or ''}|{match.home_team}|{match.away_team}"
+
+
+# Cambian en cada tick: viajan una vez por tick y no cuentan como cambio del partido
+TICK_TIMESTAMP_FIELDS = frozenset({"observed_at_ms", "received_at_ms"})
+
+
+class MatchDeltaEncoder:
+    """Calcula deltas (altas/cambios y bajas) entre ticks consecutivos de un scraper."""
+
+    def __init__(self) -> None:
+        self._previous: dict[MatchKey, dict[str, object]] = {}
+        self._sequence = 0
+
+    def diff(self, matches: list[MatchInfo]) -> WorkerMessage:
+        """Devuelve el delta respecto al tick anterior, o solo un latido si no cambió nada."""
+        current = {
+            build_worker_match_key(match): match.model_dump(exclude=TICK_TIMESTAMP_FIELDS)
+            for match in matches
+        }
+        observed = [match.observed_at_ms for match in matches if match.observed_at_ms is not None]
+        received = [match.received_at_ms for match in matches if match.received_at_ms is not None]
+        stamps = {
+            "observed_at_ms": min(observed, default=None),
+            "received_at_ms": max(received, default=None),
+        }
+
+        upserts = [
+            [key, fields] for key, fields in current.items() if self._previous.get(key) != fields
+        ]
+        removals = [key for key in self._previous if key not in current]
+        self._previous = current
+        if not upserts and not removals and self._sequence:
+            return {"type": "tick", **stamps}
+
+        self._sequence += 1
+        return {
+            "type": "delta",
+            "seq": self._sequence,
+            "order": list(current),
+            "upsert": upserts,
+            "remove": removals,
+            **stamps,
+        }
+
+
+def _load_worker_starter(
+    bookmaker: str,
+) -> Callable[[], Awaitable[tuple[BrowserManager, BaseScraper] | None]]:
+    from src.core.monitoring import start_bet365_scraper, start_winamax_scraper
+
+    starters = {
+        "winamax": start_winamax_scraper,
+        "bet365": start_bet365_scraper,
+    }
+    return starters[bookmaker]
+
+
+async def _worker_main(bookmaker: str, connection: Connection, interval_seconds: float) -> None:
+    started = await _load_worker_starter(bookmaker)()
+    if started is None:
+        connection.send_bytes(encode_message({"type": "error", "message": "arranque fallido"}))
+        return
+
+    browser, scraper = started
+    connection.send_bytes(encode_message({"type": "ready"}))
+    encoder = MatchDeltaEncoder()
+    try:
+        while True:
+            if connection.poll(0):
+                # Cualquier orden que no sea reciclar detiene el worker
+                command = decode_message(connection.recv_bytes())
+                if command.get("type") != "recycle":
+                    break
+                recycled = await scraper.recycle()
+                connection.send_bytes(encode_message({"type": "recycled", "ok": recycled}))
+            matches = await scraper.get_live_matches()
+            connection.send_bytes(encode_message(encoder.diff(matches)))
+            await asyncio.sleep(interval_seconds)
+    finally:
+        await scraper.close()
+        await browser.stop()
+
+
+def run_scraper_worker(bookmaker: str, connection: Connection, interval_seconds: float) -> None:
+    """Punto de entrada del proceso worker: scrapea y envía deltas por la tubería."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    with contextlib.suppress(KeyboardInterrupt, BrokenPipeError, EOFError):
+        asyncio.run(_worker_main(bookmaker, connection, interval_seconds))
+
+
+class ProcessScraperProxy(BaseScraper):
+    """Scraper que vive en otro proceso y llega al agregador como flujo de deltas.
+
+    Cada casa de apuestas ejecuta su Playwright, su deserialización y su validación
+    en su propio proceso (y núcleo), así que un scraper lento o con pausas de GC no
+    mete jitter en el otro ni en el servidor del dashboard. Si el worker muere, el
+    proxy deja de servir sus últimos partidos y arranca uno nuevo.
+    """
+
+    def __init__(
+        self, bookmaker: str, interval_seconds: float, ready_timeout: float = 180.0
+    ) -> None:
+        self.bookmaker = bookmaker
+        self._interval_seconds = interval_seconds
+        self._ready_timeout = ready_timeout
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._connection: Connection | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+        self._matches: dict[MatchKey, MatchInfo] = {}
+        self._order: list[MatchKey] = []
+        self._tick_stamps: dict[str, float | None] = {}
+        self._recycle_done: asyncio.Future[bool] | None = None
+        self.last_sequence = 0
+
+    async def start(self) -> bool:
+        context = multiprocessing.get_context("spawn")
+        parent_connection, child_connection = context.Pipe(duplex=True)
+        self._process = context.Process(
+            target=run_scraper_worker,
+            args=(self.bookmaker, child_connection, self._interval_seconds),
+            name=f"scraper-{self.bookmaker}",
+            daemon=True,
+        )
+        self._process.start()
+        child_connection.close()
+        self._connection = parent_connection
+
+        try:
+            message = await asyncio.wait_for(self._receive(), timeout=self._ready_timeout)
+        except (TimeoutError, EOFError, OSError) as error:
+            logger.error(f"{self.bookmaker}: el worker no respondió al arrancar: {error}")
+            return False
+        if message.get("type") != "ready":
+            logger.error(f"{self.bookmaker}: el worker no pudo arrancar ({message}).")
+            return False
+
+        self._reader_task = asyncio.create_task(self._read_deltas())
+        logger.info(f"{self.bookmaker}: worker en proceso {self._process.pid} listo.")
+        return True
+
+    async def _receive(self) -> WorkerMessage:
+        payload = await asyncio.to_thread(self._connection.recv_bytes)
+        return decode_message(payload)
+
+    async def _read_deltas(self) -> None:
+        while True:
+            try:
+                message = await self._receive()
+            except EOFError, OSError:
+                break
+            self._handle_message(message)
+
+        # Los partidos de un worker muerto dejarían de cambiar sin que nadie lo notara
+        logger.error(f"{self.bookmaker}: el worker cerró la conexión, se reinicia.")
+        self._matches, self._order, self._tick_stamps = {}, [], {}
+        self.last_sequence = 0
+        await self._stop_worker()
+        if not await self.start():
+            logger.error(f"{self.bookmaker}: no se pudo reiniciar el worker.")
+            await self._stop_worker()
+
+    def _handle_message(self, message: WorkerMessage) -> None:
+        if message.get("type") == "delta":
+            self._apply_delta(message)
+        if message.get("type") in {"delta", "tick"}:
+            self._tick_stamps = {field: message.get(field) for field in TICK_TIMESTAMP_FIELDS}
+        if (
+            message.get("type") == "recycled"
+            and self._recycle_done is not None
+            and not self._recycle_done.done()
+        ):
+            self._recycle_done.set_result(bool(message.get("ok")))
+
+    def _apply_delta(self, delta: WorkerMessage) -> None:
+        matches = dict(self._matches)
+        for key in delta.get("remove", []):
+            matches.pop(key, None)
+        for key, fields in delta.get("upsert", []):
+            matches[key] = MatchInfo.model_validate(fields)
+        self._matches = matches
+        self._order = list(delta.get("order", matches))
+        self.last_sequence = int(delta.get("seq", 0))
+
+    async def login(self) -> bool:
+        return False
+
+    async def navigate_to_live(self) -> bool:
+        return True
+
+    async def get_live_matches(self) -> list[MatchInfo]:
+        """Devuelve al instante el último estado reconstruido a partir de los deltas.
+
+        Se entregan copias porque el agregador normaliza los nombres in situ; las
+        marcas de tiempo son las del último tick recibido del worker.
+        """
+        matches, stamps = self._matches, self._tick_stamps
+        return [matches[key].model_copy(update=stamps) for key in self._order if key in matches]
+
+    async def recycle(self) -> bool:
+        """Pide al worker que recicle su página y espera a que confirme."""
+        if self._connection is None:
+            return False
+        self._recycle_done = asyncio.get_running_loop().create_future()
+        try:
+            self._connection.send_bytes(encode_message({"type": "recycle"}))
+            return await asyncio.wait_for(self._recycle_done, timeout=self._ready_timeout)
+        except TimeoutError, OSError:
+            return False
+        finally:
+            self._recycle_done = None
+
+    @property
+    def process_pids(self) -> list[int]:
+        if self._process is None or self._process.pid is None:
+            return []
+        return [self._process.pid]
+
+    async def close(self) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        await self._stop_worker()
+
+    async def _stop_worker(self) -> None:
+        if self._connection is not None:
+            with contextlib.suppress(OSError):
+                self._connection.send_bytes(encode_message({"type": "stop"}))
+        if self._process is not None:
+            await asyncio.to_thread(self._process.join, 10)
+            if self._process.is_alive():
+                self._process.terminate()
+        if self._connection is not None:
+            self._connection.close()
+        self._process = None
+        self._connection = None
+
+
+async def start_process_scraper(
+    bookmaker: str,
+    interval_seconds: float,
+) -> tuple[None, ProcessScraperProxy] | None:
+    """Arranca un scraper en su propio proceso worker."""
+    proxy = ProcessScraperProxy(bookmaker, interval_seconds)
+    try:
+        if not await proxy.start():
+            await proxy.close()
+            return None
+    except asyncio.CancelledError:
+        logger.info(f"{bookmaker}: arranque cancelado, se detiene el worker.")
+        await proxy.close()
+        raise
+    return None, proxy
@@ -0,0 +1,257 @@
+import asyncio
+import contextlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from src.core.logger import logger
+from src.core.metrics import LatencyHistogram
+from src.models.alerts import Alert
+
+ALERT_BATCH_MAX_ITEMS = 64
+
+
+class AlertSink(ABC):
+    """Destino de alertas. Cada sink consume su propia cola acotada."""
+
+    name: str
+
+    @abstractmethod
+    async def deliver(self, alert: Alert) -> None:
+        """Entrega una alerta al destino."""
+
+    async def deliver_batch(self, alerts: list[Alert]) -> None:
+        """Entrega las alertas acumuladas en la cola; por defecto, una a una."""
+        for alert in alerts:
+            await self.deliver(alert)
+
+
+class ConsoleAlertSink(AlertSink):
+    """Escribe las alertas en el logger principal."""
+
+    name = "console"
+
+    async def deliver(self, alert: Alert) -> None:
+        logger.warning(f"🚨 [{alert.kind}] {alert.message}")
+
+
+class FileAlertSink(AlertSink):
+    """Añade cada alerta como una línea JSON a un fichero append-only (un `write` por lote)."""
+
+    name = "file"
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    def _append(self, text: str) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._path.open("a", encoding="utf-8") as file:
+            file.write(text)
+
+    async def deliver(self, alert: Alert) -> None:
+        await self.deliver_batch([alert])
+
+    async def deliver_batch(self, alerts: list[Alert]) -> None:
+        text = "".join(
+            alert.model_dump_json(exclude={"detected_perf_counter"}) + "\n" for alert in alerts
+        )
+        await asyncio.to_thread(self._append, text)
+
+
+class WebhookAlertSink(AlertSink):
+    """Envía las alertas como POST a un webhook HTTP local: un array JSON por lote."""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout_seconds: float = 2.0) -> None:
+        parsed = urlsplit(url)
+        if parsed.scheme != "http" or not parsed.hostname:
+            raise ValueError(f"Webhook de alertas no soportado (solo http local): {url}")
+        self._host = parsed.hostname
+        self._port = parsed.port or 80
+        self._path = parsed.path or "/"
+        self._timeout_seconds = timeout_seconds
+
+    async def _post(self, body: bytes) -> None:
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        try:
+            request_head = (
+                f"POST {self._path} HTTP/1.1\r\n"
+                f"Host: {self._host}:{self._port}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(request_head.encode("utf-8") + body)
+            await writer.drain()
+            status_line = await reader.readline()
+            if b" 2" not in status_line[:13]:
+                raise ConnectionError(f"Respuesta inesperada del webhook: {status_line!r}")
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def deliver(self, alert: Alert) -> None:
+        await self.deliver_batch([alert])
+
+    async def deliver_batch(self, alerts: list[Alert]) -> None:
+        body = json.dumps(
+            [alert.model_dump(mode="json", exclude={"detected_perf_counter"}) for alert in alerts],
+            ensure_ascii=False,
+        ).encode("utf-8")
+        await asyncio.wait_for(self._post(body), timeout=self._timeout_seconds)
+
+
+class DashboardAlertSink(AlertSink):
+    """Empuja las alertas al canal de alertas del dashboard."""
+
+    name = "dashboard"
+
+    def __init__(self, push: Callable[[dict[str, object]], None]) -> None:
+        self._push = push
+
+    async def deliver(self, alert: Alert) -> None:
+        self._push(alert.model_dump(mode="json", exclude={"detected_perf_counter"}))
+
+
+class _SinkChannel:
+    """Cola acotada + métricas de un sink concreto.
+
+    Cada vez que el worker despierta vacía la cola (hasta `ALERT_BATCH_MAX_ITEMS`) y
+    la entrega en un solo lote: una ráfaga cuesta una escritura o una conexión.
+    """
+
+    def __init__(self, sink: AlertSink, queue_size: int) -> None:
+        self.sink = sink
+        self.queue: asyncio.Queue[Alert] = asyncio.Queue(maxsize=queue_size)
+        self.latency = LatencyHistogram()
+        self.delivered = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def offer(self, alert: Alert) -> None:
+        """Encola sin bloquear; si la cola está llena descarta la alerta más antigua."""
+        if self.queue.full():
+            with contextlib.suppress(asyncio.QueueEmpty):
+                self.queue.get_nowait()
+                self.queue.task_done()
+                self.dropped += 1
+        self.queue.put_nowait(alert)
+
+    def _take_batch(self, first: Alert) -> list[Alert]:
+        batch = [first]
+        while len(batch) < ALERT_BATCH_MAX_ITEMS:
+            try:
+                batch.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def run(self) -> None:
+        while True:
+            batch = self._take_batch(await self.queue.get())
+            try:
+                await self.sink.deliver_batch(batch)
+                self.delivered += len(batch)
+                delivered_at = time.perf_counter()
+                for alert in batch:
+                    self.latency.observe((delivered_at - alert.detected_perf_counter) * 1000)
+            except Exception as error:  # noqa: BLE001
+                self.failed += len(batch)
+                logger.debug(f"Sink de alertas '{self.sink.name}' falló: {error}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+
+class AlertBus:
+    """Bus de alertas con deduplicación por clave y fan-out a sinks independientes.
+
+    `publish` es síncrono y no bloquea: aplica el cooldown por clave, guarda la
+    alerta en un buffer circular y la ofrece a la cola acotada de cada sink. Un
+    sink lento solo llena (y recorta) su propia cola, nunca retrasa la detección.
+    """
+
+    def __init__(
+        self,
+        sinks: list[AlertSink],
+        cooldown_seconds: float = 30.0,
+        ring_size: int = 500,
+        queue_size: int = 256,
+    ) -> None:
+        self._channels = [_SinkChannel(sink, queue_size) for sink in sinks]
+        self._cooldown_seconds = cooldown_seconds
+        self._recent: deque[Alert] = deque(maxlen=ring_size)
+        self._last_seen: dict[str, float] = {}
+        self.published = 0
+        self.suppressed = 0
+        self.last_published_at: float | None = None
+
+    @property
+    def recent(self) -> list[Alert]:
+        """Últimas alertas publicadas (más recientes al final)."""
+        return list(self._recent)
+
+    def publish(self, alert: Alert) -> bool:
+        """Publica una alerta salvo que su clave siga en cooldown."""
+        now = alert.detected_perf_counter
+        last_seen = self._last_seen.get(alert.key)
+        if last_seen is not None and now - last_seen < self._cooldown_seconds:
+            self.suppressed += 1
+            return False
+
+        self._last_seen[alert.key] = now
+        self._recent.append(alert)
+        self.published += 1
+        self.last_published_at = now
+        for channel in self._channels:
+            channel.offer(alert)
+        self._prune_cooldowns(now)
+        return True
+
+    def _prune_cooldowns(self, now: float) -> None:
+        if len(self._last_seen) <= 4 * (self._recent.maxlen or 1):
+            return
+        self._last_seen = {
+            key: seen_at
+            for key, seen_at in self._last_seen.items()
+            if now - seen_at < self._cooldown_seconds
+        }
+
+    def stats(self) -> dict[str, dict[str, object]]:
+        """Métricas por sink: entregadas, descartadas, fallidas, cola y latencia."""
+        return {
+            channel.sink.name: {
+                "delivered": channel.delivered,
+                "dropped": channel.dropped,
+                "failed": channel.failed,
+                "queued": channel.queue.qsize(),
+                "latency": channel.latency.snapshot(),
+            }
+            for channel in self._channels
+        }
+
+    def describe(self) -> str:
+        """Resumen del bus para el comando `status`."""
+        lines = [f"- Alertas: {self.published} publicadas | {self.suppressed} en cooldown"]
+        lines.extend(
+            f"  · {channel.sink.name}: {channel.delivered} ok, {channel.dropped} descartadas, "
+            f"{channel.failed} fallidas | latencia {channel.latency.describe()}"
+            for channel in self._channels
+        )
+        return "\n".join(lines)
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """Ejecuta un worker por sink hasta que se detiene el monitor."""
+        workers = [asyncio.create_task(channel.run()) for channel in self._channels]
+        try:
+            await stop_event.wait()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
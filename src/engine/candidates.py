@@ -0,0 +1,105 @@
+from collections import defaultdict
+from dataclasses import dataclass
+
+from src.engine.team_name_normalizer import fold_team_name
+from src.models.odds import MatchInfo
+
+MINUTE_TOLERANCE = 2
+ANY_COUNTRY = "*"
+
+BlockKey = tuple[int | None, int, int, str]
+
+
+def competition_country_key(competition: str | None) -> str:
+    """Primer tramo plegado de la competición (`España - LaLiga` -> `espana`)."""
+    if not competition:
+        return ANY_COUNTRY
+    return fold_team_name(competition.split(" - ", 1)[0]) or ANY_COUNTRY
+
+
+def _name_tokens(match: MatchInfo) -> frozenset[str]:
+    return frozenset(
+        fold_team_name(match.home_team).split() + fold_team_name(match.away_team).split()
+    )
+
+
+@dataclass(frozen=True)
+class LinkCandidate:
+    """Partido de Bet365 propuesto para enlazar con uno pendiente de Winamax."""
+
+    bet365_index: int
+    score: float
+
+
+class CandidateIndex:
+    """Índice por bloques de los partidos pendientes de Bet365.
+
+    Cada partido entra en el bloque `(minuto, marcador, país)` y en el comodín
+    `(minuto, marcador, *)`. Una consulta solo mira los bloques de su marcador en
+    minuto ±2, así que el coste depende del tamaño del bloque y no del total de
+    pendientes. Dentro del bloque se ordena por solapamiento de nombres y cercanía
+    de minuto.
+    """
+
+    def __init__(self, bet365_matches: list[MatchInfo]) -> None:
+        self._matches = bet365_matches
+        self._tokens = [_name_tokens(match) for match in bet365_matches]
+        self._countries = [competition_country_key(match.competition) for match in bet365_matches]
+        self._blocks: dict[BlockKey, list[int]] = defaultdict(list)
+        for index, (match, country) in enumerate(zip(bet365_matches, self._countries, strict=True)):
+            for block_country in {country, ANY_COUNTRY}:
+                self._blocks[
+                    (match.minute, match.score_home, match.score_away, block_country)
+                ].append(index)
+
+    def _block_indexes(self, match: MatchInfo, country: str) -> list[int]:
+        if match.minute is None:
+            minutes: list[int | None] = [None]
+        else:
+            minutes = list(
+                range(match.minute - MINUTE_TOLERANCE, match.minute + MINUTE_TOLERANCE + 1)
+            )
+        indexes: list[int] = []
+        for minute in minutes:
+            indexes.extend(
+                self._blocks.get((minute, match.score_home, match.score_away, country), ())
+            )
+        return indexes
+
+    def candidates(self, winamax_match: MatchInfo, top_k: int = 3) -> list[LinkCandidate]:
+        """Devuelve hasta `top_k` partidos de Bet365 del mismo bloque, mejor primero."""
+        country = competition_country_key(winamax_match.competition)
+        indexes = self._block_indexes(winamax_match, country)
+        if len(indexes) < top_k and country != ANY_COUNTRY:
+            # Los nombres de país no siempre coinciden entre casas: se completa con el comodín
+            indexes = list(
+                dict.fromkeys([*indexes, *self._block_indexes(winamax_match, ANY_COUNTRY)])
+            )
+
+        tokens = _name_tokens(winamax_match)
+        scored: list[LinkCandidate] = []
+        for index in indexes:
+            candidate_tokens = self._tokens[index]
+            union = tokens | candidate_tokens
+            overlap = len(tokens & candidate_tokens) / len(union) if union else 0.0
+            minute_gap = (
+                abs(winamax_match.minute - self._matches[index].minute)
+                if winamax_match.minute is not None and self._matches[index].minute is not None
+                else 0
+            )
+            same_country = self._countries[index] == country
+            score = overlap + 0.1 * same_country - 0.05 * minute_gap
+            scored.append(LinkCandidate(bet365_index=index, score=round(score, 4)))
+
+        scored.sort(key=lambda candidate: candidate.score, reverse=True)
+        return scored[:top_k]
+
+
+def build_link_suggestions(
+    winamax_matches: list[MatchInfo],
+    bet365_matches: list[MatchInfo],
+    top_k: int = 3,
+) -> list[list[LinkCandidate]]:
+    """Candidatos de Bet365 para cada pendiente de Winamax (mismo orden que la entrada)."""
+    index = CandidateIndex(bet365_matches)
+    return [index.candidates(match, top_k) for match in winamax_matches]
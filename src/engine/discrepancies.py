@@ -0,0 +1,95 @@
+import time
+
+from src.models.alerts import Alert
+from src.models.odds import MatchInfo
+
+
+def format_pair_label(bet365_match: MatchInfo) -> str:
+    """Etiqueta legible de un partido enlazado (nombres canónicos de Bet365)."""
+    return f"{bet365_match.home_team} vs {bet365_match.away_team}"
+
+
+def build_pair_key(winamax_match: MatchInfo, bet365_match: MatchInfo) -> str:
+    """Clave única de una pareja enlazada para la matriz de cuotas y los detectores.
+
+    La etiqueta `Local vs Visitante` no basta: dos partidos con los mismos nombres
+    en competiciones distintas compartirían fila y mezclarían sus cuotas. Cada casa
+    aporta la URL del partido o, si no la tiene, competición y equipos.
+    """
+    return "||".join(
+        match.match_url or f"{match.competition or ''}|{match.home_team}|{match.away_team}"
+        for match in (winamax_match, bet365_match)
+    )
+
+
+def match_age_ms(match: MatchInfo, now_ms: float) -> float | None:
+    """Antigüedad de un registro desde que se leyó en la página (o llegó a Python)."""
+    timestamp_ms = (
+        match.observed_at_ms if match.observed_at_ms is not None else match.received_at_ms
+    )
+    if timestamp_ms is None:
+        return None
+    return now_ms - timestamp_ms
+
+
+def filter_fresh_pairs(
+    linked_pairs: list[tuple[MatchInfo, MatchInfo]],
+    max_age_ms: float | None,
+    now_ms: float | None = None,
+) -> list[tuple[MatchInfo, MatchInfo]]:
+    """Descarta las parejas en las que alguna casa tiene datos más viejos que `max_age_ms`.
+
+    Un registro sin marca de tiempo se considera viejo cuando hay umbral, para que
+    un dato de origen desconocido nunca produzca una falsa oportunidad.
+    """
+    if max_age_ms is None:
+        return linked_pairs
+    now_ms = time.time() * 1000 if now_ms is None else now_ms
+    fresh_pairs: list[tuple[MatchInfo, MatchInfo]] = []
+    for winamax_match, bet365_match in linked_pairs:
+        ages = (match_age_ms(winamax_match, now_ms), match_age_ms(bet365_match, now_ms))
+        if all(age is not None and age <= max_age_ms for age in ages):
+            fresh_pairs.append((winamax_match, bet365_match))
+    return fresh_pairs
+
+
+def detect_score_mismatches(
+    linked_pairs: list[tuple[MatchInfo, MatchInfo]],
+) -> list[Alert]:
+    """Detecta partidos enlazados cuyo marcador difiere entre casas.
+
+    Un marcador distinto indica que una casa aún no ha reflejado un gol: es el
+    momento en que sus cuotas pueden ir por detrás de la otra.
+    """
+    detected_perf_counter = time.perf_counter()
+    alerts: list[Alert] = []
+    for winamax_match, bet365_match in linked_pairs:
+        winamax_score = (winamax_match.score_home, winamax_match.score_away)
+        bet365_score = (bet365_match.score_home, bet365_match.score_away)
+        if winamax_score == bet365_score:
+            continue
+
+        label = format_pair_label(bet365_match)
+        alerts.append(
+            Alert(
+                kind="score_mismatch",
+                key=(
+                    f"score_mismatch:{label}:"
+                    f"{winamax_score[0]}-{winamax_score[1]}:{bet365_score[0]}-{bet365_score[1]}"
+                ),
+                message=(
+                    f"{label}: Winamax {winamax_score[0]}-{winamax_score[1]} / "
+                    f"Bet365 {bet365_score[0]}-{bet365_score[1]}"
+                ),
+                match_label=label,
+                details={
+                    "winamax_score": f"{winamax_score[0]}-{winamax_score[1]}",
+                    "bet365_score": f"{bet365_score[0]}-{bet365_score[1]}",
+                    "minute": winamax_match.minute
+                    if winamax_match.minute is not None
+                    else bet365_match.minute,
+                },
+                detected_perf_counter=detected_perf_counter,
+            )
+        )
+    return alerts
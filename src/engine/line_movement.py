@@ -0,0 +1,273 @@
+import math
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from src.engine.discrepancies import build_pair_key, format_pair_label
+from src.models.alerts import Alert
+from src.models.odds import MatchInfo
+
+BookOutcomeKey = tuple[str, str, str, str]
+
+
+@dataclass(frozen=True)
+class RollingStats:
+    """Estadísticas de una cuota dentro de la ventana móvil."""
+
+    price: float | None
+    window_start_price: float | None
+    delta: float
+    relative_delta: float
+    velocity: float
+    suspended: bool
+    suspended_since: float | None
+
+
+class OddsRing:
+    """Buffer circular de tamaño fijo con los cambios de una cuota y su instante.
+
+    Solo se guardan cambios (incluidas suspensiones como `NaN`). El puntero de
+    ventana avanza de forma monótona con el tiempo, así que `push()` y `stats()` son
+    O(1) amortizado sin recorrer el histórico.
+    """
+
+    def __init__(self, capacity: int, window_seconds: float) -> None:
+        self._capacity = capacity
+        self._window_seconds = window_seconds
+        self._timestamps = [0.0] * capacity
+        self._prices = [math.nan] * capacity
+        self._head = -1
+        self._count = 0
+        self._window_tail = 0
+        self._suspended_since: float | None = None
+
+    @property
+    def last_price(self) -> float | None:
+        """Última cuota conocida (`None` si está suspendida o no hay datos)."""
+        if not self._count:
+            return None
+        price = self._prices[self._head]
+        return None if math.isnan(price) else price
+
+    def push(self, timestamp: float, price: float | None) -> str | None:
+        """Registra una cuota si cambió; devuelve `suspend`/`resume` en las transiciones."""
+        value = math.nan if price is None else price
+        if self._count:
+            previous = self._prices[self._head]
+            if previous == value or (math.isnan(previous) and math.isnan(value)):
+                self._advance_window(timestamp)
+                return None
+
+        was_suspended = self._count > 0 and math.isnan(self._prices[self._head])
+        self._head = (self._head + 1) % self._capacity
+        self._timestamps[self._head] = timestamp
+        self._prices[self._head] = value
+        if self._count < self._capacity:
+            self._count += 1
+        elif self._window_tail == self._head:
+            # Se sobrescribió el inicio de la ventana: pasa a ser la muestra más antigua
+            self._window_tail = (self._head + 1) % self._capacity
+        self._advance_window(timestamp)
+
+        if math.isnan(value) and not was_suspended and self._count > 1:
+            self._suspended_since = timestamp
+            return "suspend"
+        if was_suspended and not math.isnan(value):
+            self._suspended_since = None
+            return "resume"
+        return None
+
+    def _advance_window(self, now: float) -> None:
+        window_start = now - self._window_seconds
+        while self._window_tail != self._head:
+            next_index = (self._window_tail + 1) % self._capacity
+            if self._timestamps[next_index] > window_start:
+                break
+            self._window_tail = next_index
+
+    def stats(self, now: float) -> RollingStats:
+        """Delta y velocidad de la cuota respecto al inicio de la ventana."""
+        self._advance_window(now)
+        price = self.last_price
+        start_price = self._prices[self._window_tail] if self._count else math.nan
+        window_start_price = None if math.isnan(start_price) else start_price
+        delta = relative_delta = velocity = 0.0
+        if price is not None and window_start_price is not None:
+            delta = price - window_start_price
+            relative_delta = delta / window_start_price
+            elapsed = self._timestamps[self._head] - self._timestamps[self._window_tail]
+            velocity = delta / elapsed if elapsed > 0 else 0.0
+        return RollingStats(
+            price=price,
+            window_start_price=window_start_price,
+            delta=delta,
+            relative_delta=relative_delta,
+            velocity=velocity,
+            suspended=self._count > 0 and price is None,
+            suspended_since=self._suspended_since,
+        )
+
+
+class LineMovementDetector:
+    """Detecta una casa que mueve (o suspende) una cuota mientras la otra se queda atrás.
+
+    Mantiene un `OddsRing` por partido enlazado, mercado, resultado y casa, y se
+    alimenta del mismo flujo de parejas que el resto de detectores: cada tick solo
+    añade los cambios, sin volver a leer histórico.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 10.0,
+        move_threshold: float = 0.05,
+        lag_threshold: float = 0.01,
+        capacity: int = 32,
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.move_threshold = move_threshold
+        self.lag_threshold = lag_threshold
+        self._capacity = capacity
+        self._rings: dict[BookOutcomeKey, OddsRing] = {}
+        self._keys_by_match: dict[str, set[tuple[str, str]]] = {}
+
+    def _ring(self, key: BookOutcomeKey) -> OddsRing:
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = self._rings[key] = OddsRing(self._capacity, self.window_seconds)
+        return ring
+
+    def retain(self, match_keys: Iterable[str]) -> None:
+        """Olvida los buffers de partidos que ya no están enlazados."""
+        live_keys = set(match_keys)
+        for match_key in [key for key in self._keys_by_match if key not in live_keys]:
+            for market, outcome in self._keys_by_match.pop(match_key):
+                for bookmaker in ("winamax", "bet365"):
+                    self._rings.pop((match_key, market, outcome, bookmaker), None)
+
+    def observe(
+        self,
+        linked_pairs: list[tuple[MatchInfo, MatchInfo]],
+        now: float | None = None,
+    ) -> list[Alert]:
+        """Añade las cuotas del tick y devuelve las alertas de movimiento descompensado."""
+        now = time.perf_counter() if now is None else now
+        alerts: list[Alert] = []
+        for winamax_match, bet365_match in linked_pairs:
+            if not winamax_match.markets and not bet365_match.markets:
+                continue
+            match_key = build_pair_key(winamax_match, bet365_match)
+            match_label = format_pair_label(bet365_match)
+            outcome_keys = self._keys_by_match.setdefault(match_key, set())
+            prices = {
+                "winamax": _flatten_markets(winamax_match),
+                "bet365": _flatten_markets(bet365_match),
+            }
+            outcome_keys.update(prices["winamax"])
+            outcome_keys.update(prices["bet365"])
+
+            for market, outcome in outcome_keys:
+                transitions: dict[str, str | None] = {}
+                for bookmaker, book_prices in prices.items():
+                    transitions[bookmaker] = self._ring(
+                        (match_key, market, outcome, bookmaker)
+                    ).push(now, book_prices.get((market, outcome)))
+                alerts.extend(
+                    self._check_outcome(match_key, match_label, market, outcome, transitions, now)
+                )
+        return alerts
+
+    def _check_outcome(
+        self,
+        match_key: str,
+        match_label: str,
+        market: str,
+        outcome: str,
+        transitions: dict[str, str | None],
+        now: float,
+    ) -> list[Alert]:
+        stats = {
+            bookmaker: self._rings[(match_key, market, outcome, bookmaker)].stats(now)
+            for bookmaker in ("winamax", "bet365")
+        }
+        alerts: list[Alert] = []
+        for mover, laggard in (("winamax", "bet365"), ("bet365", "winamax")):
+            mover_stats, laggard_stats = stats[mover], stats[laggard]
+            if laggard_stats.price is None:
+                continue
+
+            if transitions[mover] == "suspend":
+                alerts.append(
+                    _build_alert(
+                        kind="suspension_lag",
+                        match_key=match_key,
+                        match_label=match_label,
+                        market=market,
+                        outcome=outcome,
+                        message=(
+                            f"{match_label} [{market}/{outcome}]: {mover} suspende y "
+                            f"{laggard} sigue ofreciendo {laggard_stats.price:.2f}"
+                        ),
+                        details={"mover": mover, "laggard_price": laggard_stats.price},
+                        detected_perf_counter=now,
+                    )
+                )
+                continue
+
+            if (
+                mover_stats.price is not None
+                and abs(mover_stats.relative_delta) >= self.move_threshold
+                and abs(laggard_stats.relative_delta) < self.lag_threshold
+            ):
+                alerts.append(
+                    _build_alert(
+                        kind="line_movement",
+                        match_key=match_key,
+                        match_label=match_label,
+                        market=market,
+                        outcome=outcome,
+                        message=(
+                            f"{match_label} [{market}/{outcome}]: {mover} "
+                            f"{mover_stats.window_start_price:.2f}→{mover_stats.price:.2f} "
+                            f"({mover_stats.relative_delta:+.1%}) y {laggard} sigue en "
+                            f"{laggard_stats.price:.2f}"
+                        ),
+                        details={
+                            "mover": mover,
+                            "mover_from": mover_stats.window_start_price,
+                            "mover_to": mover_stats.price,
+                            "relative_delta": round(mover_stats.relative_delta, 4),
+                            "velocity_per_second": round(mover_stats.velocity, 4),
+                            "laggard_price": laggard_stats.price,
+                        },
+                        detected_perf_counter=now,
+                    )
+                )
+        return alerts
+
+
+def _flatten_markets(match: MatchInfo) -> dict[tuple[str, str], float]:
+    return {
+        (market_odds.market, outcome): price
+        for market_odds in match.markets
+        for outcome, price in market_odds.outcomes.items()
+    }
+
+
+def _build_alert(
+    kind: str,
+    match_key: str,
+    match_label: str,
+    market: str,
+    outcome: str,
+    message: str,
+    details: dict[str, str | int | float | None],
+    detected_perf_counter: float,
+) -> Alert:
+    return Alert(
+        kind=kind,
+        key=f"{kind}:{match_key}:{market}:{outcome}:{details.get('mover')}",
+        message=message,
+        match_label=match_label,
+        details={"market": market, "outcome": outcome, **details},
+        detected_perf_counter=detected_perf_counter,
+    )
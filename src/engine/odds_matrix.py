@@ -0,0 +1,216 @@
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.models.alerts import Alert
+from src.models.odds import MarketOdds
+
+MARKET_OUTCOMES: dict[str, tuple[str, ...]] = {
+    "1x2": ("home", "draw", "away"),
+    "next_goal": ("home", "none", "away"),
+}
+DEFAULT_BOOKMAKERS = ("winamax", "bet365")
+
+
+def _build_outcome_slots() -> tuple[dict[tuple[str, str], int], dict[str, slice]]:
+    slots: dict[tuple[str, str], int] = {}
+    market_slices: dict[str, slice] = {}
+    for market, outcomes in MARKET_OUTCOMES.items():
+        start = len(slots)
+        for outcome in outcomes:
+            slots[(market, outcome)] = len(slots)
+        market_slices[market] = slice(start, len(slots))
+    return slots, market_slices
+
+
+OUTCOME_SLOTS, MARKET_SLICES = _build_outcome_slots()
+
+
+@dataclass(frozen=True)
+class ArbitrageOpportunity:
+    """Mercado de un partido cuya mejor cuota por resultado suma menos del 100 %."""
+
+    match_key: str
+    match_label: str
+    market: str
+    margin: float
+    implied_total: float
+    best_prices: dict[str, tuple[str, float]]
+    bookmaker_overround: dict[str, float]
+
+
+class OddsMatrix:
+    """Matriz NumPy `partido × resultado × casa` con las últimas cuotas enlazadas.
+
+    Cada partido enlazado ocupa una fila fija mientras siga en vivo; las cuotas se
+    escriben en su sitio al llegar y los huecos sin cuota son `NaN`. `evaluate()`
+    calcula en una única pasada vectorizada la mejor cuota por resultado, el
+    overround de cada casa y el margen de arbitraje de todos los mercados, y devuelve
+    solo las filas que superan el umbral.
+    """
+
+    def __init__(
+        self,
+        bookmakers: tuple[str, ...] = DEFAULT_BOOKMAKERS,
+        capacity: int = 256,
+    ) -> None:
+        self.bookmakers = bookmakers
+        self._book_index = {bookmaker: index for index, bookmaker in enumerate(bookmakers)}
+        self._odds = np.full((capacity, len(OUTCOME_SLOTS), len(bookmakers)), np.nan)
+        self._rows: dict[str, int] = {}
+        self._labels: dict[str, str] = {}
+        self._free_rows = list(range(capacity - 1, -1, -1))
+
+    def __len__(self) -> int:
+        """Número de partidos con fila asignada."""
+        return len(self._rows)
+
+    def _row_for(self, match_key: str) -> int:
+        row = self._rows.get(match_key)
+        if row is not None:
+            return row
+        if not self._free_rows:
+            capacity = self._odds.shape[0]
+            grown = np.full((capacity * 2, *self._odds.shape[1:]), np.nan)
+            grown[:capacity] = self._odds
+            self._odds = grown
+            self._free_rows = list(range(capacity * 2 - 1, capacity - 1, -1))
+        row = self._free_rows.pop()
+        self._rows[match_key] = row
+        return row
+
+    def upsert(
+        self,
+        match_key: str,
+        bookmaker: str,
+        markets: Iterable[MarketOdds],
+        label: str | None = None,
+    ) -> None:
+        """Sustituye en su sitio todas las cuotas de una casa para un partido.
+
+        Los mercados que la casa ya no cotiza (o `markets` vacío) quedan en `NaN`:
+        una cuota vieja no puede seguir participando en el arbitraje. `label` es el
+        nombre legible del partido en las alertas (por defecto, la propia clave).
+        """
+        book = self._book_index[bookmaker]
+        row_index = self._row_for(match_key)
+        if label is not None:
+            self._labels[match_key] = label
+        row = self._odds[row_index]
+        row[:, book] = np.nan
+        for market_odds in markets:
+            if market_odds.market not in MARKET_SLICES:
+                continue
+            for outcome, price in market_odds.outcomes.items():
+                slot = OUTCOME_SLOTS.get((market_odds.market, outcome))
+                if slot is not None and price > 1.0:
+                    row[slot, book] = price
+
+    def remove(self, match_key: str) -> None:
+        """Libera la fila de un partido que ya no está enlazado."""
+        row = self._rows.pop(match_key, None)
+        self._labels.pop(match_key, None)
+        if row is not None:
+            self._odds[row] = np.nan
+            self._free_rows.append(row)
+
+    def retain(self, match_keys: Iterable[str]) -> None:
+        """Libera las filas de todos los partidos que no estén en `match_keys`."""
+        live_keys = set(match_keys)
+        for match_key in [key for key in self._rows if key not in live_keys]:
+            self.remove(match_key)
+
+    def evaluate(
+        self,
+        min_margin: float = 0.0,
+        match_keys: Iterable[str] | None = None,
+    ) -> list[ArbitrageOpportunity]:
+        """Devuelve los mercados con margen de arbitraje mayor que `min_margin`.
+
+        Con `match_keys` solo se evalúan esos partidos (p. ej. los que tienen datos
+        frescos en ambas casas).
+        """
+        keys = (
+            list(self._rows)
+            if match_keys is None
+            else [key for key in dict.fromkeys(match_keys) if key in self._rows]
+        )
+        if not keys:
+            return []
+
+        odds = self._odds[[self._rows[key] for key in keys]]
+        best_prices = np.fmax.reduce(odds, axis=2)
+        best_books = np.argmax(np.nan_to_num(odds, nan=-np.inf), axis=2)
+        inverse_best = 1.0 / best_prices
+        inverse_odds = 1.0 / odds
+
+        opportunities: list[ArbitrageOpportunity] = []
+        for market, market_slice in MARKET_SLICES.items():
+            # NaN si falta algún resultado en todas las casas: no hay mercado completo
+            implied_totals = inverse_best[:, market_slice].sum(axis=1)
+            margins = 1.0 - implied_totals
+            book_overrounds = inverse_odds[:, market_slice, :].sum(axis=1) - 1.0
+            for match_index in np.flatnonzero(margins > min_margin):
+                outcomes = MARKET_OUTCOMES[market]
+                opportunities.append(
+                    ArbitrageOpportunity(
+                        match_key=keys[match_index],
+                        match_label=self._labels.get(keys[match_index], keys[match_index]),
+                        market=market,
+                        margin=float(margins[match_index]),
+                        implied_total=float(implied_totals[match_index]),
+                        best_prices={
+                            outcome: (
+                                self.bookmakers[best_books[match_index, slot]],
+                                float(best_prices[match_index, slot]),
+                            )
+                            for outcome, slot in zip(
+                                outcomes,
+                                range(market_slice.start, market_slice.stop),
+                                strict=True,
+                            )
+                        },
+                        bookmaker_overround={
+                            bookmaker: float(book_overrounds[match_index, book])
+                            for bookmaker, book in self._book_index.items()
+                            if not np.isnan(book_overrounds[match_index, book])
+                        },
+                    )
+                )
+        return opportunities
+
+
+def build_arbitrage_alerts(opportunities: list[ArbitrageOpportunity]) -> list[Alert]:
+    """Convierte oportunidades de arbitraje en alertas para el bus."""
+    detected_perf_counter = time.perf_counter()
+    alerts: list[Alert] = []
+    for opportunity in opportunities:
+        prices_text = " | ".join(
+            f"{outcome} {price:.2f}@{bookmaker}"
+            for outcome, (bookmaker, price) in opportunity.best_prices.items()
+        )
+        books_key = ",".join(bookmaker for bookmaker, _ in opportunity.best_prices.values())
+        alerts.append(
+            Alert(
+                kind="arbitrage",
+                key=f"arbitrage:{opportunity.match_key}:{opportunity.market}:{books_key}",
+                message=(
+                    f"{opportunity.match_label} [{opportunity.market}]: margen "
+                    f"{opportunity.margin:.2%} | {prices_text}"
+                ),
+                match_label=opportunity.match_label,
+                details={
+                    "market": opportunity.market,
+                    "margin": round(opportunity.margin, 5),
+                    "implied_total": round(opportunity.implied_total, 5),
+                    **{
+                        f"best_{outcome}": f"{price:.2f}@{bookmaker}"
+                        for outcome, (bookmaker, price) in opportunity.best_prices.items()
+                    },
+                },
+                detected_perf_counter=detected_perf_counter,
+            )
+        )
+    return alerts
@@ -0,0 +1,175 @@
+import asyncio
+import contextlib
+import json
+import os
+import time
+from pathlib import Path
+
+from src.core.logger import logger
+from src.engine.team_name_normalizer import (
+    TeamNameNormalizer,
+    load_team_name_mappings,
+    save_team_name_mappings,
+)
+
+JournalEntry = tuple[str, str, str]
+
+
+def _serialize_entry(entry: JournalEntry) -> str:
+    site, source_name, target_name = entry
+    return json.dumps(
+        {"site": site, "source": source_name, "target": target_name},
+        ensure_ascii=False,
+    )
+
+
+def read_journal_entries(journal_file: Path) -> list[JournalEntry]:
+    """Lee las entradas válidas del journal, ignorando líneas truncadas por un cierre abrupto."""
+    if not journal_file.exists():
+        return []
+
+    entries: list[JournalEntry] = []
+    with journal_file.open(encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                entries.append((str(data["site"]), str(data["source"]), str(data["target"])))
+            except json.JSONDecodeError, KeyError, TypeError:
+                logger.warning(f"Journal de mapeos: línea {line_number} inválida, se ignora.")
+    return entries
+
+
+class TeamNameMappingsJournal:
+    """Journal append-only de enlaces manuales sobre el snapshot JSON de mapeos.
+
+    Cada enlace se añade en memoria en O(1); una tarea de fondo escribe los lotes
+    pendientes con un único `fsync` y compacta el journal en el JSON (escritura a
+    temporal + `os.replace`) cada `compact_every_entries` entradas o, si hay alguna
+    sin compactar, cada `compact_interval_seconds`. Si el proceso muere a mitad, el
+    snapshot anterior sigue intacto y el journal se reaplica al arrancar (la
+    reaplicación es idempotente). Al detenerse, también por cancelación, escribe lo
+    pendiente y compacta.
+    """
+
+    def __init__(
+        self,
+        mapping_file: Path,
+        journal_file: Path,
+        flush_interval_seconds: float = 0.25,
+        compact_every_entries: int = 200,
+        compact_interval_seconds: float = 300.0,
+    ) -> None:
+        self._mapping_file = mapping_file
+        self._journal_file = journal_file
+        self._flush_interval_seconds = flush_interval_seconds
+        self._compact_every_entries = compact_every_entries
+        self._compact_interval_seconds = compact_interval_seconds
+        self._pending: list[JournalEntry] = []
+        self._entries_since_compaction = 0
+        self._last_compaction_monotonic = time.monotonic()
+        self._wakeup = asyncio.Event()
+
+    def load(self) -> dict[str, dict[str, str]]:
+        """Carga el snapshot JSON y reaplica encima el journal y lo pendiente en memoria.
+
+        Se llama también desde el hilo de recarga del normalizador, así que no toca
+        el contador de compactación, que solo se modifica en el bucle de eventos.
+        """
+        mappings = load_team_name_mappings(self._mapping_file)
+        journal_entries = read_journal_entries(self._journal_file)
+        for site, source_name, target_name in [*journal_entries, *self._pending]:
+            mappings.setdefault(site.lower(), {})[source_name] = target_name
+        return mappings
+
+    def append(self, site: str, source_name: str, target_name: str) -> None:
+        """Registra un mapeo en el journal (se persiste en el siguiente lote)."""
+        self._pending.append((site.lower(), source_name, target_name))
+        if len(self._pending) >= self._compact_every_entries:
+            self._wakeup.set()
+
+    def extend(self, entries: list[JournalEntry]) -> None:
+        """Registra varios mapeos y despierta al escritor para persistirlos en un solo lote."""
+        self._pending.extend((site.lower(), source, target) for site, source, target in entries)
+        if entries:
+            self._wakeup.set()
+
+    def _write_batch(self, batch: list[JournalEntry]) -> None:
+        with self._journal_file.open("a", encoding="utf-8") as file:
+            file.write("".join(f"{_serialize_entry(entry)}\n" for entry in batch))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _compact(self, mappings: dict[str, dict[str, str]]) -> None:
+        save_team_name_mappings(self._mapping_file, mappings)
+        with self._journal_file.open("w", encoding="utf-8") as file:
+            file.flush()
+            os.fsync(file.fileno())
+
+    async def flush(self, normalizer: TeamNameNormalizer, force_compaction: bool = False) -> None:
+        """Escribe lo pendiente y compacta si se alcanzó el umbral de entradas o de tiempo."""
+        batch, self._pending = self._pending, []
+        if batch:
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except asyncio.CancelledError:
+                # El hilo termina de escribir igualmente: que el volcado final lo compacte
+                self._entries_since_compaction += len(batch)
+                raise
+            except OSError:
+                # Se reencola delante de lo llegado mientras tanto para reintentarlo
+                self._pending[:0] = batch
+                raise
+            self._entries_since_compaction += len(batch)
+
+        if not self._entries_since_compaction:
+            return
+        compaction_due = (
+            force_compaction
+            or self._entries_since_compaction >= self._compact_every_entries
+            or time.monotonic() - self._last_compaction_monotonic >= self._compact_interval_seconds
+        )
+        if not compaction_due:
+            return
+
+        await asyncio.to_thread(self._compact, normalizer.mappings)
+        normalizer.mark_file_synced()
+        logger.debug(
+            f"Journal de mapeos compactado ({self._entries_since_compaction} entradas) "
+            f"en {self._mapping_file.name}"
+        )
+        self._entries_since_compaction = 0
+        self._last_compaction_monotonic = time.monotonic()
+
+    async def run(self, stop_event: asyncio.Event, normalizer: TeamNameNormalizer) -> None:
+        """Persiste el journal por lotes hasta que se detiene el monitor.
+
+        El volcado final va en un `finally`: con Ctrl+C `asyncio.run` cancela la
+        tarea en vez de activar `stop_event`, y los enlaces pendientes no se pierden.
+        """
+        try:
+            # Lo que dejó sin compactar una sesión anterior cuenta para el umbral
+            self._entries_since_compaction += len(
+                await asyncio.to_thread(read_journal_entries, self._journal_file)
+            )
+            while not stop_event.is_set():
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        self._wakeup.wait(),
+                        timeout=self._flush_interval_seconds,
+                    )
+                self._wakeup.clear()
+
+                try:
+                    await self.flush(normalizer)
+                except OSError as error:
+                    logger.error(f"No se pudo persistir el journal de mapeos: {error}")
+        finally:
+            try:
+                await self.flush(normalizer, force_compaction=True)
+            except OSError as error:
+                logger.error(
+                    f"No se pudo persistir el journal de mapeos al cerrar "
+                    f"({len(self._pending)} entradas sin escribir): {error}"
+                )
@@ -1,4 +1,10 @@
+import asyncio
 import json
+import os
+import re
+import unicodedata
+from collections.abc import Callable
+from functools import lru_cache, partial
 from pathlib import Path
 
 from src.core.logger import logger
@@ -28,22 +34,6 @@ def load_team_name_mappings(mapping_file: Path) -> dict[str, dict[str, str]]:
     return valid_data
 
 
-def normalize_matches_team_names(
-    site: str,
-    matches: list[MatchInfo],
-    mappings: dict[str, dict[str, str]],
-) -> list[MatchInfo]:
-    """Normaliza nombres de equipos para un sitio usando Bet365 como canónico."""
-    site_mapping = mappings.get(site.lower(), {})
-    if not site_mapping:
-        return matches
-
-    for match in matches:
-        match.home_team = site_mapping.get(match.home_team, match.home_team)
-        match.away_team = site_mapping.get(match.away_team, match.away_team)
-    return matches
-
-
 def upsert_match_team_mapping(
     source_site: str,
     source_home_team: str,
@@ -70,7 +60,7 @@ def save_team_name_mappings(
     mapping_file: Path,
     mappings: dict[str, dict[str, str]],
 ) -> None:
-    """Guarda en disco el JSON de mapeos de nombres por sitio."""
+    """Guarda en disco el JSON de mapeos de nombres por sitio de forma atómica."""
     serialized_data: dict[str, dict[str, str]] = {
         site.lower(): {
             str(source_name): str(target_name)
@@ -78,7 +68,197 @@ def save_team_name_mappings(
         }
         for site, site_mapping in sorted(mappings.items())
     }
-    mapping_file.write_text(
-        json.dumps(serialized_data, ensure_ascii=False, indent=2) + "\n",
-        encoding="utf-8",
-    )
+    temporary_file = mapping_file.with_name(f"{mapping_file.name}.tmp")
+    with temporary_file.open("w", encoding="utf-8") as file:
+        file.write(json.dumps(serialized_data, ensure_ascii=False, indent=2) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_file, mapping_file)
+
+
+_IGNORED_NAME_TOKENS = frozenset({"fc", "cf", "afc", "sc"})
+_NON_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+
+
+@lru_cache(maxsize=8192)
+def fold_team_name(team_name: str) -> str:
+    """Pliega un nombre de equipo a su forma comparable (sin acentos, mayúsculas ni sufijos FC)."""
+    decomposed = unicodedata.normalize("NFKD", team_name.casefold())
+    without_accents = "".join(char for char in decomposed if not unicodedata.combining(char))
+    tokens = _NON_ALPHANUMERIC.sub(" ", without_accents.replace(".", "")).split()
+    meaningful_tokens = [token for token in tokens if token not in _IGNORED_NAME_TOKENS]
+    return " ".join(meaningful_tokens or tokens)
+
+
+def compile_site_mapping(site_mapping: dict[str, str]) -> dict[str, str]:
+    """Compila un mapeo de sitio a tabla plana `nombre plegado -> nombre canónico`.
+
+    Resuelve cadenas de alias (A -> B, B -> C) para que cada búsqueda sea un único
+    acceso O(1). Los ciclos se cortan al volver a un nombre ya visitado.
+    """
+    folded_mapping = {
+        fold_team_name(source_name): target_name
+        for source_name, target_name in site_mapping.items()
+    }
+
+    compiled: dict[str, str] = {}
+    for folded_source, target_name in folded_mapping.items():
+        visited = {folded_source}
+        folded_target = fold_team_name(target_name)
+        while folded_target in folded_mapping and folded_target not in visited:
+            visited.add(folded_target)
+            target_name = folded_mapping[folded_target]
+            folded_target = fold_team_name(target_name)
+        compiled[folded_source] = target_name
+    return compiled
+
+
+def _read_mtime_ns(mapping_file: Path) -> int | None:
+    try:
+        return mapping_file.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class TeamNameNormalizer:
+    """Normalizador compilado de nombres de equipos con recarga en caliente.
+
+    Mantiene los mapeos crudos del JSON y, por cada sitio, una tabla compilada con
+    claves plegadas. Ambas estructuras se sustituyen con una única asignación de
+    referencia, de modo que los lectores nunca ven un estado a medio construir.
+    """
+
+    def __init__(
+        self,
+        mappings: dict[str, dict[str, str]],
+        mapping_file: Path | None = None,
+        loader: Callable[[], dict[str, dict[str, str]]] | None = None,
+    ) -> None:
+        self._mapping_file = mapping_file
+        self._loader = loader
+        if self._loader is None and mapping_file is not None:
+            self._loader = partial(load_team_name_mappings, mapping_file)
+        self._mtime_ns = _read_mtime_ns(mapping_file) if mapping_file else None
+        self._mappings: dict[str, dict[str, str]] = {}
+        self._tables: dict[str, dict[str, str]] = {}
+        self.replace_mappings(mappings)
+
+    @classmethod
+    def from_file(cls, mapping_file: Path) -> TeamNameNormalizer:
+        """Crea el normalizador a partir del JSON de mapeos."""
+        return cls(load_team_name_mappings(mapping_file), mapping_file)
+
+    @property
+    def mappings(self) -> dict[str, dict[str, str]]:
+        """Mapeos crudos por sitio (tratar como solo lectura)."""
+        return self._mappings
+
+    def replace_mappings(self, mappings: dict[str, dict[str, str]]) -> None:
+        """Compila y publica de forma atómica un nuevo juego de mapeos."""
+        normalized_mappings = {
+            site.lower(): dict(site_mapping) for site, site_mapping in mappings.items()
+        }
+        tables = {
+            site: compile_site_mapping(site_mapping)
+            for site, site_mapping in normalized_mappings.items()
+        }
+        self._mappings, self._tables = normalized_mappings, tables
+
+    def resolve(self, site: str, team_name: str) -> str:
+        """Devuelve el nombre canónico de un equipo o el original si no hay mapeo."""
+        table = self._tables.get(site.lower())
+        if not table:
+            return team_name
+        return table.get(fold_team_name(team_name), team_name)
+
+    def normalize_matches(self, site: str, matches: list[MatchInfo]) -> list[MatchInfo]:
+        """Normaliza nombres de equipos de una lista de partidos usando Bet365 como canónico."""
+        table = self._tables.get(site.lower())
+        if not table:
+            return matches
+
+        for match in matches:
+            match.home_team = table.get(fold_team_name(match.home_team), match.home_team)
+            match.away_team = table.get(fold_team_name(match.away_team), match.away_team)
+        return matches
+
+    def upsert_match(
+        self,
+        source_site: str,
+        source_home_team: str,
+        source_away_team: str,
+        canonical_home_team: str,
+        canonical_away_team: str,
+    ) -> bool:
+        """Inserta/actualiza el mapeo de un partido y recompila la tabla del sitio."""
+        return self.upsert_matches(
+            source_site,
+            [(source_home_team, source_away_team, canonical_home_team, canonical_away_team)],
+        )[0]
+
+    def upsert_matches(
+        self,
+        source_site: str,
+        matches: list[tuple[str, str, str, str]],
+    ) -> list[bool]:
+        """Inserta varios partidos `(local, visitante, local canónico, visitante canónico)`.
+
+        Todos se aplican sobre una única copia de los mapeos que se publica de una
+        vez, así que los lectores ven el lote entero o nada.
+        """
+        mappings = {site: dict(site_mapping) for site, site_mapping in self._mappings.items()}
+        changes = [
+            upsert_match_team_mapping(
+                source_site=source_site,
+                source_home_team=source_home_team,
+                source_away_team=source_away_team,
+                canonical_home_team=canonical_home_team,
+                canonical_away_team=canonical_away_team,
+                mappings=mappings,
+            )
+            for (
+                source_home_team,
+                source_away_team,
+                canonical_home_team,
+                canonical_away_team,
+            ) in matches
+        ]
+        if any(changes):
+            self.replace_mappings(mappings)
+        return changes
+
+    def mark_file_synced(self) -> None:
+        """Registra el mtime actual tras una escritura propia para no recargarla."""
+        if self._mapping_file is not None:
+            self._mtime_ns = _read_mtime_ns(self._mapping_file)
+
+    def reload_if_changed(self) -> bool:
+        """Recarga los mapeos si el archivo cambió en disco desde la última lectura.
+
+        El mtime solo se da por leído tras una carga correcta: un fichero a medio
+        escribir o inválido se reintenta en la siguiente vuelta.
+        """
+        if self._mapping_file is None or self._loader is None:
+            return False
+
+        mtime_ns = _read_mtime_ns(self._mapping_file)
+        if mtime_ns == self._mtime_ns:
+            return False
+
+        self.replace_mappings(self._loader())
+        self._mtime_ns = mtime_ns
+        return True
+
+    async def watch(self, stop_event: asyncio.Event, interval_seconds: float) -> None:
+        """Vigila el archivo de mapeos y recompila la tabla cuando se edita a mano."""
+        while not stop_event.is_set():
+            try:
+                if await asyncio.to_thread(self.reload_if_changed):
+                    logger.info(f"Mapeos de equipos recargados desde {self._mapping_file}")
+            except (OSError, ValueError) as error:
+                logger.warning(f"No se pudieron recargar los mapeos de equipos: {error}")
+
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=interval_seconds)
+            except TimeoutError:
+                continue
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class Alert(BaseModel):
+    """Oportunidad o anomalía detectada por el motor y enviada a los sinks de alertas."""
+
+    kind: str
+    key: str
+    message: str
+    match_label: str | None = None
+    details: dict[str, str | int | float | None] = Field(default_factory=dict)
+    detected_at: datetime = Field(default_factory=datetime.now)
+    # `time.perf_counter()` al detectarla: base de la latencia de entrega de cada sink
+    detected_perf_counter: float
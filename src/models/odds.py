@@ -1,4 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+class MarketOdds(BaseModel):
+    """Cuotas decimales de un mercado (ej. `1x2`, `next_goal`) indexadas por resultado."""
+
+    market: str
+    outcomes: dict[str, float] = Field(default_factory=dict)
 
 
 class MatchInfo(BaseModel):
@@ -12,3 +19,7 @@ class MatchInfo(BaseModel):
     score_away: int = 0
     minute: int | None = None
     competition: str | None = None
+    markets: list[MarketOdds] = Field(default_factory=list)
+    # Epoch ms: lectura en la página (Date.now()) y llegada del registro a Python
+    observed_at_ms: float | None = None
+    received_at_ms: float | None = None
@@ -1,8 +1,22 @@
+import time
 from abc import ABC, abstractmethod
 
 from src.models.odds import MatchInfo
 
 
+def build_received_matches(matches_data: list[dict[str, object]]) -> list[MatchInfo]:
+    """Valida los registros extraídos en la página y les pone la marca de llegada a Python.
+
+    Args:
+        matches_data: Registros devueltos por el script de extracción.
+
+    Returns:
+        list[MatchInfo]: Partidos con `received_at_ms` del instante actual.
+    """
+    received_at_ms = time.time() * 1000
+    return [MatchInfo(**m, received_at_ms=received_at_ms) for m in matches_data]
+
+
 class BaseScraper(ABC):
     """Interfaz obligatoria para todos los scrapers de casas de apuestas.
 
@@ -46,6 +60,32 @@ class BaseScraper(ABC):
         """
         pass
 
+    @property
+    def overlay_counters(self) -> dict[str, int]:
+        """Veces que se ha cerrado cada overlay (cookies, avisos...) durante la sesión.
+
+        Returns:
+            dict[str, int]: Contador por nombre de overlay; vacío si no se registran.
+        """
+        return {}
+
+    @property
+    def process_pids(self) -> list[int]:
+        """PIDs de procesos propios del scraper aparte del navegador (p. ej. un worker).
+
+        Returns:
+            list[int]: PIDs raíz; vacío si el scraper vive en el proceso principal.
+        """
+        return []
+
+    async def recycle(self) -> bool:
+        """Sustituye la página del navegador por una nueva y rearranca la extracción.
+
+        Returns:
+            bool: True si se recicló; False si el scraper no lo soporta o falló.
+        """
+        return False
+
     @abstractmethod
     async def close(self) -> None:
         """Cierra el navegador y limpia los recursos del scraper."""
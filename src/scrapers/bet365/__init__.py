@@ -1,3 +1,4 @@
 from .scraper import Bet365Scraper
+from .sharded import Bet365ShardedScraper
 
-__all__ = ["Bet365Scraper"]
+__all__ = ["Bet365Scraper", "Bet365ShardedScraper"]
@@ -1,4 +1,7 @@
-from playwright.async_api import Page
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
 
 async def login_bet365(page: Page, user: str, password: str) -> bool:
@@ -0,0 +1,13 @@
+/**
+ * Cuenta los partidos en vivo visibles por competición en la vista general de Bet365.
+ * Solo lee cabeceras y cuenta nodos .ovm-Fixture: es barato aunque la lista sea larga.
+ */
+() => {
+    const fixturesByCompetition = {};
+    document.querySelectorAll('.ovm-Competition').forEach(section => {
+        const competitionName = section.querySelector('.ovm-CompetitionHeader_NameText')?.innerText?.trim() || "Desconocida";
+        const fixtures = section.querySelectorAll('.ovm-Fixture').length;
+        fixturesByCompetition[competitionName] = (fixturesByCompetition[competitionName] || 0) + fixtures;
+    });
+    return fixturesByCompetition;
+}
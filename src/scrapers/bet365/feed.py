@@ -0,0 +1,328 @@
+"""Parser en streaming del feed en vivo de Bet365 (websocket) a `MatchInfo`.
+
+El feed envía mensajes separados por el byte 0x08. Cada mensaje lleva un topic y,
+tras el byte 0x01, un tipo (`F` snapshot completo, `U` actualización, `D` borrado)
+y registros separados por `|`. Cada registro es `TIPO;CLAVE=VALOR;...`: `EV`
+(evento), `MA` (mercado) y `PA` (participante/cuota). Las actualizaciones solo
+traen las claves que cambian y se aplican sobre la entidad cuyo `IT` coincide con
+el topic.
+
+Formato de grabación (JSONL, una trama por línea):
+    {"t_ms": 1760000000000.0, "url": "wss://...", "payload": "<texto de la trama>"}
+
+Uso offline (hay una grabación mínima de ejemplo en `fixtures/feed_sample.jsonl`):
+    python -m src.scrapers.bet365.feed <grabación.jsonl> [--repeat N]
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.models.odds import MarketOdds, MatchInfo
+
+MESSAGE_SEPARATOR = "\x08"
+TOPIC_SEPARATOR = "\x01"
+RECORD_SEPARATOR = "|"
+FIELD_SEPARATOR = ";"
+
+MARKET_NAME_PATTERNS: dict[str, tuple[str, ...]] = {
+    "1x2": ("fulltime result", "full time result", "resultado final", "1x2"),
+    "next_goal": (
+        "next goal",
+        "próximo gol",
+        "proximo gol",
+        "siguiente gol",
+        "anotará el",
+        "anotara el",
+    ),
+}
+MARKET_OUTCOME_KEYS: dict[str, tuple[str, str, str]] = {
+    "1x2": ("home", "draw", "away"),
+    "next_goal": ("home", "none", "away"),
+}
+
+
+def parse_fractional_odds(value: str) -> float | None:
+    """Convierte una cuota fraccionaria (`11/10`) a decimal (`2.1`)."""
+    numerator, _, denominator = value.partition("/")
+    try:
+        if not denominator:
+            return float(numerator) if float(numerator) > 1 else None
+        return round(1 + int(numerator) / int(denominator), 4)
+    except ValueError, ZeroDivisionError:
+        return None
+
+
+def parse_record(record: str) -> tuple[str, dict[str, str]]:
+    """Separa un registro `TIPO;K=V;...` en su tipo y sus campos."""
+    kind, _, rest = record.partition(FIELD_SEPARATOR)
+    fields: dict[str, str] = {}
+    for item in rest.split(FIELD_SEPARATOR):
+        key, sep, value = item.partition("=")
+        if sep:
+            fields[key] = value
+    return kind, fields
+
+
+def classify_market(market_name: str) -> str | None:
+    """Mercado interno (`1x2`, `next_goal`) a partir del nombre que envía Bet365."""
+    lowered = market_name.strip().lower()
+    for market, patterns in MARKET_NAME_PATTERNS.items():
+        if any(pattern in lowered for pattern in patterns):
+            return market
+    return None
+
+
+@dataclass
+class _FeedEntity:
+    kind: str
+    fields: dict[str, str]
+    event_id: str | None = None
+    market_id: str | None = None
+    children: list[str] = field(default_factory=list)
+
+
+class Bet365FeedParser:
+    """Mantiene el estado del feed y emite qué eventos cambiaron en cada trama.
+
+    Las entidades se indexan por `IT` (topic) y se enlazan evento → mercados →
+    participantes según el orden en que llegan en un snapshot `F`, como hace el
+    propio cliente de Bet365. `feed()` es O(tamaño de la trama).
+
+    `last_frame_ms` es la vida del feed (cualquier trama, también las que no cambian
+    nada) y `event_updated_ms()` la última trama que tocó cada evento.
+    """
+
+    def __init__(self) -> None:
+        self._entities: dict[str, _FeedEntity] = {}
+        self._events: dict[str, _FeedEntity] = {}
+        self._changed_events: set[str] = set()
+        self._event_updated_ms: dict[str, float] = {}
+        self.frames = 0
+        self.last_frame_ms: float | None = None
+
+    def feed(self, payload: str | bytes, received_at_ms: float | None = None) -> set[str]:
+        """Procesa una trama y devuelve los IDs de evento que cambiaron en ella."""
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8", errors="replace")
+        self.frames += 1
+        self.last_frame_ms = time.time() * 1000 if received_at_ms is None else received_at_ms
+
+        changed: set[str] = set()
+        for message in payload.split(MESSAGE_SEPARATOR):
+            topic, sep, body = message.partition(TOPIC_SEPARATOR)
+            if not sep or not body:
+                continue
+            message_type, records = body[0], body[1:].lstrip(RECORD_SEPARATOR)
+            if message_type == "F":
+                changed |= self._apply_snapshot(records)
+            elif message_type == "U":
+                changed |= self._apply_update(topic, records)
+            elif message_type == "D":
+                changed |= self._apply_delete(topic)
+        self._changed_events |= changed
+        for event_id in changed:
+            if event_id in self._events:
+                self._event_updated_ms[event_id] = self.last_frame_ms
+            else:
+                self._event_updated_ms.pop(event_id, None)
+        return changed
+
+    def _apply_snapshot(self, records: str) -> set[str]:
+        changed: set[str] = set()
+        current_event: str | None = None
+        current_market: str | None = None
+        for record in records.split(RECORD_SEPARATOR):
+            if not record:
+                continue
+            kind, fields = parse_record(record)
+            topic = fields.get("IT") or fields.get("ID")
+            if not topic:
+                continue
+            if kind == "EV":
+                entity = _FeedEntity(kind, fields)
+                self._events[topic] = entity
+                current_event, current_market = topic, None
+            elif kind == "MA" and current_event is not None:
+                entity = _FeedEntity(kind, fields, event_id=current_event)
+                self._events[current_event].children.append(topic)
+                current_market = topic
+            elif kind == "PA" and current_market is not None:
+                entity = _FeedEntity(kind, fields, event_id=current_event, market_id=current_market)
+                self._entities[current_market].children.append(topic)
+            else:
+                continue
+            self._entities[topic] = entity
+            changed.add(current_event)
+        return changed
+
+    def _apply_update(self, topic: str, records: str) -> set[str]:
+        entity = self._entities.get(topic)
+        if entity is None:
+            return set()
+        for record in records.split(RECORD_SEPARATOR):
+            if record:
+                # Las actualizaciones no llevan tipo: `K=V;K=V;`
+                _, fields = parse_record(f"U;{record}")
+                entity.fields.update(fields)
+        event_id = entity.event_id if entity.kind != "EV" else topic
+        return {event_id} if event_id else set()
+
+    def _apply_delete(self, topic: str) -> set[str]:
+        entity = self._entities.pop(topic, None)
+        if entity is None:
+            return set()
+        if entity.kind == "EV":
+            self._events.pop(topic, None)
+            for child in entity.children:
+                market = self._entities.pop(child, None)
+                for participant in market.children if market else []:
+                    self._entities.pop(participant, None)
+            return {topic}
+        for participant in entity.children:
+            self._entities.pop(participant, None)
+        parent_id = entity.market_id if entity.kind == "PA" else entity.event_id
+        parent = self._entities.get(parent_id) if parent_id else None
+        if parent is not None and topic in parent.children:
+            parent.children.remove(topic)
+        return {entity.event_id} if entity.event_id else set()
+
+    def drain_changes(self) -> set[str]:
+        """Devuelve y limpia los eventos cambiados desde la última llamada."""
+        changed, self._changed_events = self._changed_events, set()
+        return changed & self._events.keys()
+
+    def event_updated_ms(self, event_id: str) -> float | None:
+        """Epoch ms de la última trama que cambió el evento."""
+        return self._event_updated_ms.get(event_id)
+
+    def build_match(self, event_id: str) -> MatchInfo | None:
+        """Construye el `MatchInfo` de un evento con su marcador, minuto y cuotas."""
+        event = self._events.get(event_id)
+        if event is None:
+            return None
+        home_team, away_team = _split_event_name(event.fields.get("NA", ""))
+        if not home_team or not away_team:
+            return None
+
+        score_home, score_away = _parse_score(event.fields.get("SS", ""))
+        minute_text = event.fields.get("TM", "")
+        return MatchInfo(
+            home_team=home_team,
+            away_team=away_team,
+            score_home=score_home,
+            score_away=score_away,
+            minute=int(minute_text) if minute_text.isdigit() else None,
+            competition=event.fields.get("CT") or None,
+            markets=self._build_markets(event),
+            observed_at_ms=self._event_updated_ms.get(event_id),
+            received_at_ms=self._event_updated_ms.get(event_id),
+        )
+
+    def _build_markets(self, event: _FeedEntity) -> list[MarketOdds]:
+        markets: list[MarketOdds] = []
+        for market_id in event.children:
+            market_entity = self._entities.get(market_id)
+            if market_entity is None:
+                continue
+            market = classify_market(market_entity.fields.get("NA", ""))
+            if market is None or len(market_entity.children) != 3:
+                continue
+            outcomes: dict[str, float] = {}
+            for key, participant_id in zip(
+                MARKET_OUTCOME_KEYS[market], market_entity.children, strict=True
+            ):
+                participant = self._entities.get(participant_id)
+                if participant is None or participant.fields.get("SU") == "1":
+                    continue
+                price = parse_fractional_odds(participant.fields.get("OD", ""))
+                if price is not None:
+                    outcomes[key] = price
+            if market_entity.fields.get("SU") != "1":
+                markets.append(MarketOdds(market=market, outcomes=outcomes))
+        return markets
+
+    def matches_event_ids(self) -> list[str]:
+        """IDs de los eventos vivos en el feed."""
+        return list(self._events)
+
+    def matches(self) -> list[MatchInfo]:
+        """Todos los partidos conocidos por el feed."""
+        return [match for event_id in self._events if (match := self.build_match(event_id))]
+
+
+def _split_event_name(name: str) -> tuple[str, str]:
+    for separator in (" v ", " vs ", " - "):
+        home_team, sep, away_team = name.partition(separator)
+        if sep:
+            return home_team.strip(), away_team.strip()
+    return "", ""
+
+
+def _parse_score(score: str) -> tuple[int, int]:
+    home, _, away = score.partition("-")
+    try:
+        return int(home), int(away)
+    except ValueError:
+        return 0, 0
+
+
+class FeedRecorder:
+    """Graba tramas del feed en JSONL para reproducirlas offline."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("a", encoding="utf-8")
+
+    def record(self, url: str, payload: str | bytes, received_at_ms: float) -> None:
+        """Añade una trama a la grabación."""
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8", errors="replace")
+        self._file.write(
+            json.dumps({"t_ms": received_at_ms, "url": url, "payload": payload}, ensure_ascii=False)
+            + "\n"
+        )
+
+    def close(self) -> None:
+        """Cierra el fichero de grabación."""
+        self._file.close()
+
+
+def read_recorded_frames(path: Path) -> Iterator[tuple[float, str]]:
+    """Lee una grabación JSONL y devuelve `(t_ms, payload)` por trama."""
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                frame = json.loads(line)
+                yield float(frame["t_ms"]), str(frame["payload"])
+
+
+def replay(path: Path, repeat: int = 1) -> dict[str, float]:
+    """Reproduce una grabación en un parser nuevo y mide su rendimiento."""
+    frames = list(read_recorded_frames(path))
+    started_at = time.perf_counter()
+    parser = Bet365FeedParser()
+    for _ in range(repeat):
+        parser = Bet365FeedParser()
+        for received_at_ms, payload in frames:
+            parser.feed(payload, received_at_ms)
+    elapsed = time.perf_counter() - started_at
+    total_frames = len(frames) * repeat
+    return {
+        "frames": total_frames,
+        "events": len(parser.matches()),
+        "seconds": round(elapsed, 4),
+        "frames_per_second": round(total_frames / elapsed, 1) if elapsed else 0.0,
+        "us_per_frame": round(elapsed / total_frames * 1e6, 2) if total_frames else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Reproduce una grabación del feed")
+    argument_parser.add_argument("recording", type=Path)
+    argument_parser.add_argument("--repeat", type=int, default=1)
+    arguments = argument_parser.parse_args()
+    print(json.dumps(replay(arguments.recording, arguments.repeat), indent=2))
@@ -1,9 +1,15 @@
 /**
  * Script para extraer partidos de fútbol en vivo de Bet365.
  * Basado en la estructura .ovm-CompetitionList -> .ovm-Fixture
+ *
+ * options.competitions (opcional): lista de competiciones a extraer; el resto de
+ * secciones se ignoran sin recorrer sus partidos (usado por las pestañas shard).
  */
-(elements) => {
+(options) => {
     const resultsByKey = new Map();
+    const allowedCompetitions = Array.isArray(options?.competitions)
+        ? new Set(options.competitions)
+        : null;
 
     const parseMinuteFromTimer = (timerText) => {
         const text = (timerText || "").trim();
@@ -117,7 +123,8 @@
     competitionSections.forEach(section => {
         // Extraemos el nombre de la competición (ej: "Argelia - Ligue 2")
         const competitionName = section.querySelector('.ovm-CompetitionHeader_NameText')?.innerText?.trim() || "Desconocida";
-        
+        if (allowedCompetitions && !allowedCompetitions.has(competitionName)) return;
+
         // Buscamos los partidos dentro de esta competición
         const matches = section.querySelectorAll('.ovm-Fixture');
         
@@ -148,7 +155,9 @@
                     score_away,
                     minute,
                     competition: competitionName,
-                    match_url
+                    match_url,
+                    // Instante de lectura del nodo en la página (epoch ms)
+                    observed_at_ms: Date.now()
                 };
 
                 const matchKey = buildMatchKey(home_team, away_team, competitionName);
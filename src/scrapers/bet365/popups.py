@@ -1,13 +1,25 @@
-import contextlib
+from typing import TYPE_CHECKING
 
-from playwright.async_api import Page
+from src.scrapers.overlays import OverlayHandler, OverlayRegistry
 
-from src.core.logger import logger
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
+BET365_OVERLAY_HANDLERS = [
+    OverlayHandler(
+        name="cookies",
+        locator=lambda page: page.get_by_role("button", name="Aceptar todo"),
+        selector="button, [role='button']",
+        text="aceptar todo",
+    ),
+]
 
-async def handle_cookie_btn(page: Page) -> None:
-    boton_cookies = page.get_by_role("button", name="Aceptar todo")
-    with contextlib.suppress(Exception):
-        await boton_cookies.click(timeout=1000)
-        logger.info("Popup de cookies cerrado")
-    return
+
+def build_overlay_registry() -> OverlayRegistry:
+    """Crea el registro de overlays de Bet365 (uno por scraper, con sus contadores)."""
+    return OverlayRegistry("Bet365", BET365_OVERLAY_HANDLERS)
+
+
+async def handle_cookie_btn(page: Page, overlays: OverlayRegistry | None = None) -> None:
+    """Acepta las cookies solo si el botón está visible (perfiles persistentes ya lo aceptaron)."""
+    await (overlays or build_overlay_registry()).dismiss_visible(page)
@@ -1,23 +1,45 @@
 import asyncio
 import os
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from src.core.browser import BrowserManager
 from src.core.logger import logger
 from src.models.odds import MatchInfo
-from src.scrapers.base import BaseScraper
+from src.scrapers.base import BaseScraper, build_received_matches
+from src.scrapers.bet365.feed import Bet365FeedParser, FeedRecorder
+from src.scrapers.bet365.popups import build_overlay_registry, handle_cookie_btn
+
+if TYPE_CHECKING:
+    from playwright.async_api import WebSocket
+
+BET365_LIVE_URL = "https://www.bet365.es/#/IP/B1"
 
 
 class Bet365Scraper(BaseScraper):
     """Implementa el scraper para Bet365 con soporte para carga dinámica (scroll)."""
 
-    def __init__(self, browser_manager: BrowserManager) -> None:
+    def __init__(
+        self,
+        browser_manager: BrowserManager,
+        use_feed: bool = False,
+        feed_recording: Path | None = None,
+        feed_max_silence_ms: float = 10000.0,
+    ) -> None:
         self.browser_manager = browser_manager
+        self.use_feed = use_feed
+        self.feed_max_silence_ms = feed_max_silence_ms
+        self._feed = Bet365FeedParser()
+        self._feed_matches: dict[str, MatchInfo] = {}
+        self._feed_silent = False
+        self._feed_recorder = FeedRecorder(feed_recording) if use_feed and feed_recording else None
         self._page = None
-        self._live_url = "https://www.bet365.es/#/IP/B1"
+        self._live_url = BET365_LIVE_URL
         self._username = os.getenv("BET365_USER")
         self._password = os.getenv("BET365_PASS")
 
+        self._overlays = build_overlay_registry()
         self._js_path = Path(__file__).parent / "match_selector.js"
         self._selector_script = self._js_path.read_text(encoding="utf-8")
 
@@ -26,9 +48,13 @@ class Bet365Scraper(BaseScraper):
         try:
             if not self._page:
                 self._page = await self.browser_manager.get_new_page()
+                await self._overlays.install(self._page)
+                if self.use_feed:
+                    self._page.on("websocket", self._on_websocket)
 
             logger.info(f"🚀 Cargando Bet365 En Vivo: {self._live_url}")
             await self._page.goto(self._live_url, wait_until="networkidle")
+            await handle_cookie_btn(self._page, self._overlays)
 
             # Esperamos al contenedor principal
             await self._page.wait_for_selector(".ovm-CompetitionList", timeout=20000)
@@ -54,18 +80,97 @@ class Bet365Scraper(BaseScraper):
     async def navigate_to_live(self) -> bool:
         return True
 
+    def _on_websocket(self, websocket: WebSocket) -> None:
+        websocket.on(
+            "framereceived",
+            lambda payload: self._on_feed_frame(websocket.url, payload),
+        )
+
+    def _on_feed_frame(self, url: str, payload: str | bytes) -> None:
+        received_at_ms = time.time() * 1000
+        if self._feed_recorder is not None:
+            self._feed_recorder.record(url, payload, received_at_ms)
+        try:
+            self._feed.feed(payload, received_at_ms)
+        except Exception as e:  # noqa: BLE001
+            logger.debug(f"Bet365: trama del feed no interpretable: {e}")
+
+    def _feed_is_live(self, now_ms: float) -> bool:
+        """Indica si ha llegado alguna trama dentro de `feed_max_silence_ms`."""
+        last_frame_ms = self._feed.last_frame_ms
+        is_live = last_frame_ms is not None and now_ms - last_frame_ms <= self.feed_max_silence_ms
+        if is_live == self._feed_silent:
+            self._feed_silent = not is_live
+            if is_live:
+                logger.info("Bet365: el feed vuelve a recibir tramas")
+            else:
+                logger.warning(
+                    f"Bet365: feed sin tramas en {self.feed_max_silence_ms / 1000:.0f}s, "
+                    "se extrae del DOM"
+                )
+        return is_live
+
+    def _collect_feed_matches(self, now_ms: float) -> list[MatchInfo]:
+        """Reconstruye solo los eventos que cambiaron desde el último tick.
+
+        Todos los partidos se sellan con la vida del feed: como solo envía
+        diferencias, un evento sin cambios sigue vigente hasta la última trama.
+        """
+        live_event_ids = set(self._feed.matches_event_ids())
+        for event_id in self._feed.drain_changes():
+            match = self._feed.build_match(event_id)
+            if match is None:
+                self._feed_matches.pop(event_id, None)
+            else:
+                self._feed_matches[event_id] = match
+        for event_id in [key for key in self._feed_matches if key not in live_event_ids]:
+            del self._feed_matches[event_id]
+        confirmed_at_ms = min(self._feed.last_frame_ms, now_ms)
+        return [
+            match.model_copy(
+                update={"observed_at_ms": confirmed_at_ms, "received_at_ms": confirmed_at_ms}
+            )
+            for match in self._feed_matches.values()
+        ]
+
     async def get_live_matches(self) -> list[MatchInfo]:
-        """Extrae los partidos usando el script JS."""
+        """Extrae los partidos del feed si está vivo y con datos; si no, con el script JS."""
         if not self._page:
             return []
+        now_ms = time.time() * 1000
+        if self.use_feed and self._feed.frames and self._feed_is_live(now_ms):
+            feed_matches = self._collect_feed_matches(now_ms)
+            if feed_matches:
+                return feed_matches
         try:
             # Re-ejecutamos el script de extracción
             matches_data = await self._page.evaluate(self._selector_script)
-            return [MatchInfo(**m) for m in matches_data]
+            return build_received_matches(matches_data)
         except Exception as e:
             logger.error(f"Error en extracción Bet365: {e}")
             return []
 
+    async def recycle(self) -> bool:
+        """Abre una página nueva en el mismo contexto y reconstruye el feed desde cero.
+
+        El websocket nuevo empieza con un snapshot completo, así que el parser se
+        reinicia en vez de arrastrar entidades de la conexión anterior.
+        """
+        self._page = await self.browser_manager.recycle_page()
+        await self._overlays.install(self._page)
+        if self.use_feed:
+            self._feed = Bet365FeedParser()
+            self._feed_matches = {}
+            self._feed_silent = False
+            self._page.on("websocket", self._on_websocket)
+        return await self.start()
+
+    @property
+    def overlay_counters(self) -> dict[str, int]:
+        return self._overlays.counters
+
     async def close(self) -> None:
+        if self._feed_recorder is not None:
+            self._feed_recorder.close()
         if self._page:
             await self._page.close()
@@ -0,0 +1,24 @@
+/**
+ * Deja desplegadas en la pestaña solo las competiciones asignadas a su shard.
+ *
+ * Las secciones ajenas se pliegan pulsando su cabecera, así Bet365 deja de renderizar
+ * sus partidos y el DOM de la pestaña se mantiene acotado. Las asignadas que estén
+ * plegadas (sin .ovm-Fixture) se vuelven a desplegar.
+ */
+(competitions) => {
+    const assigned = new Set(competitions);
+    let toggled = 0;
+    document.querySelectorAll('.ovm-Competition').forEach(section => {
+        const competitionName = section.querySelector('.ovm-CompetitionHeader_NameText')?.innerText?.trim() || "Desconocida";
+        const header = section.querySelector('.ovm-CompetitionHeader');
+        if (!header) return;
+
+        const isExpanded = section.querySelector('.ovm-Fixture') !== null;
+        const shouldBeExpanded = assigned.has(competitionName);
+        if (isExpanded !== shouldBeExpanded) {
+            header.click();
+            toggled += 1;
+        }
+    });
+    return toggled;
+}
@@ -0,0 +1,227 @@
+import asyncio
+import contextlib
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.core.browser import BrowserManager
+from src.core.logger import logger
+from src.models.odds import MatchInfo
+from src.scrapers.base import BaseScraper, build_received_matches
+from src.scrapers.bet365.popups import build_overlay_registry, handle_cookie_btn
+from src.scrapers.bet365.scraper import BET365_LIVE_URL, Bet365Scraper
+from src.scrapers.sharding import ShardPlan, ShardPlanner
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+_SCRIPTS_DIR = Path(__file__).parent
+# Fallos seguidos de `evaluate` tras los que un shard deja de aportar sus últimos partidos
+SHARD_MAX_FAILURES = 3
+
+
+@dataclass
+class _ShardTab:
+    index: int
+    page: Page
+    competitions: frozenset[str] = frozenset()
+    matches: list[MatchInfo] = field(default_factory=list)
+    interval_seconds: float = 1.0
+    last_evaluate_ms: float = 0.0
+    failures: int = 0
+    task: asyncio.Task[None] | None = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.failures < SHARD_MAX_FAILURES
+
+
+class Bet365ShardedScraper(BaseScraper):
+    """Bet365 repartido por competiciones entre varias pestañas del mismo navegador.
+
+    Una pestaña de vista general (el `Bet365Scraper` clásico) solo cuenta partidos
+    por competición. `ShardPlanner` reparte esas competiciones en shards y cada shard
+    tiene su pestaña, con el resto de competiciones plegadas, y su propio bucle de
+    extracción cuya cadencia se adapta a lo que tarda su `evaluate`. La fusión de
+    los últimos resultados de cada shard es lo que recibe el matcher; un shard con
+    `SHARD_MAX_FAILURES` fallos seguidos deja de aportar partidos hasta que se recupera.
+
+    El foco (`shard_focus.js`) se reaplica en cada reequilibrado aunque el plan no
+    cambie: las competiciones que aparecen más tarde llegan desplegadas a todas las
+    pestañas y, si no, el DOM de las que no las sirven crecería sin límite.
+    """
+
+    def __init__(
+        self,
+        browser_manager: BrowserManager,
+        planner: ShardPlanner | None = None,
+        base_interval_seconds: float = 1.0,
+        rebalance_seconds: float = 15.0,
+    ) -> None:
+        self.browser_manager = browser_manager
+        self._planner = planner or ShardPlanner()
+        self._base_interval_seconds = base_interval_seconds
+        self._rebalance_seconds = rebalance_seconds
+        self._overview = Bet365Scraper(browser_manager)
+        self._overlays = build_overlay_registry()
+        self._plan: ShardPlan | None = None
+        self._shards: list[_ShardTab] = []
+        self._rebalance_task: asyncio.Task[None] | None = None
+        self._selector_script = (_SCRIPTS_DIR / "match_selector.js").read_text(encoding="utf-8")
+        self._survey_script = (_SCRIPTS_DIR / "competition_survey.js").read_text(encoding="utf-8")
+        self._focus_script = (_SCRIPTS_DIR / "shard_focus.js").read_text(encoding="utf-8")
+
+    async def start(self) -> bool:
+        """Arranca la vista general, calcula el primer reparto y abre las pestañas shard."""
+        if not await self._overview.start():
+            return False
+        try:
+            await self.rebalance()
+        except Exception as e:
+            logger.error(f"Bet365: error al repartir competiciones en shards: {e}")
+            return False
+        self._rebalance_task = asyncio.create_task(self._rebalance_loop())
+        return True
+
+    async def login(self) -> bool:
+        return False
+
+    async def navigate_to_live(self) -> bool:
+        return True
+
+    @property
+    def plan(self) -> ShardPlan | None:
+        """Último reparto aplicado (para diagnóstico)."""
+        return self._plan
+
+    async def _survey(self) -> dict[str, int]:
+        page = await self.browser_manager.get_new_page()
+        sizes = await page.evaluate(self._survey_script)
+        return {str(name): int(count) for name, count in sizes.items()}
+
+    async def rebalance(self) -> bool:
+        """Recalcula el reparto, ajusta pestañas y reaplica el foco; True si el plan cambió."""
+        plan = self._planner.plan(await self._survey(), self._plan)
+        plan_changed = plan != self._plan
+
+        while len(self._shards) < len(plan.shards):
+            self._shards.append(await self._open_shard(len(self._shards)))
+        while len(self._shards) > len(plan.shards):
+            await self._close_shard(self._shards.pop())
+
+        for shard, competitions in zip(self._shards, plan.shards, strict=True):
+            shard.competitions = competitions
+            try:
+                await shard.page.evaluate(self._focus_script, sorted(competitions))
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"Bet365 shard {shard.index}: no se pudo aplicar el foco: {e}")
+            if shard.task is None:
+                shard.task = asyncio.create_task(self._run_shard(shard))
+
+        self._plan = plan
+        if plan_changed:
+            logger.info(
+                f"Bet365: {len(plan.shards)} shards | partidos por shard: "
+                f"{', '.join(str(load) for load in plan.loads)}"
+            )
+        return plan_changed
+
+    async def _open_shard(self, index: int) -> _ShardTab:
+        page = await self.browser_manager.open_page()
+        await self._overlays.install(page)
+        await page.goto(BET365_LIVE_URL, wait_until="domcontentloaded")
+        await handle_cookie_btn(page, self._overlays)
+        await page.wait_for_selector(".ovm-CompetitionList", timeout=20000)
+        return _ShardTab(index=index, page=page, interval_seconds=self._base_interval_seconds)
+
+    async def _close_shard(self, shard: _ShardTab) -> None:
+        if shard.task is not None:
+            shard.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await shard.task
+        await shard.page.close()
+
+    async def _run_shard(self, shard: _ShardTab) -> None:
+        """Bucle de extracción de un shard con cadencia propia."""
+        while True:
+            started_at = time.perf_counter()
+            try:
+                matches_data = await shard.page.evaluate(
+                    self._selector_script,
+                    {"competitions": sorted(shard.competitions)},
+                )
+                shard.matches = build_received_matches(matches_data)
+                if not shard.healthy:
+                    logger.info(f"Bet365 shard {shard.index}: extracción recuperada")
+                shard.failures = 0
+            except Exception as e:
+                shard.failures += 1
+                logger.error(f"Bet365 shard {shard.index}: error en extracción: {e}")
+                if shard.failures == SHARD_MAX_FAILURES:
+                    # Sus últimos partidos envejecen sin refrescarse: mejor ausentes que viejos
+                    shard.matches = []
+                    logger.warning(
+                        f"Bet365 shard {shard.index}: {shard.failures} fallos seguidos, "
+                        "sus partidos se retiran hasta que se recupere"
+                    )
+            shard.last_evaluate_ms = (time.perf_counter() - started_at) * 1000
+            # Un shard lento se espacia solo: como mucho la mitad del tiempo evaluando
+            shard.interval_seconds = max(
+                self._base_interval_seconds,
+                2 * shard.last_evaluate_ms / 1000,
+            )
+            await asyncio.sleep(shard.interval_seconds)
+
+    async def _rebalance_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._rebalance_seconds)
+            try:
+                await self.rebalance()
+            except Exception as e:
+                logger.warning(f"Bet365: no se pudo reequilibrar shards: {e}")
+
+    async def get_live_matches(self) -> list[MatchInfo]:
+        """Fusiona los últimos partidos de cada shard sin esperar a ninguna pestaña."""
+        if not self._shards:
+            return await self._overview.get_live_matches()
+
+        merged: dict[tuple[str | None, str, str], MatchInfo] = {}
+        for shard in self._shards:
+            for match in shard.matches:
+                merged.setdefault((match.competition, match.home_team, match.away_team), match)
+        return [match.model_copy() for match in merged.values()]
+
+    async def recycle(self) -> bool:
+        """Cierra las pestañas shard, recicla la vista general y vuelve a repartir."""
+        if self._rebalance_task is not None:
+            self._rebalance_task.cancel()
+            self._rebalance_task = None
+        for shard in self._shards:
+            await self._close_shard(shard)
+        self._shards = []
+        self._plan = None
+        if not await self._overview.recycle():
+            return False
+        try:
+            await self.rebalance()
+        except Exception as e:
+            logger.error(f"Bet365: error al repartir shards tras reciclar: {e}")
+            return False
+        self._rebalance_task = asyncio.create_task(self._rebalance_loop())
+        return True
+
+    @property
+    def overlay_counters(self) -> dict[str, int]:
+        counters = self._overview.overlay_counters
+        for name, count in self._overlays.counters.items():
+            counters[name] = counters.get(name, 0) + count
+        return counters
+
+    async def close(self) -> None:
+        if self._rebalance_task is not None:
+            self._rebalance_task.cancel()
+        for shard in self._shards:
+            await self._close_shard(shard)
+        self._shards = []
+        await self._overview.close()
@@ -0,0 +1,60 @@
+/**
+ * Observador de overlays inyectado en cada página.
+ * Avisa a Python (binding) cuando aparece un overlay conocido, sin sondeos desde fuera.
+ */
+(specs) => {
+    // Solo el documento principal: los iframes de publicidad no llevan estos overlays
+    if (window.top !== window || window.__bethurtadomOverlayObserver) {
+        return;
+    }
+    window.__bethurtadomOverlayObserver = true;
+
+    // Overlays ya avisados y aún visibles: se vuelve a avisar solo si desaparecen y reaparecen
+    const reported = new Set();
+    const isVisible = (element) => {
+        const rect = element.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(element).visibility !== 'hidden';
+    };
+    const findOverlay = (spec) => Array.from(document.querySelectorAll(spec.selector)).find(
+        (element) => (
+            !spec.text || (element.textContent || '').toLowerCase().includes(spec.text)
+        ) && isVisible(element)
+    );
+
+    let scheduled = false;
+    const check = () => {
+        scheduled = false;
+        specs.forEach((spec) => {
+            if (!findOverlay(spec)) {
+                reported.delete(spec.name);
+                return;
+            }
+            if (!reported.has(spec.name)) {
+                reported.add(spec.name);
+                window.__bethurtadomOverlay(spec.name);
+            }
+        });
+    };
+    // Las páginas en vivo mutan sin parar: como mucho una comprobación cada 250 ms
+    const schedule = () => {
+        if (!scheduled) {
+            scheduled = true;
+            setTimeout(check, 250);
+        }
+    };
+
+    const start = () => {
+        new MutationObserver(schedule).observe(document.documentElement, {
+            childList: true,
+            subtree: true,
+            attributes: true,
+            attributeFilter: ['class', 'style', 'hidden'],
+        });
+        check();
+    };
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', start, { once: true });
+    } else {
+        start();
+    }
+}
@@ -0,0 +1,103 @@
+import contextlib
+import json
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.core.logger import logger
+
+if TYPE_CHECKING:
+    from playwright.async_api import Locator, Page
+
+OVERLAY_BINDING = "__bethurtadomOverlay"
+_OBSERVER_SCRIPT = (Path(__file__).parent / "overlay_observer.js").read_text(encoding="utf-8")
+
+
+async def click_overlay(locator: Locator) -> None:
+    """Acción por defecto: pulsar el elemento que cierra el overlay."""
+    await locator.click(timeout=1000)
+
+
+@dataclass(frozen=True)
+class OverlayHandler:
+    """Overlay conocido de una casa de apuestas y la acción que lo cierra.
+
+    `selector` (CSS) y `text` (subcadena en minúsculas, opcional) lo describen para
+    el observador de la página; `locator` es el equivalente en Playwright.
+    """
+
+    name: str
+    locator: Callable[[Page], Locator]
+    selector: str
+    text: str | None = None
+    dismiss: Callable[[Locator], Awaitable[None]] = click_overlay
+
+
+class OverlayRegistry:
+    """Registro de overlays por casa de apuestas.
+
+    `install` registra cada handler con `page.add_locator_handler`, pero Playwright
+    solo los ejecuta antes de una acción (click, fill...) o una aserción, es decir,
+    durante el arranque y el login; la extracción en régimen usa `evaluate`, que no
+    los dispara. Para ese tramo `install` inyecta además `overlay_observer.js`: un
+    `MutationObserver` en la página que avisa por un binding cuando aparece un
+    overlay, y solo entonces se cierra. Los ticks no hacen ninguna ida y vuelta.
+    """
+
+    def __init__(self, bookmaker: str, handlers: list[OverlayHandler]) -> None:
+        self.bookmaker = bookmaker
+        self._handlers = handlers
+        self._counters: dict[str, int] = {handler.name: 0 for handler in handlers}
+
+    @property
+    def counters(self) -> dict[str, int]:
+        """Número de veces que se ha cerrado cada overlay."""
+        return dict(self._counters)
+
+    async def _dismiss(self, handler: OverlayHandler, locator: Locator) -> None:
+        try:
+            await handler.dismiss(locator)
+        except Exception as error:  # noqa: BLE001
+            logger.debug(f"{self.bookmaker}: no se pudo cerrar '{handler.name}': {error}")
+            return
+        self._counters[handler.name] += 1
+        logger.debug(
+            f"{self.bookmaker}: overlay '{handler.name}' cerrado "
+            f"({self._counters[handler.name]} veces)"
+        )
+
+    async def install(self, page: Page) -> None:
+        """Registra los handlers de acciones y el observador que avisa de overlays nuevos."""
+        for handler in self._handlers:
+
+            async def on_overlay(locator: Locator, handler: OverlayHandler = handler) -> None:
+                await self._dismiss(handler, locator)
+
+            await page.add_locator_handler(handler.locator(page), on_overlay, no_wait_after=True)
+
+        handlers_by_name = {handler.name: handler for handler in self._handlers}
+
+        async def on_overlay_seen(source: dict[str, object], name: str) -> None:
+            handler = handlers_by_name.get(name)
+            if handler is not None:
+                await self._dismiss(handler, handler.locator(page).first)
+
+        await page.expose_binding(OVERLAY_BINDING, on_overlay_seen)
+        specs = [
+            {"name": handler.name, "selector": handler.selector, "text": handler.text}
+            for handler in self._handlers
+        ]
+        script = f"({_OBSERVER_SCRIPT})({json.dumps(specs, ensure_ascii=False)})"
+        # Para las navegaciones siguientes y para el documento ya cargado, si lo hay
+        await page.add_init_script(script)
+        with contextlib.suppress(Exception):
+            await page.evaluate(script)
+
+    async def dismiss_visible(self, page: Page) -> None:
+        """Cierra de inmediato los overlays ya visibles (arranque y login, no en cada tick)."""
+        for handler in self._handlers:
+            locator = handler.locator(page)
+            with contextlib.suppress(Exception):
+                if await locator.first.is_visible():
+                    await self._dismiss(handler, locator.first)
@@ -0,0 +1,345 @@
+"""Banco de pruebas offline de los `match_selector.js` sobre páginas guardadas.
+
+Cada fixture es un directorio con:
+    fixture.json           {"book": "winamax" | "bet365", "url": "<url de origen>"}
+    page.html              HTML de la página sin scripts (ver `capture_selector_fixture`)
+    preloaded_state.json   opcional: `window.PRELOADED_STATE` serializado (Winamax)
+    golden.json            `MatchInfo` esperados, sin marcas de tiempo
+
+La página se carga en un Camoufox headless sin red (todas las peticiones se abortan)
+y el selector se evalúa `--repeat` veces por tamaño de cartelera: se recorta a los
+primeros N partidos para medir el coste por partido. `page_ms` es lo que tarda el
+script dentro de la página y `roundtrip_ms` incluye además la serialización y el
+viaje por Playwright, que es lo que paga el monitor en cada `evaluate`. Con la
+cartelera completa la salida se compara con `golden.json`.
+
+Uso offline (hay fixtures mínimas en `src/scrapers/*/fixtures/selector_sample`):
+    python -m src.scrapers.selector_bench <fixture> [<fixture> ...] [--repeat N]
+        [--sizes 1,10,50] [--update-golden]
+
+Los `golden.json` de esas fixtures de ejemplo son la salida de `--update-golden`.
+El recorte de Winamax limita también la unión bets → outcomes → odds a los partidos
+de la cartelera, así que el coste por tamaño no incluye el resto del estado.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.models.odds import MatchInfo
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Route
+
+SCRAPERS_DIR = Path(__file__).parent
+GOLDEN_EXCLUDED_FIELDS = {"observed_at_ms", "received_at_ms"}
+FULL_SLATE = 0
+
+# Cada script se envuelve para recortar la cartelera y medir su tiempo dentro de la página
+_WINAMAX_BENCH_WRAPPER = """(limit) => {
+    const cards = Array.from(document.querySelectorAll('[data-testid^="match-card-"]'));
+    const selector = (%s);
+    const startedAt = performance.now();
+    const matches = selector(limit > 0 ? cards.slice(0, limit) : cards);
+    return { page_ms: performance.now() - startedAt, matches };
+}"""
+_BET365_BENCH_WRAPPER = """() => {
+    const selector = (%s);
+    const startedAt = performance.now();
+    const matches = selector();
+    return { page_ms: performance.now() - startedAt, matches };
+}"""
+_BET365_TRIM_SCRIPT = """(limit) => {
+    const fixtures = Array.from(document.querySelectorAll('.ovm-Fixture'));
+    if (limit > 0) {
+        fixtures.slice(limit).forEach((fixture) => fixture.remove());
+    }
+    return Math.min(fixtures.length, limit > 0 ? limit : fixtures.length);
+}"""
+_WINAMAX_COUNT_SCRIPT = """(limit) => {
+    const total = document.querySelectorAll('[data-testid^="match-card-"]').length;
+    return limit > 0 ? Math.min(total, limit) : total;
+}"""
+# HTML sin scripts y con las hojas de estilo legibles incrustadas: `innerText` depende
+# del CSS (bloques = saltos de línea) y los scripts de la SPA no deben ejecutarse offline
+_CAPTURE_SCRIPT = """() => {
+    const cssText = Array.from(document.styleSheets).map((sheet) => {
+        try {
+            return Array.from(sheet.cssRules).map((rule) => rule.cssText).join('\\n');
+        } catch (error) {
+            return '';
+        }
+    }).join('\\n');
+    const root = document.documentElement.cloneNode(true);
+    root.querySelectorAll('script, link[rel="stylesheet"], style').forEach((node) => node.remove());
+    const style = document.createElement('style');
+    style.textContent = cssText;
+    (root.querySelector('head') || root).appendChild(style);
+    const state = window.PRELOADED_STATE || window.__PRELOADED_STATE__ || null;
+    return { html: '<!DOCTYPE html>\\n' + root.outerHTML, state };
+}"""
+
+
+@dataclass(frozen=True)
+class SelectorFixture:
+    """Página guardada de una casa con su estado y su salida esperada."""
+
+    path: Path
+    book: str
+    html: str
+    preloaded_state: dict[str, object] | None
+    golden: list[MatchInfo] | None
+
+    @property
+    def golden_path(self) -> Path:
+        """Ruta del `golden.json` de la fixture."""
+        return self.path / "golden.json"
+
+
+@dataclass(frozen=True)
+class SelectorBenchResult:
+    """Tiempos de un selector sobre una cartelera de `slate_size` partidos."""
+
+    slate_size: int
+    matches: int
+    page_ms_p50: float
+    page_ms_mean: float
+    roundtrip_ms_p50: float
+    us_per_match: float | None
+
+
+def load_selector_fixture(path: Path) -> SelectorFixture:
+    """Lee una fixture desde su directorio."""
+    meta = json.loads((path / "fixture.json").read_text(encoding="utf-8"))
+    state_path = path / "preloaded_state.json"
+    golden_path = path / "golden.json"
+    return SelectorFixture(
+        path=path,
+        book=str(meta["book"]),
+        html=(path / "page.html").read_text(encoding="utf-8"),
+        preloaded_state=(
+            json.loads(state_path.read_text(encoding="utf-8")) if state_path.exists() else None
+        ),
+        golden=(
+            [
+                MatchInfo.model_validate(match)
+                for match in json.loads(golden_path.read_text(encoding="utf-8"))
+            ]
+            if golden_path.exists()
+            else None
+        ),
+    )
+
+
+def golden_payload(matches: list[MatchInfo]) -> list[dict[str, object]]:
+    """Partidos serializados para `golden.json` (sin marcas de tiempo)."""
+    return [match.model_dump(mode="json", exclude=GOLDEN_EXCLUDED_FIELDS) for match in matches]
+
+
+def compare_with_golden(actual: list[MatchInfo], golden: list[MatchInfo]) -> list[str]:
+    """Diferencias legibles entre la salida del selector y la esperada (vacía = igual)."""
+    actual_by_key = {(match.home_team, match.away_team): match for match in actual}
+    golden_by_key = {(match.home_team, match.away_team): match for match in golden}
+    differences: list[str] = []
+    for key, expected in golden_by_key.items():
+        match = actual_by_key.get(key)
+        if match is None:
+            differences.append(f"falta {key[0]} vs {key[1]}")
+            continue
+        expected_fields = expected.model_dump(exclude=GOLDEN_EXCLUDED_FIELDS)
+        actual_fields = match.model_dump(exclude=GOLDEN_EXCLUDED_FIELDS)
+        differences.extend(
+            f"{key[0]} vs {key[1]}: {name} = {actual_fields[name]!r}, esperado {value!r}"
+            for name, value in expected_fields.items()
+            if actual_fields[name] != value
+        )
+    differences.extend(
+        f"sobra {key[0]} vs {key[1]}" for key in actual_by_key if key not in golden_by_key
+    )
+    if len(actual) != len(actual_by_key):
+        differences.append(f"{len(actual) - len(actual_by_key)} partidos duplicados en la salida")
+    return differences
+
+
+async def _abort_route(route: Route) -> None:
+    await route.abort()
+
+
+class SelectorBench:
+    """Evalúa los selectores de cada casa sobre fixtures en un navegador local sin red."""
+
+    def __init__(self, repeat: int = 20) -> None:
+        self.repeat = repeat
+        self._scripts = {
+            "winamax": _WINAMAX_BENCH_WRAPPER
+            % (SCRAPERS_DIR / "winamax" / "match_selector.js").read_text(encoding="utf-8"),
+            "bet365": _BET365_BENCH_WRAPPER
+            % (SCRAPERS_DIR / "bet365" / "match_selector.js").read_text(encoding="utf-8"),
+        }
+
+    async def _load(self, page: Page, fixture: SelectorFixture, slate_size: int) -> int:
+        """Carga la página (y su estado) recortada a `slate_size` partidos; devuelve cuántos quedan."""
+        await page.set_content(fixture.html, wait_until="domcontentloaded")
+        if fixture.preloaded_state is not None:
+            await page.evaluate(
+                "(state) => { window.PRELOADED_STATE = state; }", fixture.preloaded_state
+            )
+        if fixture.book == "bet365":
+            return await page.evaluate(_BET365_TRIM_SCRIPT, slate_size)
+        return await page.evaluate(_WINAMAX_COUNT_SCRIPT, slate_size)
+
+    async def _evaluate(self, page: Page, book: str, slate_size: int) -> tuple[float, float, list]:
+        started_at = time.perf_counter()
+        if book == "bet365":
+            result = await page.evaluate(self._scripts[book])
+        else:
+            result = await page.evaluate(self._scripts[book], slate_size)
+        roundtrip_ms = (time.perf_counter() - started_at) * 1000
+        return float(result["page_ms"]), roundtrip_ms, result["matches"]
+
+    async def run_fixture(
+        self,
+        page: Page,
+        fixture: SelectorFixture,
+        slate_sizes: list[int],
+    ) -> tuple[list[SelectorBenchResult], list[MatchInfo]]:
+        """Mide cada tamaño de cartelera y devuelve también la salida con la cartelera completa."""
+        results: list[SelectorBenchResult] = []
+        full_matches: list[MatchInfo] = []
+        seen_sizes: set[int] = set()
+        for requested_size in [*slate_sizes, FULL_SLATE]:
+            slate_size = await self._load(page, fixture, requested_size)
+            if slate_size in seen_sizes and requested_size != FULL_SLATE:
+                continue
+            seen_sizes.add(slate_size)
+            # Un evaluate de calentamiento: compila el script y llena las cachés de estilo
+            await self._evaluate(page, fixture.book, requested_size)
+            page_times: list[float] = []
+            roundtrip_times: list[float] = []
+            matches_data: list = []
+            for _ in range(self.repeat):
+                page_ms, roundtrip_ms, matches_data = await self._evaluate(
+                    page, fixture.book, requested_size
+                )
+                page_times.append(page_ms)
+                roundtrip_times.append(roundtrip_ms)
+            page_ms_p50 = statistics.median(page_times)
+            if requested_size == FULL_SLATE:
+                full_matches = [MatchInfo.model_validate(match) for match in matches_data]
+                if slate_size in {result.slate_size for result in results}:
+                    continue
+            results.append(
+                SelectorBenchResult(
+                    slate_size=slate_size,
+                    matches=len(matches_data),
+                    page_ms_p50=round(page_ms_p50, 3),
+                    page_ms_mean=round(statistics.fmean(page_times), 3),
+                    roundtrip_ms_p50=round(statistics.median(roundtrip_times), 3),
+                    us_per_match=(
+                        round(page_ms_p50 * 1000 / len(matches_data), 1) if matches_data else None
+                    ),
+                )
+            )
+        return results, full_matches
+
+    async def run(
+        self,
+        fixtures: list[SelectorFixture],
+        slate_sizes: list[int],
+        update_golden: bool = False,
+    ) -> dict[str, object]:
+        """Ejecuta todas las fixtures y devuelve el informe (tiempos y diferencias con golden)."""
+        from camoufox.async_api import AsyncCamoufox
+
+        report: dict[str, object] = {}
+        async with AsyncCamoufox(headless=True) as browser:
+            for fixture in fixtures:
+                page = await browser.new_page()
+                await page.route("**/*", _abort_route)
+                try:
+                    results, full_matches = await self.run_fixture(page, fixture, slate_sizes)
+                finally:
+                    await page.close()
+
+                if update_golden:
+                    await asyncio.to_thread(write_golden, fixture, full_matches)
+                    differences: list[str] | None = []
+                elif fixture.golden is not None:
+                    differences = compare_with_golden(full_matches, fixture.golden)
+                else:
+                    differences = None
+                report[str(fixture.path)] = {
+                    "book": fixture.book,
+                    "results": [asdict(result) for result in results],
+                    "golden": "sin golden" if differences is None else differences or "ok",
+                }
+        return report
+
+
+def write_selector_fixture(
+    directory: Path, book: str, url: str, html: str, state: object | None
+) -> Path:
+    """Escribe los ficheros de una fixture capturada."""
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "page.html").write_text(html, encoding="utf-8")
+    (directory / "fixture.json").write_text(
+        json.dumps({"book": book, "url": url}, ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+    if state is not None:
+        (directory / "preloaded_state.json").write_text(
+            json.dumps(state, ensure_ascii=False),
+            encoding="utf-8",
+        )
+    return directory
+
+
+def write_golden(fixture: SelectorFixture, matches: list[MatchInfo]) -> None:
+    """Sustituye el `golden.json` de la fixture por la salida actual del selector."""
+    fixture.golden_path.write_text(
+        json.dumps(golden_payload(matches), ensure_ascii=False, indent=2) + "\n",
+        encoding="utf-8",
+    )
+
+
+async def capture_selector_fixture(page: Page, book: str, directory: Path) -> Path:
+    """Guarda la página en vivo como fixture (HTML sin scripts, CSS incrustado y estado).
+
+    No escribe `golden.json`: se genera con `--update-golden` y se revisa a mano.
+    """
+    captured = await page.evaluate(_CAPTURE_SCRIPT)
+    return await asyncio.to_thread(
+        write_selector_fixture, directory, book, page.url, captured["html"], captured["state"]
+    )
+
+
+def parse_slate_sizes(text: str) -> list[int]:
+    """Lee `1,10,50` como tamaños de cartelera (la completa se mide siempre)."""
+    return sorted({int(size) for size in text.split(",") if size.strip() and int(size) > 0})
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(
+        description="Mide los selectores sobre páginas guardadas y las compara con su golden"
+    )
+    argument_parser.add_argument("fixtures", type=Path, nargs="+")
+    argument_parser.add_argument("--repeat", type=int, default=20)
+    argument_parser.add_argument("--sizes", type=parse_slate_sizes, default=[1, 10, 50])
+    argument_parser.add_argument("--update-golden", action="store_true")
+    arguments = argument_parser.parse_args()
+    bench_report = asyncio.run(
+        SelectorBench(arguments.repeat).run(
+            [load_selector_fixture(path) for path in arguments.fixtures],
+            arguments.sizes,
+            update_golden=arguments.update_golden,
+        )
+    )
+    print(json.dumps(bench_report, indent=2, ensure_ascii=False))
+    if any(entry["golden"] not in ("ok", "sin golden") for entry in bench_report.values()):
+        sys.exit(1)
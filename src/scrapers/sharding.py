@@ -0,0 +1,99 @@
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ShardPlan:
+    """Reparto de competiciones en vivo entre pestañas (shards) de una casa de apuestas."""
+
+    shards: tuple[frozenset[str], ...]
+    loads: tuple[int, ...]
+
+    @property
+    def max_load(self) -> int:
+        """Partidos del shard más cargado."""
+        return max(self.loads, default=0)
+
+    def shard_of(self, competition: str) -> int | None:
+        """Índice del shard que sirve una competición o `None` si no está asignada."""
+        for index, competitions in enumerate(self.shards):
+            if competition in competitions:
+                return index
+        return None
+
+
+class ShardPlanner:
+    """Planificador puro que reparte competiciones en shards equilibrados por partidos.
+
+    El número de shards crece con el total de partidos (`max_fixtures_per_shard`) hasta
+    `max_shards`. Entre replanificaciones se mantiene cada competición en su shard
+    (para no replegar/desplegar secciones en las pestañas) y solo se reparte de cero
+    cuando cambia el número de shards o el desequilibrio supera `imbalance_tolerance`.
+    """
+
+    def __init__(
+        self,
+        max_fixtures_per_shard: int = 40,
+        max_shards: int = 4,
+        imbalance_tolerance: float = 1.5,
+    ) -> None:
+        self.max_fixtures_per_shard = max(1, max_fixtures_per_shard)
+        self.max_shards = max(1, max_shards)
+        self.imbalance_tolerance = imbalance_tolerance
+
+    def shard_count(self, total_fixtures: int) -> int:
+        """Número de shards necesario para un total de partidos."""
+        wanted = math.ceil(total_fixtures / self.max_fixtures_per_shard)
+        return min(max(wanted, 1), self.max_shards)
+
+    def plan(
+        self,
+        competition_sizes: Mapping[str, int],
+        previous: ShardPlan | None = None,
+    ) -> ShardPlan:
+        """Calcula el reparto para el tamaño actual de cada competición en vivo."""
+        live_sizes = {name: size for name, size in competition_sizes.items() if size > 0}
+        shard_count = self.shard_count(sum(live_sizes.values()))
+
+        if previous is not None and len(previous.shards) == shard_count:
+            sticky_plan = self._assign(live_sizes, shard_count, previous)
+            if not self._is_unbalanced(sticky_plan, live_sizes):
+                return sticky_plan
+        return self._assign(live_sizes, shard_count, None)
+
+    def _is_unbalanced(self, plan: ShardPlan, live_sizes: Mapping[str, int]) -> bool:
+        ideal_load = sum(live_sizes.values()) / len(plan.shards)
+        return (
+            plan.max_load > self.max_fixtures_per_shard
+            and plan.max_load > self.imbalance_tolerance * ideal_load
+        )
+
+    @staticmethod
+    def _assign(
+        live_sizes: Mapping[str, int],
+        shard_count: int,
+        previous: ShardPlan | None,
+    ) -> ShardPlan:
+        shards: list[set[str]] = [set() for _ in range(shard_count)]
+        loads = [0] * shard_count
+        pending: list[str] = []
+
+        for competition in live_sizes:
+            index = previous.shard_of(competition) if previous is not None else None
+            if index is None:
+                pending.append(competition)
+                continue
+            shards[index].add(competition)
+            loads[index] += live_sizes[competition]
+
+        # Mayor primero al shard menos cargado (LPT): reparto casi óptimo en O(n log n)
+        for competition in sorted(pending, key=lambda name: (-live_sizes[name], name)):
+            index = loads.index(min(loads))
+            shards[index].add(competition)
+            loads[index] += live_sizes[competition]
+
+        return ShardPlan(
+            shards=tuple(frozenset(competitions) for competitions in shards),
+            loads=tuple(loads),
+        )
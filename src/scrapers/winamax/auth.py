@@ -1,13 +1,40 @@
-from playwright.async_api import Page
+from typing import TYPE_CHECKING
 
 from src.core.logger import logger
 
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+LOGIN_BUTTON_TEXT = "Conectarse"
+# Elementos de la cabecera que solo aparecen con sesión iniciada (saldo o menú de cuenta)
+ACCOUNT_SELECTOR = '[data-testid*="balance"], [data-testid*="account"], a[href*="/account"]'
+SESSION_CHECK_TIMEOUT_MS = 8000
+
+
+async def is_winamax_session_active(
+    page: Page, timeout_ms: float = SESSION_CHECK_TIMEOUT_MS
+) -> bool:
+    """Indica si hay sesión iniciada.
+
+    Espera a que la cabecera pinte el botón 'Conectarse' o un elemento de la cuenta:
+    que el botón aún no se vea no significa que haya sesión. Si no aparece ninguno
+    a tiempo, se da por no iniciada.
+    """
+    login_button = page.get_by_text(LOGIN_BUTTON_TEXT).first
+    account = page.locator(ACCOUNT_SELECTOR).first
+    try:
+        await login_button.or_(account).first.wait_for(state="visible", timeout=timeout_ms)
+        return not await login_button.is_visible()
+    except Exception as e:
+        logger.debug(f"auth.py: No se pudo comprobar la sesión: {e}")
+        return False
+
 
 async def login_winamax(page: Page, username: str, password: str, birthday: str) -> bool:
     """Realiza el proceso de login en Winamax."""
     try:
         logger.debug("auth.py: Clicking 'Conectarse' button to open login panel")
-        await page.get_by_text("Conectarse").first.click()
+        await page.get_by_text(LOGIN_BUTTON_TEXT).first.click()
 
         logger.debug("auth.py: Switching to 'login' iframe and filling credentials")
         login_frame = page.frame_locator('iframe[name="login"]')
@@ -22,8 +49,8 @@ async def login_winamax(page: Page, username: str, password: str, birthday: str)
         await login_frame.get_by_role("textbox", name="AAAA").fill(year)
         await login_frame.get_by_role("button", name="Conectarse").click()
 
-        logger.debug("auth.py: Waiting for 4000ms timeout to ensure session establishment")
-        await page.wait_for_timeout(4000)
+        logger.debug("auth.py: Waiting (max 4000ms) for the login button to disappear")
+        await page.get_by_text(LOGIN_BUTTON_TEXT).first.wait_for(state="hidden", timeout=4000)
         return True
     except Exception as e:
         logger.error(f"Error durante el proceso de login: {e}")
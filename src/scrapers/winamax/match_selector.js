@@ -3,6 +3,8 @@
  * Prioriza PRELOADED_STATE (estable) y deja el DOM como fallback.
  */
 (cards) => {
+    // Instante de lectura en la página (epoch ms), para medir la frescura de cada registro
+    const observedAtMs = Date.now();
     const normalize = (value) => String(value ?? '').replace(/\s+/g, ' ').trim();
 
     const parseScore = (scoreText) => {
@@ -19,6 +21,77 @@
         return [parseInt(match[1], 10), parseInt(match[2], 10)];
     };
 
+    const NEXT_GOAL_PATTERN = /(pr[oó]ximo|siguiente)\s+gol|next\s+goal/i;
+    const MIDDLE_OUTCOME_PATTERN = /^(x|empate|draw|ning[uú]n|sin\s+gol|no\s+goal)/i;
+
+    // Cuotas de una apuesta de 3 resultados: [local, centro, visitante] por posición,
+    // con el centro confirmado por etiqueta cuando la hay (empate / sin gol).
+    const readThreeWayOdds = (bet, outcomes, odds, middleKey) => {
+        const outcomeIds = Array.isArray(bet?.outcomes) ? bet.outcomes : [];
+        if (outcomeIds.length !== 3) {
+            return null;
+        }
+
+        const keys = ['home', middleKey, 'away'];
+        const middleLabel = normalize(outcomes[String(outcomeIds[1])]?.label);
+        if (middleLabel && !MIDDLE_OUTCOME_PATTERN.test(middleLabel)) {
+            return null;
+        }
+
+        const prices = {};
+        outcomeIds.forEach((outcomeId, index) => {
+            const price = Number(odds[String(outcomeId)]);
+            // 0 / ausente = resultado suspendido: no se envía
+            if (Number.isFinite(price) && price > 1) {
+                prices[keys[index]] = price;
+            }
+        });
+        return prices;
+    };
+
+    // Une bets -> outcomes -> odds en una sola pasada, solo para los partidos pedidos:
+    // las apuestas de otros partidos se descartan antes de leer su título o sus cuotas.
+    const buildMarketsByMatch = (state, matches) => {
+        const bets = state.bets || {};
+        const outcomes = state.outcomes || {};
+        const odds = state.odds || {};
+        const marketsByMatch = new Map();
+        const matchIds = new Set(matches.map((match) => String(match.matchId)));
+
+        const addMarket = (matchId, market, prices) => {
+            if (!prices) {
+                return;
+            }
+            const key = String(matchId);
+            if (!marketsByMatch.has(key)) {
+                marketsByMatch.set(key, []);
+            }
+            marketsByMatch.get(key).push({ market, outcomes: prices });
+        };
+
+        const mainBetIds = new Set();
+        matches.forEach((match) => {
+            if (match.mainBetId === undefined) {
+                return;
+            }
+            mainBetIds.add(String(match.mainBetId));
+            addMarket(match.matchId, '1x2', readThreeWayOdds(bets[String(match.mainBetId)], outcomes, odds, 'draw'));
+        });
+
+        Object.values(bets).forEach((bet) => {
+            if (!bet || !matchIds.has(String(bet.matchId)) || mainBetIds.has(String(bet.betId))) {
+                return;
+            }
+            const title = normalize(bet.betTitle || bet.betTypeName || bet.marketName);
+            if (!NEXT_GOAL_PATTERN.test(title)) {
+                return;
+            }
+            addMarket(bet.matchId, 'next_goal', readThreeWayOdds(bet, outcomes, odds, 'none'));
+        });
+
+        return marketsByMatch;
+    };
+
     const parseFromPreloadedState = () => {
         const state = window.PRELOADED_STATE || window.__PRELOADED_STATE__;
         if (!state || !state.matches) {
@@ -35,7 +108,7 @@
                 .filter(Boolean)
         );
 
-        const results = Object.values(state.matches)
+        const liveMatches = Object.values(state.matches)
             .filter((match) => {
                 if (!match || Number(match.sportId) !== 1) {
                     return false;
@@ -50,7 +123,10 @@
                 }
 
                 return cardIds.has(String(match.matchId));
-            })
+            });
+        const marketsByMatch = buildMarketsByMatch(state, liveMatches);
+
+        const results = liveMatches
             .map((match) => {
                 const [scoreHome, scoreAway] = parseScore(match.score || match.setScores);
                 const minute = Number.isFinite(match.matchtime) ? Number(match.matchtime) : null;
@@ -71,7 +147,9 @@
                     score_away: scoreAway,
                     minute,
                     competition,
-                    match_url: `https://www.winamax.es/apuestas-deportivas/match/${match.matchId}`
+                    match_url: `https://www.winamax.es/apuestas-deportivas/match/${match.matchId}`,
+                    observed_at_ms: observedAtMs,
+                    markets: marketsByMatch.get(String(match.matchId)) || []
                 };
             })
             .filter((match) => match.home_team && match.away_team);
@@ -252,7 +330,8 @@
                 score_away: scoreAway,
                 minute: minute,
                 competition: competitionLine,
-                match_url: matchUrl
+                match_url: matchUrl,
+                observed_at_ms: Date.now()
             };
         } catch (err) {
             return null;
@@ -1,11 +1,26 @@
-import contextlib
+from typing import TYPE_CHECKING
 
-from playwright.async_api import Page
+from src.scrapers.overlays import OverlayHandler, OverlayRegistry
 
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
-async def handle_popups(page: Page) -> None:
-    with contextlib.suppress(Exception):
-        await page.click("#tarteaucitronPersonalize2", timeout=2000)
+COOKIE_CONSENT_SELECTOR = "#tarteaucitronPersonalize2"
 
-    with contextlib.suppress(Exception):
-        await page.mouse.click(10, 150)
+WINAMAX_OVERLAY_HANDLERS = [
+    OverlayHandler(
+        name="cookies",
+        locator=lambda page: page.locator(COOKIE_CONSENT_SELECTOR),
+        selector=COOKIE_CONSENT_SELECTOR,
+    ),
+]
+
+
+def build_overlay_registry() -> OverlayRegistry:
+    """Crea el registro de overlays de Winamax (uno por scraper, con sus contadores)."""
+    return OverlayRegistry("Winamax", WINAMAX_OVERLAY_HANDLERS)
+
+
+async def handle_popups(page: Page, overlays: OverlayRegistry | None = None) -> None:
+    """Cierra los overlays ya visibles sin esperas fijas (perfiles persistentes ya los aceptaron)."""
+    await (overlays or build_overlay_registry()).dismiss_visible(page)
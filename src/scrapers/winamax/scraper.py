@@ -2,14 +2,12 @@ import asyncio
 import os
 from pathlib import Path
 
-from playwright.async_api import TimeoutError as PlaywrightTimeoutError
-
 from src.core.browser import BrowserManager
 from src.core.logger import logger
 from src.models.odds import MatchInfo
-from src.scrapers.base import BaseScraper
-from src.scrapers.winamax.auth import login_winamax
-from src.scrapers.winamax.popups import handle_popups
+from src.scrapers.base import BaseScraper, build_received_matches
+from src.scrapers.winamax.auth import is_winamax_session_active, login_winamax
+from src.scrapers.winamax.popups import build_overlay_registry, handle_popups
 
 
 class WinamaxScraper(BaseScraper):
@@ -23,13 +21,17 @@ class WinamaxScraper(BaseScraper):
         self._password = os.getenv("WINAMAX_PASS")
         self._birthday = os.getenv("WINAMAX_BIRTHDAY")
 
+        self._overlays = build_overlay_registry()
         self._js_path = Path(__file__).parent / "match_selector.js"
         self._selector_script = self._js_path.read_text(encoding="utf-8")
 
     async def start(self) -> bool:
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
         try:
             if not self._page:
                 self._page = await self.browser_manager.get_new_page()
+                await self._overlays.install(self._page)
 
             logger.info(f"🌐 Navegando a Winamax Live: {self._base_url}")
             for attempt in range(1, 3):
@@ -46,7 +48,7 @@ class WinamaxScraper(BaseScraper):
                     if attempt == 2:
                         raise
 
-            await handle_popups(self._page)
+            await handle_popups(self._page, self._overlays)
             return True
         except Exception as e:
             logger.error(f"Error al iniciar: {e}")
@@ -59,12 +61,23 @@ class WinamaxScraper(BaseScraper):
             if not self._username or not self._password or not self._birthday:
                 return False
             logger.info("🔐 Iniciando sesión...")
-            await login_winamax(self._page, self._username, self._password, self._birthday)
-            await handle_popups(self._page)
+            if not await login_winamax(self._page, self._username, self._password, self._birthday):
+                return False
+            await handle_popups(self._page, self._overlays)
+            await self.browser_manager.save_storage_state()
             return True
         except Exception:
             return False
 
+    async def ensure_session(self) -> bool:
+        """Reutiliza la sesión del perfil persistente y solo hace login si no es válida."""
+        if not self._page:
+            return False
+        if await is_winamax_session_active(self._page):
+            logger.info("🔓 Sesión de Winamax reutilizada desde el perfil.")
+            return True
+        return await self.login()
+
     async def navigate_to_live(self) -> bool:
         if not self._page:
             return False
@@ -86,11 +99,21 @@ class WinamaxScraper(BaseScraper):
             matches_data = await self._page.eval_on_selector_all(
                 '[data-testid^="match-card-"]', self._selector_script
             )
-            return [MatchInfo(**m) for m in matches_data]
+            return build_received_matches(matches_data)
         except Exception as e:
             logger.error(f"Error en extracción: {e}")
             return []
 
+    async def recycle(self) -> bool:
+        """Abre una página nueva en el mismo contexto y vuelve a dejarla en fútbol en vivo."""
+        self._page = await self.browser_manager.recycle_page()
+        await self._overlays.install(self._page)
+        return await self.start() and await self.navigate_to_live()
+
+    @property
+    def overlay_counters(self) -> dict[str, int]:
+        return self._overlays.counters
+
     async def close(self) -> None:
         if self._page:
             await self._page.close()
@@ -5,6 +5,22 @@ const statusEl = document.getElementById("link-status");
 const refreshStateEl = document.getElementById("refresh-state");
 const linkedPanelEl = document.getElementById("linked-panel");
 const pendingPanelEl = document.getElementById("pending-panel");
+const alertsPanelEl = document.getElementById("alerts-panel");
+const alertsListEl = document.getElementById("alerts-list");
+const alertsCountEl = document.getElementById("alerts-count");
+const linkedRowsEl = document.getElementById("linked-rows");
+const pendingRowsEl = document.getElementById("pending-rows");
+const lastUpdateEl = document.getElementById("last-update");
+const winamaxTotalEl = document.getElementById("winamax-total");
+const bet365TotalEl = document.getElementById("bet365-total");
+const linkedTotalEl = document.getElementById("linked-total");
+const pendingTotalEl = document.getElementById("pending-total");
+const batchPanelEl = document.getElementById("batch-panel");
+const batchListEl = document.getElementById("batch-list");
+const batchCountEl = document.getElementById("batch-count");
+const batchAddButton = document.getElementById("batch-add");
+const batchSubmitButton = document.getElementById("batch-submit");
+const batchClearButton = document.getElementById("batch-clear");
 
 const refreshSeconds = Number.parseInt(
   document.body?.dataset?.refreshSeconds ?? "1",
@@ -12,11 +28,28 @@ const refreshSeconds = Number.parseInt(
 );
 const viewMode = (document.body?.dataset?.viewMode || "all").toLowerCase();
 const canLink = viewMode !== "linked";
+const isClientRendering = (document.body?.dataset?.renderMode || "server") === "client";
 const linkApiUrl = form?.getAttribute("action") || "/api/link";
+const linkBatchApiUrl = `${linkApiUrl}/batch`;
+const stateApiUrl = "/api/state";
+const alertsApiUrl = "/api/alerts";
+const suggestionsApiUrl = "/api/suggestions";
+const longPollSeconds = 25;
+const virtualRowHeight = 34;
+const virtualOverscanRows = 8;
+const comboboxMaxResults = 50;
 
 let isSubmitting = false;
 let isUserInteracting = false;
 let reloadTimeoutId = null;
+let knownVersion = Number.parseInt(document.body?.dataset?.version ?? "0", 10) || 0;
+// Las versiones vuelven a empezar cuando se reinicia el servidor: otro boot_id = estado nuevo
+let knownBootId = document.body?.dataset?.bootId || "";
+let hasNewVersion = false;
+let suggestionsByWinamaxIndex = new Map();
+let isBet365AutoSelected = false;
+let latestState = null;
+let batchItems = [];
 
 function parseEmbeddedMatches(elementId) {
   const element = document.getElementById(elementId);
@@ -33,8 +66,242 @@ function parseEmbeddedMatches(elementId) {
   }
 }
 
-const winamaxMatches = parseEmbeddedMatches("winamax-matches-data");
-const bet365Matches = parseEmbeddedMatches("bet365-matches-data");
+let winamaxMatches = parseEmbeddedMatches("winamax-matches-data");
+let bet365Matches = parseEmbeddedMatches("bet365-matches-data");
+const comboboxesBySelect = new Map();
+
+function createVirtualTable(tbodyEl) {
+  // Solo existen en el DOM las filas visibles (más un margen); el resto es un espaciador
+  const scrollEl = tbodyEl.closest(".table-scroll") || tbodyEl.parentElement;
+  let rows = [];
+  let frameId = 0;
+
+  function buildRow([minute, winamax, bet365]) {
+    const row = document.createElement("tr");
+    const winamaxCell = document.createElement("td");
+    const minuteCell = document.createElement("td");
+    const bet365Cell = document.createElement("td");
+    minuteCell.className = "minute";
+    winamaxCell.textContent = winamax;
+    minuteCell.textContent = minute;
+    bet365Cell.textContent = bet365;
+    winamaxCell.title = winamax;
+    bet365Cell.title = bet365;
+    row.append(winamaxCell, minuteCell, bet365Cell);
+    return row;
+  }
+
+  function buildSpacer(height) {
+    const row = document.createElement("tr");
+    const cell = document.createElement("td");
+    row.className = "virtual-spacer";
+    row.style.height = `${height}px`;
+    cell.colSpan = 3;
+    row.append(cell);
+    return row;
+  }
+
+  function draw() {
+    frameId = 0;
+    const viewportHeight = scrollEl.clientHeight || window.innerHeight;
+    const first = Math.max(
+      0,
+      Math.floor(scrollEl.scrollTop / virtualRowHeight) - virtualOverscanRows,
+    );
+    const last = Math.min(
+      rows.length,
+      first + Math.ceil(viewportHeight / virtualRowHeight) + 2 * virtualOverscanRows,
+    );
+
+    const nodes = [];
+    if (first > 0) {
+      nodes.push(buildSpacer(first * virtualRowHeight));
+    }
+    for (let index = first; index < last; index += 1) {
+      nodes.push(buildRow(rows[index]));
+    }
+    if (last < rows.length) {
+      nodes.push(buildSpacer((rows.length - last) * virtualRowHeight));
+    }
+    tbodyEl.replaceChildren(...nodes);
+  }
+
+  function scheduleDraw() {
+    if (!frameId) {
+      frameId = window.requestAnimationFrame(draw);
+    }
+  }
+
+  scrollEl.addEventListener("scroll", scheduleDraw, { passive: true });
+  window.addEventListener("resize", scheduleDraw);
+
+  return {
+    setRows(nextRows) {
+      rows = nextRows;
+      scheduleDraw();
+    },
+  };
+}
+
+function foldSearchText(text) {
+  return text
+    .normalize("NFD")
+    .replace(/[\u0300-\u036f]/g, "")
+    .toLowerCase();
+}
+
+function createCombobox(selectEl) {
+  // El <select> queda oculto con una única opción (la elegida) para que el resto del
+  // código siga leyendo `selectEl.value`; la lista solo pinta los primeros resultados
+  const wrapper = document.createElement("div");
+  const input = document.createElement("input");
+  const listEl = document.createElement("ul");
+  wrapper.className = "combobox";
+  input.type = "search";
+  input.className = "combobox-input";
+  input.placeholder = "Buscar partido...";
+  input.autocomplete = "off";
+  input.setAttribute("role", "combobox");
+  input.setAttribute("aria-expanded", "false");
+  listEl.className = "combobox-list";
+  listEl.setAttribute("role", "listbox");
+  listEl.hidden = true;
+  wrapper.append(input, listEl);
+  selectEl.required = false;
+  selectEl.hidden = true;
+  selectEl.replaceChildren();
+  selectEl.after(wrapper);
+
+  let labels = [];
+  let foldedLabels = [];
+  let visibleIndexes = [];
+  let activePosition = -1;
+
+  function highlight() {
+    Array.from(listEl.children).forEach((item, position) => {
+      item.classList.toggle("active", position === activePosition);
+    });
+    listEl.children[activePosition]?.scrollIntoView({ block: "nearest" });
+  }
+
+  function renderResults(query) {
+    const foldedQuery = foldSearchText(query.trim());
+    visibleIndexes = [];
+    for (
+      let index = 0;
+      index < labels.length && visibleIndexes.length < comboboxMaxResults;
+      index += 1
+    ) {
+      if (!foldedQuery || foldedLabels[index].includes(foldedQuery)) {
+        visibleIndexes.push(index);
+      }
+    }
+    activePosition = visibleIndexes.length ? 0 : -1;
+
+    const items = visibleIndexes.map((index) => {
+      const item = document.createElement("li");
+      item.dataset.index = String(index);
+      item.textContent = labels[index];
+      item.setAttribute("role", "option");
+      return item;
+    });
+    if (!items.length) {
+      const empty = document.createElement("li");
+      empty.className = "combobox-empty";
+      empty.textContent = "Sin resultados";
+      items.push(empty);
+    }
+    listEl.replaceChildren(...items);
+    listEl.hidden = false;
+    input.setAttribute("aria-expanded", "true");
+    highlight();
+  }
+
+  function close() {
+    listEl.hidden = true;
+    input.setAttribute("aria-expanded", "false");
+  }
+
+  function setValue(value) {
+    const index = Number.parseInt(value, 10);
+    if (Number.isNaN(index) || labels[index] === undefined) {
+      selectEl.replaceChildren();
+      input.value = "";
+      return;
+    }
+    selectEl.replaceChildren(new Option(labels[index], String(index), true, true));
+    input.value = labels[index];
+  }
+
+  function choose(value) {
+    setValue(value);
+    close();
+    selectEl.dispatchEvent(new Event("change"));
+  }
+
+  input.addEventListener("focus", () => {
+    input.select();
+    renderResults("");
+  });
+  input.addEventListener("input", () => {
+    if (!input.value && selectEl.value) {
+      selectEl.replaceChildren();
+      selectEl.dispatchEvent(new Event("change"));
+    }
+    renderResults(input.value);
+  });
+  input.addEventListener("blur", () => {
+    close();
+    setValue(selectEl.value);
+  });
+  input.addEventListener("keydown", (event) => {
+    if (event.key === "ArrowDown" || event.key === "ArrowUp") {
+      event.preventDefault();
+      if (listEl.hidden) {
+        renderResults(input.value);
+        return;
+      }
+      const step = event.key === "ArrowDown" ? 1 : -1;
+      activePosition = Math.min(
+        Math.max(activePosition + step, 0),
+        visibleIndexes.length - 1,
+      );
+      highlight();
+    } else if (event.key === "Enter" && !listEl.hidden && activePosition >= 0) {
+      event.preventDefault();
+      choose(visibleIndexes[activePosition]);
+    } else if (event.key === "Escape") {
+      close();
+    }
+  });
+  listEl.addEventListener("mousedown", (event) => {
+    // Evita el blur del input antes de que llegue el click
+    event.preventDefault();
+  });
+  listEl.addEventListener("click", (event) => {
+    const item = event.target.closest("li[data-index]");
+    if (item) {
+      choose(item.dataset.index);
+    }
+  });
+
+  return {
+    setItems(nextLabels) {
+      labels = nextLabels;
+      foldedLabels = nextLabels.map(foldSearchText);
+    },
+    setValue,
+  };
+}
+
+function setSelectValue(selectEl, value) {
+  const combobox = comboboxesBySelect.get(selectEl);
+  if (combobox) {
+    combobox.setValue(value);
+    return;
+  }
+  selectEl.value = value;
+}
 
 function setVisible(element, isVisible) {
   if (!element) {
@@ -47,12 +314,14 @@ function applyViewMode() {
   if (viewMode === "linked") {
     setVisible(linkedPanelEl, true);
     setVisible(form, false);
+    setVisible(batchPanelEl, false);
     setVisible(refreshStateEl, false);
     setVisible(pendingPanelEl, false);
     return;
   }
 
   if (viewMode === "linker") {
+    setVisible(alertsPanelEl, false);
     setVisible(linkedPanelEl, false);
     setVisible(form, true);
     setVisible(refreshStateEl, true);
@@ -74,8 +343,13 @@ function setStatus(message, isError = false) {
   statusEl.style.color = isError ? "#fca5a5" : "#38bdf8";
 }
 
+function hasPendingBatch() {
+  // En modo servidor una recarga perdería el lote; en modo cliente el lote guarda nombres
+  return !isClientRendering && batchItems.length > 0;
+}
+
 function isInteracting() {
-  return isUserInteracting;
+  return isUserInteracting || hasPendingBatch();
 }
 
 function updateRefreshState() {
@@ -88,12 +362,26 @@ function updateRefreshState() {
     return;
   }
 
+  if (hasPendingBatch()) {
+    refreshStateEl.textContent = "Auto-refresh pausado: lote de enlaces pendiente...";
+    return;
+  }
+
   if (isInteracting()) {
     refreshStateEl.textContent = "Auto-refresh pausado: seleccionando partido...";
     return;
   }
 
-  refreshStateEl.textContent = `Auto-refresh activo: ${refreshSeconds}s`;
+  if (hasNewVersion) {
+    refreshStateEl.textContent = "Auto-refresh activo: actualizando...";
+    return;
+  }
+
+  refreshStateEl.textContent = "Auto-refresh activo: esperando cambios";
+}
+
+function canReloadNow() {
+  return !isSubmitting && !isInteracting() && document.visibilityState !== "hidden";
 }
 
 function scheduleAutoRefresh() {
@@ -106,16 +394,182 @@ function scheduleAutoRefresh() {
   }
 
   reloadTimeoutId = window.setTimeout(() => {
-    if (isSubmitting || isInteracting() || document.visibilityState === "hidden") {
+    if (!hasNewVersion || !canReloadNow()) {
       scheduleAutoRefresh();
       updateRefreshState();
       return;
     }
 
+    if (isClientRendering) {
+      applyLatestState();
+      scheduleAutoRefresh();
+      return;
+    }
+
     window.location.reload();
   }, refreshSeconds * 1000);
 }
 
+function renderAlerts(alerts) {
+  if (!alertsListEl) {
+    return;
+  }
+
+  const items = alerts
+    .slice()
+    .reverse()
+    .map((alert) => {
+      const item = document.createElement("li");
+      const time = document.createElement("span");
+      time.className = "alert-time";
+      time.textContent = String(alert.detected_at || "").slice(11, 19);
+      item.append(time, document.createTextNode(alert.message || alert.kind || ""));
+      return item;
+    });
+  alertsListEl.replaceChildren(...items);
+
+  if (alertsCountEl) {
+    alertsCountEl.textContent = String(alerts.length);
+  }
+}
+
+async function followAlerts() {
+  let alertsVersion = -1;
+  while (true) {
+    try {
+      const timeout = alertsVersion < 0 ? 0 : longPollSeconds;
+      const response = await fetch(
+        `${alertsApiUrl}?after=${alertsVersion}&timeout=${timeout}`,
+        { cache: "no-store" },
+      );
+      const payload = await parseJsonResponse(response);
+      if (response.ok && Number.isFinite(payload?.version)) {
+        if (payload.version !== alertsVersion) {
+          renderAlerts(Array.isArray(payload.alerts) ? payload.alerts : []);
+        }
+        alertsVersion = payload.version;
+      }
+    } catch (error) {
+      console.error("Error leyendo alertas del dashboard", error);
+      await new Promise((resolve) => window.setTimeout(resolve, refreshSeconds * 1000));
+    }
+  }
+}
+
+async function waitForNewVersion() {
+  while (!hasNewVersion) {
+    try {
+      const response = await fetch(
+        `${stateApiUrl}?after=${knownVersion}&timeout=${longPollSeconds}`,
+        { cache: "no-store" },
+      );
+      const payload = await parseJsonResponse(response);
+      if (
+        response.ok &&
+        Number.isFinite(payload?.version) &&
+        (payload.boot_id !== knownBootId || payload.version > knownVersion)
+      ) {
+        knownVersion = payload.version;
+        knownBootId = payload.boot_id;
+        hasNewVersion = true;
+      }
+    } catch (error) {
+      console.error("Error esperando nueva versión del dashboard", error);
+      await new Promise((resolve) => window.setTimeout(resolve, refreshSeconds * 1000));
+    }
+  }
+
+  updateRefreshState();
+  if (canReloadNow()) {
+    window.location.reload();
+  }
+}
+
+function setText(element, value) {
+  if (element) {
+    element.textContent = String(value ?? "");
+  }
+}
+
+function findMatchIndex(matches, match) {
+  if (!match) {
+    return "";
+  }
+  const index = matches.findIndex(
+    (item) => item.home_team === match.home_team && item.away_team === match.away_team,
+  );
+  return index < 0 ? "" : String(index);
+}
+
+function applyState(state) {
+  // Los índices cambian con cada versión: la selección se conserva por nombres
+  const selectedWinamax = winamaxMatches[Number.parseInt(winamaxSelect?.value, 10)];
+  const selectedBet365 = bet365Matches[Number.parseInt(bet365Select?.value, 10)];
+  winamaxMatches = Array.isArray(state.winamax_pending) ? state.winamax_pending : [];
+  bet365Matches = Array.isArray(state.bet365_pending) ? state.bet365_pending : [];
+  knownVersion = state.version;
+  knownBootId = state.boot_id;
+
+  setText(lastUpdateEl, state.last_update);
+  setText(winamaxTotalEl, state.winamax_total);
+  setText(bet365TotalEl, state.bet365_total);
+  setText(linkedTotalEl, state.linked_total);
+  setText(pendingTotalEl, state.pending_total);
+  linkedTable?.setRows(Array.isArray(state.linked_rows) ? state.linked_rows : []);
+  pendingTable?.setRows(Array.isArray(state.pending_rows) ? state.pending_rows : []);
+
+  comboboxesBySelect.get(winamaxSelect)?.setItems(state.winamax_pending_labels || []);
+  comboboxesBySelect.get(bet365Select)?.setItems(state.bet365_pending_labels || []);
+  if (winamaxSelect && bet365Select) {
+    setSelectValue(winamaxSelect, findMatchIndex(winamaxMatches, selectedWinamax));
+    setSelectValue(bet365Select, findMatchIndex(bet365Matches, selectedBet365));
+    if (!bet365Select.value) {
+      isBet365AutoSelected = false;
+    }
+  }
+
+  if (canLink) {
+    loadSuggestions();
+  }
+}
+
+function applyLatestState() {
+  if (latestState && canReloadNow()) {
+    applyState(latestState);
+    latestState = null;
+    hasNewVersion = false;
+  }
+  updateRefreshState();
+}
+
+async function followState() {
+  let followedVersion = -1;
+  let followedBootId = null;
+  while (true) {
+    try {
+      const response = await fetch(
+        `${stateApiUrl}?after=${followedVersion}&timeout=${longPollSeconds}`,
+        { cache: "no-store" },
+      );
+      const payload = await parseJsonResponse(response);
+      if (
+        response.ok &&
+        Number.isFinite(payload?.version) &&
+        (payload.boot_id !== followedBootId || payload.version > followedVersion)
+      ) {
+        followedVersion = payload.version;
+        followedBootId = payload.boot_id;
+        latestState = payload;
+        hasNewVersion = true;
+        applyLatestState();
+      }
+    } catch (error) {
+      console.error("Error leyendo el estado del dashboard", error);
+      await new Promise((resolve) => window.setTimeout(resolve, refreshSeconds * 1000));
+    }
+  }
+}
+
 function beginInteraction() {
   isUserInteracting = true;
   updateRefreshState();
@@ -161,7 +615,196 @@ document.addEventListener("visibilitychange", () => {
   scheduleAutoRefresh();
 });
 
+async function loadSuggestions() {
+  // Los índices solo valen para la versión pintada: sin sugerencias antes que de otra versión
+  suggestionsByWinamaxIndex = new Map();
+  try {
+    const response = await fetch(suggestionsApiUrl, { cache: "no-store" });
+    const payload = await parseJsonResponse(response);
+    if (
+      !response.ok ||
+      payload?.version !== knownVersion ||
+      payload?.boot_id !== knownBootId ||
+      !Array.isArray(payload.suggestions)
+    ) {
+      return;
+    }
+    suggestionsByWinamaxIndex = new Map(
+      payload.suggestions.map((item) => [item.winamax_index, item.candidates || []]),
+    );
+  } catch (error) {
+    console.error("Error leyendo sugerencias de enlace", error);
+  }
+}
+
+function preselectSuggestedBet365() {
+  const winamaxIndex = Number.parseInt(winamaxSelect.value, 10);
+  const candidates = suggestionsByWinamaxIndex.get(winamaxIndex) || [];
+  if (bet365Select.value && !isBet365AutoSelected) {
+    return;
+  }
+  if (!candidates.length) {
+    if (isBet365AutoSelected) {
+      setSelectValue(bet365Select, "");
+      isBet365AutoSelected = false;
+    }
+    return;
+  }
+
+  setSelectValue(bet365Select, String(candidates[0].bet365_index));
+  isBet365AutoSelected = true;
+  setStatus(`Sugerencia preseleccionada (${candidates.length} candidato/s en el mismo bloque).`);
+}
+
+function readSelectedPair() {
+  const winamaxIndex = Number.parseInt(winamaxSelect.value, 10);
+  const bet365Index = Number.parseInt(bet365Select.value, 10);
+  if (Number.isNaN(winamaxIndex) || Number.isNaN(bet365Index)) {
+    return { error: "Selecciona ambos partidos antes de enlazar." };
+  }
+
+  const winamaxMatch = winamaxMatches[winamaxIndex];
+  const bet365Match = bet365Matches[bet365Index];
+  if (!winamaxMatch || !bet365Match) {
+    return { error: "No se pudieron leer los partidos seleccionados." };
+  }
+  return {
+    winamaxMatch,
+    bet365Match,
+    label: `${winamaxSelect.selectedOptions[0]?.textContent || ""} ⇄ ${
+      bet365Select.selectedOptions[0]?.textContent || ""
+    }`,
+  };
+}
+
+function renderBatch() {
+  setVisible(batchPanelEl, canLink && batchItems.length > 0);
+  setText(batchCountEl, batchItems.length);
+  if (!batchListEl) {
+    return;
+  }
+
+  const items = batchItems.map((batchItem, index) => {
+    const item = document.createElement("li");
+    const label = document.createElement("span");
+    const removeButton = document.createElement("button");
+    label.textContent = batchItem.label;
+    removeButton.type = "button";
+    removeButton.className = "batch-remove";
+    removeButton.dataset.index = String(index);
+    removeButton.textContent = "Quitar";
+    if (batchItem.error) {
+      item.className = "conflict";
+      item.title = batchItem.error;
+    }
+    item.append(label, removeButton);
+    return item;
+  });
+  batchListEl.replaceChildren(...items);
+}
+
+function addSelectionToBatch() {
+  const selection = readSelectedPair();
+  if (selection.error) {
+    setStatus(selection.error, true);
+    return;
+  }
+
+  const { winamaxMatch, bet365Match, label } = selection;
+  // Un mismo partido de Winamax solo puede ir una vez: la última elección sustituye
+  batchItems = [
+    ...batchItems.filter(
+      (item) =>
+        item.winamaxMatch.home_team !== winamaxMatch.home_team ||
+        item.winamaxMatch.away_team !== winamaxMatch.away_team,
+    ),
+    { winamaxMatch, bet365Match, label, error: "" },
+  ];
+  setSelectValue(winamaxSelect, "");
+  setSelectValue(bet365Select, "");
+  isBet365AutoSelected = false;
+  renderBatch();
+  updateRefreshState();
+  setStatus(`Añadido al lote (${batchItems.length}).`);
+}
+
+async function submitBatch() {
+  if (!batchItems.length || isSubmitting) {
+    return;
+  }
+
+  isSubmitting = true;
+  updateRefreshState();
+  setStatus(`Guardando lote de ${batchItems.length} enlace(s)...`);
+
+  try {
+    const response = await fetch(linkBatchApiUrl, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({
+        items: batchItems.map((item) => ({
+          winamax_match: item.winamaxMatch,
+          bet365_match: item.bet365Match,
+        })),
+      }),
+    });
+
+    const payload = await parseJsonResponse(response);
+    if (!response.ok) {
+      const results = Array.isArray(payload?.results) ? payload.results : [];
+      results.forEach((result) => {
+        if (batchItems[result.index]) {
+          batchItems[result.index].error = ["conflict", "invalid"].includes(result.status)
+            ? result.message
+            : "";
+        }
+      });
+      throw new Error(payload?.message || "No se pudo guardar el lote de enlaces.");
+    }
+
+    batchItems = [];
+    setStatus(payload?.message || "Lote aplicado. Se reflejará en la próxima actualización.");
+  } catch (error) {
+    const message = error instanceof Error ? error.message : "Error inesperado";
+    setStatus(message, true);
+  } finally {
+    isSubmitting = false;
+    renderBatch();
+    updateRefreshState();
+    scheduleAutoRefresh();
+  }
+}
+
+if (canLink && batchAddButton && batchSubmitButton && batchClearButton && batchListEl) {
+  batchAddButton.addEventListener("click", addSelectionToBatch);
+  batchSubmitButton.addEventListener("click", submitBatch);
+  batchClearButton.addEventListener("click", () => {
+    batchItems = [];
+    renderBatch();
+    updateRefreshState();
+    scheduleAutoRefresh();
+  });
+  batchListEl.addEventListener("click", (event) => {
+    const button = event.target.closest("button[data-index]");
+    if (button) {
+      batchItems.splice(Number.parseInt(button.dataset.index, 10), 1);
+      renderBatch();
+      updateRefreshState();
+    }
+  });
+}
+
 if (canLink && form && winamaxSelect && bet365Select) {
+  winamaxSelect.addEventListener("change", preselectSuggestedBet365);
+  bet365Select.addEventListener("change", () => {
+    isBet365AutoSelected = false;
+  });
+  if (!isClientRendering) {
+    loadSuggestions();
+  }
+
   form.addEventListener("submit", async (event) => {
     event.preventDefault();
 
@@ -169,26 +812,15 @@ if (canLink && form && winamaxSelect && bet365Select) {
     isSubmitting = true;
     updateRefreshState();
 
-    const winamaxIndex = Number.parseInt(winamaxSelect.value, 10);
-    const bet365Index = Number.parseInt(bet365Select.value, 10);
-
-    if (Number.isNaN(winamaxIndex) || Number.isNaN(bet365Index)) {
+    const selection = readSelectedPair();
+    if (selection.error) {
       isSubmitting = false;
       updateRefreshState();
       scheduleAutoRefresh();
-      setStatus("Selecciona ambos partidos antes de enlazar.", true);
-      return;
-    }
-
-    const winamaxMatch = winamaxMatches[winamaxIndex];
-    const bet365Match = bet365Matches[bet365Index];
-    if (!winamaxMatch || !bet365Match) {
-      isSubmitting = false;
-      updateRefreshState();
-      scheduleAutoRefresh();
-      setStatus("No se pudieron leer los partidos seleccionados.", true);
+      setStatus(selection.error, true);
       return;
     }
+    const { winamaxMatch, bet365Match } = selection;
 
     setStatus("Guardando enlace...");
 
@@ -213,7 +845,7 @@ if (canLink && form && winamaxSelect && bet365Select) {
       updateRefreshState();
       scheduleAutoRefresh();
       setStatus(
-        payload?.message || "Enlace guardado. Se reflejará en la próxima actualización.",
+        payload?.message || "Enlace aplicado. Se reflejará en la próxima actualización.",
       );
     } catch (error) {
       isSubmitting = false;
@@ -226,6 +858,23 @@ if (canLink && form && winamaxSelect && bet365Select) {
   });
 }
 
+const linkedTable = isClientRendering && linkedRowsEl ? createVirtualTable(linkedRowsEl) : null;
+const pendingTable =
+  isClientRendering && pendingRowsEl ? createVirtualTable(pendingRowsEl) : null;
+if (isClientRendering && canLink && winamaxSelect && bet365Select) {
+  [winamaxSelect, bet365Select].forEach((selectEl) => {
+    comboboxesBySelect.set(selectEl, createCombobox(selectEl));
+  });
+}
+
 applyViewMode();
 updateRefreshState();
 scheduleAutoRefresh();
+if (isClientRendering) {
+  followState();
+} else {
+  waitForNewVersion();
+}
+if (viewMode !== "linker") {
+  followAlerts();
+}
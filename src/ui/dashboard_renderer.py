@@ -1,10 +1,30 @@
 import html
 import json
 from collections import defaultdict
+from dataclasses import dataclass, field
 
+from src.engine.candidates import LinkCandidate
 from src.models.odds import MatchInfo
 
 
+@dataclass(frozen=True)
+class DashboardContent:
+    """Datos ya calculados que se pintan en el dashboard (HTML y estado JSON)."""
+
+    linked_rows: list[tuple[str, str, str]]
+    pending_rows: list[tuple[str, str, str]]
+    winamax_total: int
+    bet365_total: int
+    linked_total: int
+    pending_total: int
+    last_update: str
+    winamax_pending_raw_matches: list[MatchInfo]
+    bet365_pending_matches: list[MatchInfo]
+    link_suggestions: list[list[LinkCandidate]] = field(default_factory=list)
+    # Casas cuyos partidos vienen del checkpoint de la sesión anterior (sin confirmar)
+    stale_books: tuple[str, ...] = ()
+
+
 def format_minute(minute: int | None) -> str:
     """Formatea el minuto de juego para dashboard."""
     return f"{minute}'" if minute is not None else "??"
@@ -129,15 +149,18 @@ def _build_match_options(matches: list[MatchInfo]) -> str:
     )
 
 
-def _serialize_matches(matches: list[MatchInfo]) -> str:
-    serializable = [
+def _build_link_payloads(matches: list[MatchInfo]) -> list[dict[str, str]]:
+    return [
         {
             "home_team": match.home_team,
             "away_team": match.away_team,
         }
         for match in matches
     ]
-    serialized = json.dumps(serializable, ensure_ascii=False)
+
+
+def _serialize_matches(matches: list[MatchInfo]) -> str:
+    serialized = json.dumps(_build_link_payloads(matches), ensure_ascii=False)
     return serialized.replace("</", "<\\/")
 
 
@@ -157,28 +180,81 @@ def _render_table_rows(rows: list[tuple[str, str, str]]) -> str:
 def render_dashboard_html(
     dashboard_template: str,
     refresh_seconds: int,
-    linked_rows: list[tuple[str, str, str]],
-    pending_rows: list[tuple[str, str, str]],
-    winamax_total: int,
-    bet365_total: int,
-    linked_total: int,
-    pending_total: int,
-    last_update: str,
-    winamax_pending_raw_matches: list[MatchInfo],
-    bet365_pending_matches: list[MatchInfo],
+    content: DashboardContent,
+    client_rendering: bool = False,
 ) -> str:
-    """Renderiza el dashboard HTML con tabla comparativa y formulario de enlace."""
+    """Renderiza el dashboard HTML con tabla comparativa y formulario de enlace.
+
+    Con `client_rendering` solo se emite el esqueleto de la página: filas, opciones
+    y partidos los pinta `dashboard.js` a partir de `/api/state`, dibujando
+    únicamente las filas visibles.
+    """
+    if client_rendering:
+        return dashboard_template.format(
+            refresh_seconds=refresh_seconds,
+            render_mode="client",
+            last_update=html.escape(content.last_update),
+            winamax_total=content.winamax_total,
+            bet365_total=content.bet365_total,
+            linked_total=content.linked_total,
+            pending_total=content.pending_total,
+            linked_table_rows="",
+            pending_table_rows="",
+            winamax_options="",
+            bet365_options="",
+            winamax_matches_json="[]",
+            bet365_matches_json="[]",
+        ).strip()
+
     return dashboard_template.format(
         refresh_seconds=refresh_seconds,
-        last_update=html.escape(last_update),
-        winamax_total=winamax_total,
-        bet365_total=bet365_total,
-        linked_total=linked_total,
-        pending_total=pending_total,
-        linked_table_rows=_render_table_rows(linked_rows),
-        pending_table_rows=_render_table_rows(pending_rows),
-        winamax_options=_build_match_options(winamax_pending_raw_matches),
-        bet365_options=_build_match_options(bet365_pending_matches),
-        winamax_matches_json=_serialize_matches(winamax_pending_raw_matches),
-        bet365_matches_json=_serialize_matches(bet365_pending_matches),
+        render_mode="server",
+        last_update=html.escape(content.last_update),
+        winamax_total=content.winamax_total,
+        bet365_total=content.bet365_total,
+        linked_total=content.linked_total,
+        pending_total=content.pending_total,
+        linked_table_rows=_render_table_rows(content.linked_rows),
+        pending_table_rows=_render_table_rows(content.pending_rows),
+        winamax_options=_build_match_options(content.winamax_pending_raw_matches),
+        bet365_options=_build_match_options(content.bet365_pending_matches),
+        winamax_matches_json=_serialize_matches(content.winamax_pending_raw_matches),
+        bet365_matches_json=_serialize_matches(content.bet365_pending_matches),
     ).strip()
+
+
+def build_dashboard_state(content: DashboardContent) -> dict[str, object]:
+    """Construye el estado JSON del dashboard que se sirve en `/api/state`."""
+    return {
+        "last_update": content.last_update,
+        "winamax_total": content.winamax_total,
+        "bet365_total": content.bet365_total,
+        "linked_total": content.linked_total,
+        "pending_total": content.pending_total,
+        "stale_books": list(content.stale_books),
+        "linked_rows": [list(row) for row in content.linked_rows],
+        "pending_rows": [list(row) for row in content.pending_rows],
+        "winamax_pending": _build_link_payloads(content.winamax_pending_raw_matches),
+        "bet365_pending": _build_link_payloads(content.bet365_pending_matches),
+        "winamax_pending_labels": [
+            _build_option_label(match) for match in content.winamax_pending_raw_matches
+        ],
+        "bet365_pending_labels": [
+            _build_option_label(match) for match in content.bet365_pending_matches
+        ],
+    }
+
+
+def build_dashboard_suggestions(content: DashboardContent) -> list[object]:
+    """Candidatos de enlace por índice de pendiente de Winamax para `/api/suggestions`."""
+    return [
+        {
+            "winamax_index": winamax_index,
+            "candidates": [
+                {"bet365_index": candidate.bet365_index, "score": candidate.score}
+                for candidate in candidates
+            ],
+        }
+        for winamax_index, candidates in enumerate(content.link_suggestions)
+        if candidates
+    ]
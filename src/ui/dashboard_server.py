@@ -1,14 +1,21 @@
 import asyncio
+import contextlib
 import json
+import math
+import uuid
 import webbrowser
+from collections.abc import Awaitable, Callable, Mapping
 from dataclasses import dataclass
 from pathlib import Path
-from urllib.parse import urlsplit
+from types import MappingProxyType
+from urllib.parse import parse_qs, urlsplit
 
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, Field, JsonValue, ValidationError
 
 from src.core.logger import logger
-from src.engine.team_name_normalizer import save_team_name_mappings, upsert_match_team_mapping
+from src.core.profiling import parse_profile_seconds
+from src.engine.team_name_journal import TeamNameMappingsJournal
+from src.engine.team_name_normalizer import TeamNameNormalizer, fold_team_name
 
 
 class LinkMatchPayload(BaseModel):
@@ -25,6 +32,62 @@ class LinkRequestPayload(BaseModel):
     bet365_match: LinkMatchPayload
 
 
+LINK_BATCH_MAX_ITEMS = 200
+
+
+class LinkBatchRequestPayload(BaseModel):
+    """Payload del endpoint que enlaza varios partidos en una sola operación.
+
+    Los elementos se validan uno a uno (`validate_batch_items`) para poder decir
+    cuáles fallan en vez de rechazar el lote entero sin más detalle.
+    """
+
+    items: list[JsonValue] = Field(min_length=1, max_length=LINK_BATCH_MAX_ITEMS)
+
+
+def validate_batch_items(
+    raw_items: list[JsonValue],
+) -> tuple[list[LinkRequestPayload], dict[int, str]]:
+    """Valida cada elemento de un lote por separado.
+
+    Returns:
+        Los enlaces válidos y, por índice, el motivo de cada elemento inválido.
+    """
+    items: list[LinkRequestPayload] = []
+    errors: dict[int, str] = {}
+    for index, raw_item in enumerate(raw_items):
+        try:
+            items.append(LinkRequestPayload.model_validate(raw_item))
+        except ValidationError as error:
+            first_error = error.errors()[0]
+            field_path = ".".join(str(part) for part in first_error["loc"]) or "elemento"
+            errors[index] = f"Enlace inválido ({field_path}): {first_error['msg']}"
+    return items, errors
+
+
+def find_batch_conflicts(items: list[LinkRequestPayload]) -> set[int]:
+    """Índices de los enlaces del lote que mapean un mismo equipo a destinos distintos."""
+    targets_by_source: dict[str, set[str]] = {}
+    for item in items:
+        for source_name, target_name in (
+            (item.winamax_match.home_team, item.bet365_match.home_team),
+            (item.winamax_match.away_team, item.bet365_match.away_team),
+        ):
+            targets_by_source.setdefault(fold_team_name(source_name), set()).add(
+                fold_team_name(target_name)
+            )
+
+    conflicting_sources = {
+        source for source, targets in targets_by_source.items() if len(targets) > 1
+    }
+    return {
+        index
+        for index, item in enumerate(items)
+        if fold_team_name(item.winamax_match.home_team) in conflicting_sources
+        or fold_team_name(item.winamax_match.away_team) in conflicting_sources
+    }
+
+
 @dataclass(frozen=True)
 class DashboardServerConfig:
     """Configuración del servidor HTTP del dashboard."""
@@ -36,6 +99,8 @@ class DashboardServerConfig:
     template_path: Path
     css_path: Path
     js_path: Path
+    # El navegador pinta filas y selectores desde `/api/state` (tablas virtualizadas)
+    client_rendering: bool = False
 
 
 @dataclass(frozen=True)
@@ -47,51 +112,313 @@ class DashboardAssets:
     js: str
 
 
+DASHBOARD_VIEW_MODES = ("all", "linked", "linker")
+LONG_POLL_MAX_SECONDS = 30.0
+DASHBOARD_ALERTS_LIMIT = 50
+PROFILE_DEFAULT_SECONDS = 10.0
+# Las versiones vuelven a 1 al reiniciar: el arranque distingue una versión vieja de una nueva
+DASHBOARD_BOOT_ID = uuid.uuid4().hex[:12]
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Foto inmutable del dashboard: cuerpos ya codificados por vista y estado JSON."""
+
+    version: int
+    bodies: Mapping[str, bytes]
+    state_json: bytes
+    suggestions_json: bytes
+
+    def body_for(self, view_mode: str) -> bytes:
+        """Devuelve el HTML codificado de una vista del dashboard."""
+        return self.bodies.get(view_mode, self.bodies["all"])
+
+
+def build_dashboard_snapshot(
+    version: int,
+    html_content: str,
+    state_payload: dict[str, object],
+    suggestions_payload: list[object] | None = None,
+) -> DashboardSnapshot:
+    """Precalcula los cuerpos HTTP de todas las vistas para una versión del dashboard."""
+    versioned_html = html_content.replace("__DASHBOARD_VERSION__", str(version)).replace(
+        "__DASHBOARD_BOOT_ID__", DASHBOARD_BOOT_ID
+    )
+    bodies = {
+        view_mode: versioned_html.replace("__VIEW_MODE__", view_mode).encode("utf-8")
+        for view_mode in DASHBOARD_VIEW_MODES
+    }
+    state_json = json.dumps(
+        {"version": version, "boot_id": DASHBOARD_BOOT_ID, **state_payload},
+        ensure_ascii=False,
+    )
+    suggestions_json = json.dumps(
+        {
+            "version": version,
+            "boot_id": DASHBOARD_BOOT_ID,
+            "suggestions": suggestions_payload or [],
+        },
+        ensure_ascii=False,
+    )
+    return DashboardSnapshot(
+        version=version,
+        bodies=MappingProxyType(bodies),
+        state_json=state_json.encode("utf-8"),
+        suggestions_json=suggestions_json.encode("utf-8"),
+    )
+
+
 class DashboardState:
-    """Estado compartido entre monitor y servidor HTTP local."""
+    """Estado compartido entre monitor y servidor HTTP local.
+
+    El monitor publica snapshots inmutables sustituyendo una única referencia, así
+    que los lectores HTTP nunca toman locks ni esperan a escrituras lentas.
+    """
 
     def __init__(
         self,
-        team_name_mappings: dict[str, dict[str, str]],
-        mappings_path: Path,
+        team_name_normalizer: TeamNameNormalizer,
+        mappings_journal: TeamNameMappingsJournal,
     ) -> None:
-        self._html = ""
-        self._lock = asyncio.Lock()
-        self._team_name_mappings = team_name_mappings
-        self._mappings_path = mappings_path
-
-    async def set_html(self, html_content: str) -> None:
-        """Actualiza el HTML servido por el dashboard."""
-        async with self._lock:
-            self._html = html_content
-
-    async def get_html(self) -> str:
-        """Obtiene el HTML actual del dashboard."""
-        async with self._lock:
-            return self._html
+        self._snapshot = build_dashboard_snapshot(0, "", {})
+        self._version_changed = asyncio.Event()
+        self._team_name_normalizer = team_name_normalizer
+        self._mappings_journal = mappings_journal
+        self._link_listeners: list[Callable[[list[LinkRequestPayload]], None]] = []
+        self._metrics_provider: Callable[[], dict[str, object]] | None = None
+        self._profile_provider: Callable[[float], Awaitable[dict[str, object] | None]] | None = None
+        self._alerts: tuple[dict[str, object], ...] = ()
+        self._alerts_version = 0
+        self._alerts_changed = asyncio.Event()
+        self._closed = False
+
+    @property
+    def snapshot(self) -> DashboardSnapshot:
+        """Último snapshot publicado."""
+        return self._snapshot
+
+    def publish(
+        self,
+        html_content: str,
+        state_payload: dict[str, object],
+        suggestions_payload: list[object] | None = None,
+    ) -> DashboardSnapshot:
+        """Publica una nueva versión del dashboard y despierta a los long-polls."""
+        snapshot = build_dashboard_snapshot(
+            self._snapshot.version + 1,
+            html_content,
+            state_payload,
+            suggestions_payload,
+        )
+        self.publish_snapshot(snapshot)
+        return snapshot
+
+    def publish_snapshot(self, snapshot: DashboardSnapshot) -> bool:
+        """Publica un snapshot ya construido (p. ej. en un hilo) si es más nuevo que el actual.
+
+        Debe llamarse desde el bucle de eventos: los `asyncio.Event` no son thread-safe.
+        """
+        if snapshot.version <= self._snapshot.version:
+            return False
+        self._snapshot = snapshot
+
+        version_changed, self._version_changed = self._version_changed, asyncio.Event()
+        version_changed.set()
+        return True
+
+    async def wait_for_version(
+        self,
+        after_version: int,
+        timeout_seconds: float,
+    ) -> DashboardSnapshot:
+        """Espera a un snapshot con versión mayor que `after_version` o al timeout.
+
+        Una `after_version` mayor que la actual viene de una pestaña abierta antes de
+        reiniciar el servidor: se responde en el acto para que se resincronice.
+        """
+        snapshot = self._snapshot
+        if snapshot.version != after_version or self._closed:
+            return snapshot
+
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._version_changed.wait(), timeout=timeout_seconds)
+        return self._snapshot
+
+    def close(self) -> None:
+        """Despierta a los long-polls en curso y hace que los siguientes respondan en el acto.
+
+        `Server.wait_closed()` espera a cada conexión abierta: sin esto, una pestaña
+        con un long-poll pendiente retrasa el cierre hasta su timeout.
+        """
+        self._closed = True
+        self._version_changed.set()
+        self._alerts_changed.set()
+
+    def push_alert(self, alert_payload: dict[str, object]) -> None:
+        """Añade una alerta al canal del dashboard y despierta a los long-polls."""
+        self._alerts = (*self._alerts[-(DASHBOARD_ALERTS_LIMIT - 1) :], alert_payload)
+        self._alerts_version += 1
+
+        alerts_changed, self._alerts_changed = self._alerts_changed, asyncio.Event()
+        alerts_changed.set()
+
+    async def wait_for_alerts(self, after_version: int, timeout_seconds: float) -> bytes:
+        """Espera alertas más nuevas que `after_version` y devuelve el canal en JSON.
+
+        Como en `wait_for_version`, una versión de otro arranque se responde en el acto.
+        """
+        if self._alerts_version == after_version and not self._closed:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._alerts_changed.wait(), timeout=timeout_seconds)
+
+        return json.dumps(
+            {"version": self._alerts_version, "alerts": list(self._alerts)},
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+    def add_link_listener(self, listener: Callable[[list[LinkRequestPayload]], None]) -> None:
+        """Registra un callback que recibe los enlaces nuevos justo después de guardarlos."""
+        self._link_listeners.append(listener)
+
+    def set_metrics_provider(self, provider: Callable[[], dict[str, object]]) -> None:
+        """Registra la función que construye las métricas servidas en `/api/metrics`."""
+        self._metrics_provider = provider
+
+    def set_profile_provider(
+        self,
+        provider: Callable[[float], Awaitable[dict[str, object] | None]],
+    ) -> None:
+        """Registra la captura de perfil servida en `POST /api/profile` (None = ocupada)."""
+        self._profile_provider = provider
+
+    async def capture_profile(self, seconds: float) -> tuple[int, bytes]:
+        """Lanza una captura de perfil y devuelve el código HTTP y el cuerpo JSON."""
+        if self._profile_provider is None:
+            return 503, b'{"message":"Perfilado no disponible"}'
+        report = await self._profile_provider(seconds)
+        if report is None:
+            return 409, b'{"message":"Ya hay una captura de perfil en curso"}'
+        return 200, json.dumps(report, ensure_ascii=False).encode("utf-8")
+
+    def metrics_json(self) -> bytes:
+        """Métricas actuales del monitor en JSON (objeto vacío si no hay proveedor)."""
+        metrics = self._metrics_provider() if self._metrics_provider is not None else {}
+        return json.dumps(metrics, ensure_ascii=False).encode("utf-8")
 
     async def link_matches(self, payload: LinkRequestPayload) -> tuple[bool, str]:
-        """Guarda el mapeo Winamax -> Bet365 para los dos equipos de un partido."""
-        async with self._lock:
-            changed = upsert_match_team_mapping(
-                source_site="winamax",
-                source_home_team=payload.winamax_match.home_team,
-                source_away_team=payload.winamax_match.away_team,
-                canonical_home_team=payload.bet365_match.home_team,
-                canonical_away_team=payload.bet365_match.away_team,
-                mappings=self._team_name_mappings,
+        """Guarda el mapeo Winamax -> Bet365 para los dos equipos de un partido.
+
+        La actualización en memoria es inmediata y no toma el lock del HTML; la
+        persistencia se delega al journal, que la escribe por lotes.
+        """
+        changed = self._team_name_normalizer.upsert_match(
+            source_site="winamax",
+            source_home_team=payload.winamax_match.home_team,
+            source_away_team=payload.winamax_match.away_team,
+            canonical_home_team=payload.bet365_match.home_team,
+            canonical_away_team=payload.bet365_match.away_team,
+        )
+
+        if not changed:
+            return False, "El enlace ya estaba guardado."
+
+        self._mappings_journal.append(
+            "winamax", payload.winamax_match.home_team, payload.bet365_match.home_team
+        )
+        self._mappings_journal.append(
+            "winamax", payload.winamax_match.away_team, payload.bet365_match.away_team
+        )
+
+        self._notify_link_listeners([payload])
+        return True, "Enlace aplicado; se guardará en team_name_mappings.json en segundo plano."
+
+    async def link_matches_batch(
+        self,
+        payload: LinkBatchRequestPayload,
+    ) -> tuple[bool, list[dict[str, object]]]:
+        """Guarda un lote de enlaces de forma atómica y devuelve el resultado de cada uno.
+
+        Si algún elemento es inválido o algún equipo de Winamax aparece enlazado a
+        dos destinos distintos dentro del lote no se aplica nada, y los elementos
+        culpables se marcan como `invalid` o `conflict`. Si no, todos los mapeos se
+        publican con una sola recompilación, se encolan juntos en el journal (una
+        única escritura) y los listeners re-emparejan una sola vez.
+        """
+        items, invalid_items = validate_batch_items(payload.items)
+        if invalid_items:
+            return False, _reject_batch(
+                len(payload.items),
+                "invalid",
+                invalid_items,
+                "No aplicado: el lote tiene enlaces inválidos.",
             )
 
-            if not changed:
-                return False, "El enlace ya estaba guardado."
-
-            await asyncio.to_thread(
-                save_team_name_mappings,
-                self._mappings_path,
-                self._team_name_mappings,
+        conflicts = find_batch_conflicts(items)
+        if conflicts:
+            return False, _reject_batch(
+                len(items),
+                "conflict",
+                dict.fromkeys(conflicts, "Equipo enlazado a destinos distintos dentro del lote."),
+                "No aplicado: el lote tiene conflictos.",
             )
 
-        return True, "Enlace guardado en team_name_mappings.json"
+        changes = self._team_name_normalizer.upsert_matches(
+            "winamax",
+            [
+                (
+                    item.winamax_match.home_team,
+                    item.winamax_match.away_team,
+                    item.bet365_match.home_team,
+                    item.bet365_match.away_team,
+                )
+                for item in items
+            ],
+        )
+        changed_items = [item for item, changed in zip(items, changes, strict=True) if changed]
+        self._mappings_journal.extend(
+            [
+                ("winamax", source_name, target_name)
+                for item in changed_items
+                for source_name, target_name in (
+                    (item.winamax_match.home_team, item.bet365_match.home_team),
+                    (item.winamax_match.away_team, item.bet365_match.away_team),
+                )
+            ]
+        )
+        if changed_items:
+            self._notify_link_listeners(changed_items)
+
+        return True, [
+            {
+                "index": index,
+                "status": "linked" if changed else "unchanged",
+                "message": "Enlace aplicado." if changed else "El enlace ya estaba guardado.",
+            }
+            for index, changed in enumerate(changes)
+        ]
+
+    def _notify_link_listeners(self, payloads: list[LinkRequestPayload]) -> None:
+        for listener in self._link_listeners:
+            try:
+                listener(payloads)
+            except Exception as error:  # noqa: BLE001
+                logger.exception(f"Error re-emparejando tras enlace manual: {error}")
+
+
+def _reject_batch(
+    item_count: int,
+    status: str,
+    failures: dict[int, str],
+    skipped_message: str,
+) -> list[dict[str, object]]:
+    return [
+        {
+            "index": index,
+            "status": status if index in failures else "skipped",
+            "message": failures.get(index, skipped_message),
+        }
+        for index in range(item_count)
+    ]
 
 
 def load_dashboard_assets(config: DashboardServerConfig) -> DashboardAssets:
@@ -139,6 +466,52 @@ def _http_response(
     return ("\r\n".join(headers) + "\r\n\r\n").encode("utf-8") + body
 
 
+LOOPBACK_HOSTS = frozenset({"127.0.0.1", "localhost", "::1"})
+
+
+def is_foreign_origin(origin: str | None, config: DashboardServerConfig) -> bool:
+    """Indica si la petición la lanza una página de otro origen abierta en el navegador.
+
+    Sin cabecera `Origin` (curl, la consola) no se considera ajena; `Origin: null`
+    (iframes aislados, `file://`) sí.
+    """
+    if origin is None:
+        return False
+    parsed = urlsplit(origin)
+    allowed_hosts = LOOPBACK_HOSTS if config.host in LOOPBACK_HOSTS else {config.host}
+    return (
+        parsed.scheme != "http"
+        or parsed.hostname not in allowed_hosts
+        or (parsed.port != config.port)
+    )
+
+
+def _request_content_type(headers: dict[str, str]) -> str:
+    return headers.get("content-type", "").split(";", 1)[0].strip().lower()
+
+
+def parse_json_body[PayloadT: BaseModel](
+    headers: dict[str, str],
+    body: bytes,
+    model: type[PayloadT],
+) -> tuple[PayloadT | None, bytes]:
+    """Valida el cuerpo JSON de un POST contra `model`.
+
+    Returns:
+        El payload y un cuerpo vacío, o None y el cuerpo JSON de la respuesta 400.
+    """
+    content_type = _request_content_type(headers)
+    if content_type and content_type != "application/json":
+        return (
+            None,
+            b'{"message":"Payload invalido: se esperaba JSON (Content-Type: application/json)"}',
+        )
+    try:
+        return model.model_validate_json(body), b""
+    except ValidationError:
+        return None, b'{"message":"Payload invalido"}'
+
+
 def _normalize_request_path(path: str) -> str:
     """Normaliza la ruta HTTP para comparar endpoints de forma robusta."""
     parsed = urlsplit(path)
@@ -148,6 +521,15 @@ def _normalize_request_path(path: str) -> str:
     return normalized_path or "/"
 
 
+def _parse_query_number(query: dict[str, list[str]], name: str, default: float) -> float:
+    """Lee un parámetro numérico de la query string con valor por defecto (también si no es finito)."""
+    try:
+        value = float(query[name][0])
+    except KeyError, IndexError, ValueError:
+        return default
+    return value if math.isfinite(value) else default
+
+
 async def start_dashboard_server(
     state: DashboardState,
     config: DashboardServerConfig,
@@ -190,6 +572,7 @@ async def start_dashboard_server(
 
         method = request_parts[0].upper()
         path = _normalize_request_path(request_parts[1])
+        query = parse_qs(urlsplit(request_parts[1]).query)
 
         headers: dict[str, str] = {}
         for line in header_lines[1:]:
@@ -212,13 +595,83 @@ async def start_dashboard_server(
             else:
                 view_mode = "all"
 
-            html_content = await state.get_html()
-            html_with_mode = html_content.replace("__VIEW_MODE__", view_mode)
             response = _http_response(
                 200,
                 "OK",
                 "text/html; charset=utf-8",
-                html_with_mode.encode("utf-8"),
+                state.snapshot.body_for(view_mode),
+            )
+        elif method == "GET" and path == "/api/state":
+            after_version = _parse_query_number(query, "after", -1.0)
+            timeout_seconds = min(
+                _parse_query_number(query, "timeout", 0.0),
+                LONG_POLL_MAX_SECONDS,
+            )
+            snapshot = state.snapshot
+            if after_version >= 0 and timeout_seconds > 0:
+                snapshot = await state.wait_for_version(int(after_version), timeout_seconds)
+            response = _http_response(
+                200,
+                "OK",
+                "application/json; charset=utf-8",
+                snapshot.state_json,
+            )
+        elif method == "GET" and path == "/api/alerts":
+            after_version = _parse_query_number(query, "after", -1.0)
+            timeout_seconds = min(
+                _parse_query_number(query, "timeout", 0.0),
+                LONG_POLL_MAX_SECONDS,
+            )
+            response = _http_response(
+                200,
+                "OK",
+                "application/json; charset=utf-8",
+                await state.wait_for_alerts(int(after_version), timeout_seconds),
+            )
+        elif method == "GET" and path == "/api/suggestions":
+            response = _http_response(
+                200,
+                "OK",
+                "application/json; charset=utf-8",
+                state.snapshot.suggestions_json,
+            )
+        elif method == "GET" and path == "/api/metrics":
+            response = _http_response(
+                200,
+                "OK",
+                "application/json; charset=utf-8",
+                state.metrics_json(),
+            )
+        elif method == "POST" and path == "/api/profile":
+            seconds = parse_profile_seconds(
+                query.get("seconds", [""])[0].strip(), PROFILE_DEFAULT_SECONDS
+            )
+            # Un formulario de otra web no puede enviar JSON sin preflight, que aquí no se atiende
+            if is_foreign_origin(headers.get("origin"), config):
+                status_code, response_body = 403, b'{"message":"Origen no permitido"}'
+            elif _request_content_type(headers) != "application/json":
+                status_code, response_body = (
+                    400,
+                    b'{"message":"Se requiere Content-Type: application/json"}',
+                )
+            elif seconds is None:
+                status_code, response_body = (
+                    400,
+                    b'{"message":"seconds debe ser un numero positivo"}',
+                )
+            else:
+                status_code, response_body = await state.capture_profile(seconds)
+            response = _http_response(
+                status_code,
+                {
+                    200: "OK",
+                    400: "Bad Request",
+                    403: "Forbidden",
+                    409: "Conflict",
+                    503: "Service Unavailable",
+                }[status_code],
+                "application/json; charset=utf-8",
+                response_body,
             )
         elif method == "GET" and path == "/src/ui/dashboard.css":
             response = _http_response(
@@ -234,52 +687,76 @@ async def start_dashboard_server(
                 "application/javascript; charset=utf-8",
                 assets.js.encode("utf-8"),
             )
-        elif method == "POST" and path == "/api/link":
-            try:
-                content_type = headers.get("content-type", "").split(";", 1)[0].strip()
-                if content_type and content_type != "application/json":
+        elif method == "POST" and path == "/api/link/batch":
+            batch_payload, error_body = parse_json_body(headers, body, LinkBatchRequestPayload)
+            if batch_payload is None:
+                response = _http_response(
+                    400, "Bad Request", "application/json; charset=utf-8", error_body
+                )
+            else:
+                try:
+                    applied, results = await state.link_matches_batch(batch_payload)
+                    linked_total = sum(result["status"] == "linked" for result in results)
+                    if applied:
+                        message = (
+                            f"{linked_total} enlace(s) aplicado(s) de {len(results)}; "
+                            "se guardan en segundo plano."
+                        )
+                        status_code, reason = 200, "OK"
+                    elif any(result["status"] == "invalid" for result in results):
+                        message = "Lote rechazado: hay enlaces inválidos."
+                        status_code, reason = 400, "Bad Request"
+                    else:
+                        message = "Lote rechazado: hay equipos con destinos distintos."
+                        status_code, reason = 409, "Conflict"
+                    response_body = json.dumps(
+                        {"ok": applied, "message": message, "results": results},
+                        ensure_ascii=False,
+                    ).encode("utf-8")
                     response = _http_response(
-                        400,
-                        "Bad Request",
+                        status_code,
+                        reason,
                         "application/json; charset=utf-8",
-                        b'{"message":"Payload invalido: se esperaba JSON (Content-Type: application/json)"}',
+                        response_body,
                     )
-                    writer.write(response)
-                    await writer.drain()
-                    writer.close()
-                    await writer.wait_closed()
-                    return
-
-                payload = LinkRequestPayload.model_validate_json(body)
-                changed, message = await state.link_matches(payload)
-                response_body = json.dumps(
-                    {
-                        "ok": changed,
-                        "message": message,
-                    },
-                    ensure_ascii=False,
-                ).encode("utf-8")
-                response = _http_response(
-                    200,
-                    "OK",
-                    "application/json; charset=utf-8",
-                    response_body,
-                )
-            except ValidationError:
-                response = _http_response(
-                    400,
-                    "Bad Request",
-                    "application/json; charset=utf-8",
-                    b'{"message":"Payload invalido"}',
-                )
-            except Exception as error:  # noqa: BLE001
-                logger.exception(f"Error guardando enlace manual: {error}")
+                except Exception as error:  # noqa: BLE001
+                    logger.exception(f"Error guardando lote de enlaces: {error}")
+                    response = _http_response(
+                        500,
+                        "Internal Server Error",
+                        "application/json; charset=utf-8",
+                        b'{"message":"No se pudo guardar el lote de enlaces"}',
+                    )
+        elif method == "POST" and path == "/api/link":
+            payload, error_body = parse_json_body(headers, body, LinkRequestPayload)
+            if payload is None:
                 response = _http_response(
-                    500,
-                    "Internal Server Error",
-                    "application/json; charset=utf-8",
-                    b'{"message":"No se pudo guardar el enlace"}',
+                    400, "Bad Request", "application/json; charset=utf-8", error_body
                 )
+            else:
+                try:
+                    changed, message = await state.link_matches(payload)
+                    response_body = json.dumps(
+                        {
+                            "ok": changed,
+                            "message": message,
+                        },
+                        ensure_ascii=False,
+                    ).encode("utf-8")
+                    response = _http_response(
+                        200,
+                        "OK",
+                        "application/json; charset=utf-8",
+                        response_body,
+                    )
+                except Exception as error:  # noqa: BLE001
+                    logger.exception(f"Error guardando enlace manual: {error}")
+                    response = _http_response(
+                        500,
+                        "Internal Server Error",
+                        "application/json; charset=utf-8",
+                        b'{"message":"No se pudo guardar el enlace"}',
+                    )
         else:
             response = _http_response(
                 404,
@@ -300,3 +777,20 @@ async def start_dashboard_server(
     )
     logger.info(f"Dashboard HTTP disponible en {build_dashboard_url(config)}")
     return server
+
+
+async def stop_dashboard_server(
+    server: asyncio.Server,
+    state: DashboardState,
+    timeout_seconds: float,
+) -> None:
+    """Cierra el servidor tras responder a los long-polls, con un plazo máximo."""
+    state.close()
+    server.close()
+    try:
+        await asyncio.wait_for(server.wait_closed(), timeout_seconds)
+    except TimeoutError:
+        logger.warning(
+            f"Cierre del dashboard superó {timeout_seconds:.0f}s; se cortan las conexiones."
+        )
+        server.close_clients()
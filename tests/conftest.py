@@ -0,0 +1,31 @@
+from pathlib import Path
+
+import pytest
+
+from src.engine.team_name_journal import TeamNameMappingsJournal
+from src.engine.team_name_normalizer import TeamNameNormalizer
+from src.ui.dashboard_server import DashboardState
+
+
+@pytest.fixture
+def mappings_journal(tmp_path: Path) -> TeamNameMappingsJournal:
+    return TeamNameMappingsJournal(
+        tmp_path / "team_name_mappings.json",
+        tmp_path / "team_name_mappings.journal",
+    )
+
+
+@pytest.fixture
+def team_name_normalizer(
+    tmp_path: Path, mappings_journal: TeamNameMappingsJournal
+) -> TeamNameNormalizer:
+    return TeamNameNormalizer(
+        mappings_journal.load(), tmp_path / "team_name_mappings.json", loader=mappings_journal.load
+    )
+
+
+@pytest.fixture
+def dashboard_state(
+    team_name_normalizer: TeamNameNormalizer, mappings_journal: TeamNameMappingsJournal
+) -> DashboardState:
+    return DashboardState(team_name_normalizer, mappings_journal)
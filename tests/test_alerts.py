@@ -0,0 +1,102 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from src.engine.alerts import AlertBus, AlertSink, FileAlertSink
+from src.models.alerts import Alert
+
+
+def build_alert(key: str, detected_perf_counter: float) -> Alert:
+    return Alert(
+        kind="arbitrage",
+        key=key,
+        message=f"Alerta {key}",
+        detected_perf_counter=detected_perf_counter,
+    )
+
+
+class RecordingSink(AlertSink):
+    name = "recording"
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    async def deliver(self, alert: Alert) -> None:
+        self.batches.append([alert.key])
+
+    async def deliver_batch(self, alerts: list[Alert]) -> None:
+        self.batches.append([alert.key for alert in alerts])
+
+
+async def drain(bus: AlertBus) -> None:
+    stop_event = asyncio.Event()
+    runner = asyncio.create_task(bus.run(stop_event))
+    await asyncio.gather(*(channel.queue.join() for channel in bus._channels))
+    stop_event.set()
+    await runner
+
+
+def test_same_key_is_suppressed_during_cooldown() -> None:
+    bus = AlertBus([], cooldown_seconds=30.0)
+
+    assert bus.publish(build_alert("a", 100.0))
+    assert not bus.publish(build_alert("a", 120.0))
+    assert bus.publish(build_alert("b", 120.0))
+    assert bus.publish(build_alert("a", 131.0))
+
+    assert (bus.published, bus.suppressed) == (3, 1)
+    assert [alert.key for alert in bus.recent] == ["a", "b", "a"]
+
+
+def test_full_queue_drops_oldest_alert() -> None:
+    sink = RecordingSink()
+    bus = AlertBus([sink], cooldown_seconds=0.0, queue_size=2)
+    for key in ("a", "b", "c"):
+        bus.publish(build_alert(key, time.perf_counter()))
+
+    asyncio.run(drain(bus))
+
+    assert sink.batches == [["b", "c"]]
+    assert bus.stats()["recording"]["dropped"] == 1
+    assert bus.stats()["recording"]["delivered"] == 2
+
+
+def test_queued_alerts_are_delivered_as_one_batch_with_latency() -> None:
+    sink = RecordingSink()
+    bus = AlertBus([sink], cooldown_seconds=0.0)
+    detected_at = time.perf_counter() - 0.5
+    for key in ("a", "b", "c"):
+        bus.publish(build_alert(key, detected_at))
+
+    asyncio.run(drain(bus))
+
+    assert sink.batches == [["a", "b", "c"]]
+    latency = bus.stats()["recording"]["latency"]
+    assert latency["count"] == 3
+    assert latency["max_ms"] >= 500
+
+
+def test_file_sink_writes_a_batch_as_json_lines(tmp_path: Path) -> None:
+    path = tmp_path / "alerts" / "alerts.jsonl"
+    sink = FileAlertSink(path)
+
+    asyncio.run(sink.deliver_batch([build_alert("a", 1.0), build_alert("b", 2.0)]))
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["key"] for line in lines] == ["a", "b"]
+    assert "detected_perf_counter" not in lines[0]
+
+
+def test_failed_batch_counts_every_alert() -> None:
+    class FailingSink(RecordingSink):
+        async def deliver_batch(self, alerts: list[Alert]) -> None:
+            raise ConnectionError("webhook caído")
+
+    bus = AlertBus([FailingSink()], cooldown_seconds=0.0)
+    for key in ("a", "b"):
+        bus.publish(build_alert(key, time.perf_counter()))
+
+    asyncio.run(drain(bus))
+
+    assert bus.stats()["recording"]["failed"] == 2
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import pytest
+
+from src.scrapers.bet365.feed import (
+    Bet365FeedParser,
+    parse_fractional_odds,
+    read_recorded_frames,
+)
+from src.scrapers.bet365.scraper import Bet365Scraper
+
+FEED_SAMPLE = (
+    Path(__file__).parents[1] / "src" / "scrapers" / "bet365" / "fixtures" / "feed_sample.jsonl"
+)
+SNAPSHOT = (
+    "OVInPlay_1_3\x01F|EV;IT=E1;NA=Real Madrid v Getafe;SS=1-0;TM=55;CT=LaLiga;"
+    "|EV;IT=E2;NA=Lyon v Nantes;SS=0-0;TM=12;CT=Ligue 1;|"
+)
+
+
+def replayed_parser() -> Bet365FeedParser:
+    parser = Bet365FeedParser()
+    for received_at_ms, payload in read_recorded_frames(FEED_SAMPLE):
+        parser.feed(payload, received_at_ms)
+    return parser
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("11/10", 2.1), ("1/4", 1.25), ("2.5", 2.5), ("1", None), ("0/0", None), ("", None)],
+)
+def test_parse_fractional_odds(value: str, expected: float | None) -> None:
+    assert parse_fractional_odds(value) == expected
+
+
+def test_replay_applies_updates_suspensions_and_deletes() -> None:
+    parser = replayed_parser()
+
+    [match] = parser.matches()
+
+    assert (match.home_team, match.away_team) == ("Real Madrid", "Getafe")
+    assert (match.score_home, match.score_away, match.minute) == (2, 0, 56)
+    assert match.competition == "LaLiga"
+    markets = {market.market: market.outcomes for market in match.markets}
+    assert markets["1x2"] == {"home": 1.25, "draw": 7.0}
+    assert markets["next_goal"] == pytest.approx({"home": 1.6667, "none": 6.0, "away": 3.75})
+
+
+def test_drain_changes_reports_each_change_once() -> None:
+    parser = Bet365FeedParser()
+    parser.feed(SNAPSHOT, 1000.0)
+
+    assert parser.drain_changes() == {"E1", "E2"}
+    assert parser.drain_changes() == set()
+
+    parser.feed("E2\x01D", 1100.0)
+    assert parser.drain_changes() == set()
+    assert parser.matches_event_ids() == ["E1"]
+
+
+def test_matches_carry_their_own_last_update_time() -> None:
+    parser = Bet365FeedParser()
+    parser.feed(SNAPSHOT, 1000.0)
+    parser.feed("E1\x01U|SS=2-0;", 2000.0)
+    parser.feed("__time\x01U|TI=3000;", 3000.0)
+
+    assert parser.last_frame_ms == 3000.0
+    assert parser.build_match("E1").observed_at_ms == 2000.0
+    assert parser.build_match("E2").observed_at_ms == 1000.0
+
+
+def test_scraper_stamps_quiet_events_with_feed_liveness() -> None:
+    scraper = Bet365Scraper(None, use_feed=True, feed_max_silence_ms=5000.0)
+    scraper._feed.feed(SNAPSHOT, 1000.0)
+    scraper._feed.feed("__time\x01U|TI=4000;", 4000.0)
+
+    assert scraper._feed_is_live(4500.0)
+    matches = scraper._collect_feed_matches(4500.0)
+    assert {match.observed_at_ms for match in matches} == {4000.0}
+    # Nunca en el futuro respecto al tick aunque el reloj de la trama vaya adelantado
+    assert {match.observed_at_ms for match in scraper._collect_feed_matches(3900.0)} == {3900.0}
+
+
+def test_scraper_falls_back_to_dom_when_feed_goes_silent() -> None:
+    scraper = Bet365Scraper(None, use_feed=True, feed_max_silence_ms=5000.0)
+    scraper._feed.feed(SNAPSHOT, 1000.0)
+
+    assert scraper._feed_is_live(6000.0)
+    assert not scraper._feed_is_live(6001.0)
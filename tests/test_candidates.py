@@ -0,0 +1,58 @@
+from src.engine.candidates import CandidateIndex, build_link_suggestions, competition_country_key
+from src.models.odds import MatchInfo
+
+
+def live_match(
+    home_team: str,
+    away_team: str,
+    minute: int | None = 30,
+    score: tuple[int, int] = (1, 0),
+    competition: str | None = "España - LaLiga",
+) -> MatchInfo:
+    return MatchInfo(
+        home_team=home_team,
+        away_team=away_team,
+        minute=minute,
+        score_home=score[0],
+        score_away=score[1],
+        competition=competition,
+    )
+
+
+WINAMAX_MATCH = live_match("Real Madrid", "Sevilla")
+BET365_MATCHES = [
+    live_match("Real Madrid", "Sevilla FC", minute=31, competition="Spain - La Liga"),
+    live_match("Getafe", "Celta"),
+    live_match("Real Madrid", "Sevilla", score=(0, 0)),
+    live_match("Real Madrid", "Sevilla", minute=33),
+]
+
+
+def test_competition_country_key_folds_first_segment() -> None:
+    assert competition_country_key("España - LaLiga") == "espana"
+    assert competition_country_key(None) == "*"
+
+
+def test_candidates_stay_in_score_and_minute_block() -> None:
+    candidates = CandidateIndex(BET365_MATCHES).candidates(WINAMAX_MATCH)
+
+    # Ni otro marcador (2) ni minuto fuera de ±2 (3); el país distinto entra por el comodín
+    assert [candidate.bet365_index for candidate in candidates] == [0, 1]
+    assert candidates[0].score > candidates[1].score
+
+
+def test_wildcard_block_only_completes_a_short_country_block() -> None:
+    # El bloque de su país ya llena top_k=1: no se mira el comodín
+    [best] = CandidateIndex(BET365_MATCHES).candidates(WINAMAX_MATCH, top_k=1)
+
+    assert best.bet365_index == 1
+
+
+def test_match_without_minute_only_pairs_with_matches_without_minute() -> None:
+    bet365_matches = [live_match("Real Madrid", "Sevilla", minute=None), *BET365_MATCHES]
+
+    [suggestions] = build_link_suggestions(
+        [live_match("Real Madrid", "Sevilla", minute=None)], bet365_matches
+    )
+
+    assert [candidate.bet365_index for candidate in suggestions] == [0]
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from src.core.checkpoint import (
+    BoardCheckpoint,
+    SnapshotCheckpoint,
+    parse_checkpoint,
+    serialize_checkpoint,
+)
+from src.models.odds import MarketOdds, MatchInfo
+
+
+def sample_match(home_team: str = "Real Madrid") -> MatchInfo:
+    return MatchInfo(
+        home_team=home_team,
+        away_team="Sevilla",
+        score_home=1,
+        minute=63,
+        markets=[MarketOdds(market="1x2", outcomes={"home": 1.45, "draw": 4.2})],
+        observed_at_ms=1000.0,
+    )
+
+
+def runtime(
+    name: str, matches: list[MatchInfo], ready: bool = True, stale: bool = False
+) -> SimpleNamespace:
+    return SimpleNamespace(name=name, last_matches=matches, ready=ready, stale=stale)
+
+
+def test_serialize_roundtrip_keeps_books_and_times() -> None:
+    checkpoint = BoardCheckpoint(
+        saved_at_by_book={"Winamax": 100.0, "Bet365": 50.0},
+        matches_by_book={"Winamax": [sample_match()], "Bet365": []},
+    )
+
+    restored = parse_checkpoint(serialize_checkpoint(checkpoint))
+
+    assert restored == checkpoint
+    assert restored.saved_at == 100.0
+
+
+def test_serialize_omits_default_fields() -> None:
+    checkpoint = BoardCheckpoint(
+        saved_at_by_book={"Winamax": 1.0},
+        matches_by_book={"Winamax": [MatchInfo(home_team="A", away_team="B")]},
+    )
+
+    payload = json.loads(serialize_checkpoint(checkpoint))
+
+    assert payload["books"]["Winamax"]["matches"] == [{"home_team": "A", "away_team": "B"}]
+
+
+def test_parse_rejects_corrupt_or_foreign_data() -> None:
+    assert parse_checkpoint(b"{not json") is None
+    assert parse_checkpoint(b'{"format": 1, "saved_at": 1, "books": {}}') is None
+    assert parse_checkpoint(b'{"format": 2, "books": {"Winamax": {"matches": []}}}') is None
+
+
+def test_save_and_load_restores_recent_books(tmp_path: Path) -> None:
+    path = tmp_path / "last_snapshot.json"
+    winamax_matches = [sample_match()]
+
+    saved = asyncio.run(
+        SnapshotCheckpoint(path).save(
+            [runtime("Winamax", winamax_matches), runtime("Bet365", [], ready=False)]
+        )
+    )
+    checkpoint = SnapshotCheckpoint(path).load()
+
+    assert saved
+    assert checkpoint.matches_by_book == {"Winamax": winamax_matches}
+
+
+def test_unchanged_lists_are_not_saved_again(tmp_path: Path) -> None:
+    checkpoint = SnapshotCheckpoint(tmp_path / "last_snapshot.json")
+    runtimes = [runtime("Winamax", [sample_match()])]
+
+    assert asyncio.run(checkpoint.save(runtimes))
+    assert not asyncio.run(checkpoint.save(runtimes))
+
+
+def test_unconfirmed_book_keeps_its_original_age(tmp_path: Path) -> None:
+    path = tmp_path / "last_snapshot.json"
+    old_saved_at = time.time() - 1700
+    path.write_bytes(
+        serialize_checkpoint(
+            BoardCheckpoint(
+                saved_at_by_book={"Winamax": old_saved_at, "Bet365": old_saved_at},
+                matches_by_book={"Winamax": [sample_match()], "Bet365": [sample_match("Inter")]},
+            )
+        )
+    )
+    checkpoint = SnapshotCheckpoint(path, max_age_seconds=1800.0)
+    restored = checkpoint.load()
+
+    # Winamax confirma en directo; Bet365 no llega a arrancar
+    asyncio.run(
+        checkpoint.save(
+            [
+                runtime("Winamax", [sample_match("Betis")]),
+                runtime("Bet365", restored.matches_by_book["Bet365"], ready=False, stale=True),
+            ]
+        )
+    )
+    saved = parse_checkpoint(path.read_bytes())
+
+    assert saved.saved_at_by_book["Bet365"] == old_saved_at
+    assert saved.saved_at_by_book["Winamax"] > old_saved_at
+    later = SnapshotCheckpoint(path, max_age_seconds=1000.0).load()
+    assert set(later.matches_by_book) == {"Winamax"}
+
+
+def test_load_ignores_missing_empty_and_expired_files(tmp_path: Path) -> None:
+    path = tmp_path / "last_snapshot.json"
+    assert SnapshotCheckpoint(path).load() is None
+
+    path.write_bytes(b"")
+    assert SnapshotCheckpoint(path).load() is None
+
+    path.write_bytes(
+        serialize_checkpoint(
+            BoardCheckpoint(
+                saved_at_by_book={"Winamax": time.time() - 3600},
+                matches_by_book={"Winamax": [sample_match()]},
+            )
+        )
+    )
+    assert SnapshotCheckpoint(path, max_age_seconds=1800.0).load() is None
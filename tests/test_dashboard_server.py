@@ -0,0 +1,163 @@
+import asyncio
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from src.ui.dashboard_server import (
+    DashboardAssets,
+    DashboardServerConfig,
+    DashboardState,
+    is_foreign_origin,
+    start_dashboard_server,
+    stop_dashboard_server,
+)
+
+DASHBOARD_CONFIG = DashboardServerConfig(
+    host="127.0.0.1",
+    port=8765,
+    refresh_seconds=5,
+    scrape_interval_seconds=1.0,
+    template_path=Path("dashboard.html"),
+    css_path=Path("dashboard.css"),
+    js_path=Path("dashboard.js"),
+)
+
+
+def link_item(winamax: tuple[str, str], bet365: tuple[str, str]) -> dict[str, object]:
+    return {
+        "winamax_match": {"home_team": winamax[0], "away_team": winamax[1]},
+        "bet365_match": {"home_team": bet365[0], "away_team": bet365[1]},
+    }
+
+
+async def send_request(
+    port: int, method: str, path: str, headers: dict[str, str], body: bytes = b""
+) -> tuple[int, dict[str, object]]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    header_lines = "".join(
+        f"{name}: {value}\r\n"
+        for name, value in {**headers, "Content-Length": str(len(body))}.items()
+    )
+    writer.write(f"{method} {path} HTTP/1.1\r\n{header_lines}\r\n".encode() + body)
+    response = await reader.read()
+    writer.close()
+    head, _, response_body = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ")[1]), json.loads(response_body)
+
+
+async def send_requests(
+    state: DashboardState, requests: list[tuple[str, str, dict[str, str], bytes]]
+) -> list[tuple[int, dict[str, object]]]:
+    """Levanta el servidor en un puerto libre y envía las peticiones una tras otra."""
+    server = await start_dashboard_server(
+        state, replace(DASHBOARD_CONFIG, port=0), DashboardAssets(template="", css="", js="")
+    )
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return [await send_request(port, *request) for request in requests]
+    finally:
+        await stop_dashboard_server(server, state, 1.0)
+
+
+@pytest.mark.parametrize(
+    ("origin", "foreign"),
+    [
+        (None, False),
+        ("http://127.0.0.1:8765", False),
+        ("http://localhost:8765", False),
+        ("http://127.0.0.1:9000", True),
+        ("https://127.0.0.1:8765", True),
+        ("http://evil.example", True),
+        ("null", True),
+    ],
+)
+def test_foreign_origin_detection(origin: str | None, foreign: bool) -> None:
+    assert is_foreign_origin(origin, DASHBOARD_CONFIG) is foreign
+
+
+def test_profile_rejects_foreign_origin_and_form_posts(dashboard_state: DashboardState) -> None:
+    captures: list[float] = []
+
+    async def capture(seconds: float) -> dict[str, object]:
+        captures.append(seconds)
+        return {"seconds": seconds}
+
+    dashboard_state.set_profile_provider(capture)
+
+    foreign, form_post, accepted = asyncio.run(
+        send_requests(
+            dashboard_state,
+            [
+                (
+                    "POST",
+                    "/api/profile?seconds=2",
+                    {"Origin": "http://evil.example", "Content-Type": "application/json"},
+                    b"",
+                ),
+                (
+                    "POST",
+                    "/api/profile?seconds=2",
+                    {"Content-Type": "application/x-www-form-urlencoded"},
+                    b"",
+                ),
+                ("POST", "/api/profile?seconds=2", {"Content-Type": "application/json"}, b""),
+            ],
+        )
+    )
+
+    assert foreign[0] == 403
+    assert form_post[0] == 400
+    assert accepted == (200, {"seconds": 2.0})
+    assert captures == [2.0]
+
+
+def test_batch_reports_invalid_items_and_applies_nothing(
+    dashboard_state: DashboardState,
+) -> None:
+    applied: list[object] = []
+    dashboard_state.add_link_listener(applied.append)
+    items = [
+        link_item(("Madrid", "Sevilla"), ("Real Madrid", "Sevilla FC")),
+        {"winamax_match": {"home_team": "Celta"}},
+    ]
+
+    ((status_code, payload),) = asyncio.run(
+        send_requests(
+            dashboard_state,
+            [
+                (
+                    "POST",
+                    "/api/link/batch",
+                    {"Content-Type": "application/json"},
+                    json.dumps({"items": items}).encode(),
+                )
+            ],
+        )
+    )
+
+    assert status_code == 400
+    assert [result["status"] for result in payload["results"]] == ["skipped", "invalid"]
+    assert applied == []
+
+
+def test_link_endpoints_share_the_json_checks(dashboard_state: DashboardState) -> None:
+    item = json.dumps(link_item(("Madrid", "Sevilla"), ("Real Madrid", "Sevilla FC"))).encode()
+
+    text_post, broken_json, linked = asyncio.run(
+        send_requests(
+            dashboard_state,
+            [
+                ("POST", "/api/link", {"Content-Type": "text/plain"}, item),
+                ("POST", "/api/link/batch", {"Content-Type": "application/json"}, b"{"),
+                ("POST", "/api/link", {"Content-Type": "application/json"}, item),
+            ],
+        )
+    )
+
+    assert text_post[0] == 400
+    assert "Content-Type" in text_post[1]["message"]
+    assert broken_json == (400, {"message": "Payload invalido"})
+    assert linked[0] == 200
+    assert linked[1]["ok"] is True
@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+from src.ui.dashboard_server import DASHBOARD_BOOT_ID, DashboardState
+
+
+def publish_versions(state: DashboardState, versions: int) -> DashboardState:
+    for _ in range(versions):
+        state.publish("<body>__DASHBOARD_BOOT_ID__</body>", {"linked_total": 0})
+    return state
+
+
+def test_snapshot_carries_boot_id(dashboard_state: DashboardState) -> None:
+    snapshot = publish_versions(dashboard_state, 1).snapshot
+
+    assert json.loads(snapshot.state_json)["boot_id"] == DASHBOARD_BOOT_ID
+    assert json.loads(snapshot.suggestions_json)["boot_id"] == DASHBOARD_BOOT_ID
+    assert snapshot.body_for("all") == f"<body>{DASHBOARD_BOOT_ID}</body>".encode()
+
+
+def test_version_from_previous_boot_returns_immediately(dashboard_state: DashboardState) -> None:
+    state = publish_versions(dashboard_state, 2)
+
+    snapshot = asyncio.run(asyncio.wait_for(state.wait_for_version(500, 30.0), timeout=1.0))
+
+    assert snapshot.version == 2
+
+
+def test_current_version_waits_for_next_publish(dashboard_state: DashboardState) -> None:
+    async def scenario() -> int:
+        state = publish_versions(dashboard_state, 2)
+        waiter = asyncio.create_task(state.wait_for_version(2, 5.0))
+        await asyncio.sleep(0)
+        state.publish("", {})
+        return (await asyncio.wait_for(waiter, timeout=1.0)).version
+
+    assert asyncio.run(scenario()) == 3
+
+
+def test_alerts_from_previous_boot_return_immediately(dashboard_state: DashboardState) -> None:
+    state = dashboard_state
+    state.push_alert({"kind": "arbitrage"})
+
+    payload = asyncio.run(asyncio.wait_for(state.wait_for_alerts(80, 30.0), timeout=1.0))
+
+    assert json.loads(payload)["version"] == 1
+
+
+def test_close_wakes_pending_long_polls(dashboard_state: DashboardState) -> None:
+    async def scenario() -> tuple[int, bytes]:
+        state = publish_versions(dashboard_state, 1)
+        state_waiter = asyncio.create_task(state.wait_for_version(1, 30.0))
+        alerts_waiter = asyncio.create_task(state.wait_for_alerts(0, 30.0))
+        await asyncio.sleep(0)
+        state.close()
+        snapshot, alerts = await asyncio.wait_for(
+            asyncio.gather(state_waiter, alerts_waiter), timeout=1.0
+        )
+        # Los long-polls que llegan ya cerrado tampoco esperan
+        await asyncio.wait_for(state.wait_for_version(1, 30.0), timeout=1.0)
+        return snapshot.version, alerts
+
+    version, alerts = asyncio.run(scenario())
+
+    assert version == 1
+    assert json.loads(alerts)["version"] == 0
@@ -0,0 +1,59 @@
+from src.core.metrics import FreshnessTracker
+from src.engine.discrepancies import filter_fresh_pairs
+from src.models.odds import MatchInfo
+
+
+def stamped(observed_at_ms: float | None, received_at_ms: float | None = None) -> MatchInfo:
+    return MatchInfo(
+        home_team="Real Madrid",
+        away_team="Sevilla",
+        observed_at_ms=observed_at_ms,
+        received_at_ms=received_at_ms,
+    )
+
+
+def test_fresh_pairs_drop_old_or_unstamped_records() -> None:
+    fresh = (stamped(9500.0), stamped(9000.0))
+    old_bet365 = (stamped(9500.0), stamped(7999.0))
+    unstamped_winamax = (stamped(None), stamped(9500.0))
+    received_only = (stamped(None, received_at_ms=9800.0), stamped(9500.0))
+
+    pairs = [fresh, old_bet365, unstamped_winamax, received_only]
+
+    assert filter_fresh_pairs(pairs, 2000.0, now_ms=10000.0) == [fresh, received_only]
+
+
+def test_fresh_pairs_without_threshold_keep_everything() -> None:
+    pairs = [(stamped(None), stamped(0.0))]
+
+    assert filter_fresh_pairs(pairs, None, now_ms=10000.0) is pairs
+
+
+def test_tracker_measures_ingest_and_age_per_book() -> None:
+    tracker = FreshnessTracker()
+
+    tracker.observe_matches(
+        "winamax", [stamped(9000.0, received_at_ms=9040.0), stamped(None)], now_ms=10000.0
+    )
+    tracker.observe_matches("bet365", [stamped(9800.0)], now_ms=10000.0)
+
+    snapshot = tracker.snapshot()
+    # El partido sin marca no cuenta en ninguna métrica; sin `received_at_ms` no hay ingesta
+    assert snapshot["ingest"]["winamax"]["count"] == 1
+    assert snapshot["ingest"]["winamax"]["max_ms"] == 40.0
+    assert snapshot["ingest"]["bet365"]["count"] == 0
+    assert snapshot["age"]["winamax"]["max_ms"] == 1000.0
+    assert snapshot["age"]["bet365"]["max_ms"] == 200.0
+
+
+def test_tracker_records_absolute_cross_book_skew() -> None:
+    tracker = FreshnessTracker()
+
+    tracker.observe_skew(-300.0)
+    tracker.observe_skew(120.0)
+
+    skew = tracker.snapshot()["cross_book_skew"]
+    assert skew["count"] == 2
+    assert skew["max_ms"] == 300.0
+    assert skew["buckets_ms"]["le_250"] == 1
+    assert skew["buckets_ms"]["le_500"] == 1
@@ -0,0 +1,82 @@
+from src.engine.line_movement import LineMovementDetector, OddsRing
+from src.models.odds import MarketOdds, MatchInfo
+
+
+def test_ring_only_records_changes_and_reports_window_delta() -> None:
+    ring = OddsRing(capacity=8, window_seconds=10.0)
+
+    assert ring.push(0.0, 2.0) is None
+    assert ring.push(2.0, 2.0) is None
+    ring.push(5.0, 2.2)
+
+    stats = ring.stats(5.0)
+    assert stats.window_start_price == 2.0
+    assert round(stats.delta, 4) == 0.2
+    assert round(stats.velocity, 4) == 0.04
+    # Pasada la ventana, el inicio es la cuota vigente entonces
+    assert ring.stats(16.0).window_start_price == 2.2
+    assert ring.stats(16.0).delta == 0.0
+
+
+def test_ring_reports_suspend_and_resume_transitions() -> None:
+    ring = OddsRing(capacity=8, window_seconds=10.0)
+
+    assert ring.push(0.0, 2.0) is None
+    assert ring.push(1.0, None) == "suspend"
+    assert ring.push(2.0, None) is None
+    assert ring.stats(2.0).suspended
+    assert ring.stats(2.0).suspended_since == 1.0
+    assert ring.push(3.0, 2.1) == "resume"
+    assert not ring.stats(3.0).suspended
+
+
+def test_ring_overwriting_window_start_moves_it_to_oldest_sample() -> None:
+    ring = OddsRing(capacity=2, window_seconds=10.0)
+    for timestamp, price in ((0.0, 1.0), (1.0, 1.1), (2.0, 1.2)):
+        ring.push(timestamp, price)
+
+    assert ring.stats(2.0).window_start_price == 1.1
+
+
+def pair(winamax_home: float | None, bet365_home: float | None) -> tuple[MatchInfo, MatchInfo]:
+    def match(price: float | None) -> MatchInfo:
+        outcomes = {} if price is None else {"home": price}
+        return MatchInfo(
+            home_team="Real Madrid",
+            away_team="Sevilla",
+            markets=[MarketOdds(market="1x2", outcomes=outcomes)],
+        )
+
+    return match(winamax_home), match(bet365_home)
+
+
+def test_detector_alerts_when_one_book_moves_and_the_other_lags() -> None:
+    detector = LineMovementDetector(window_seconds=10.0, move_threshold=0.05)
+
+    assert detector.observe([pair(2.0, 2.0)], now=0.0) == []
+    [alert] = detector.observe([pair(2.0, 2.2)], now=1.0)
+
+    assert alert.kind == "line_movement"
+    assert alert.details["mover"] == "bet365"
+    assert alert.details["mover_from"] == 2.0
+    assert alert.details["laggard_price"] == 2.0
+
+
+def test_detector_alerts_when_one_book_suspends_and_the_other_keeps_offering() -> None:
+    detector = LineMovementDetector()
+
+    detector.observe([pair(2.0, 2.0)], now=0.0)
+    [alert] = detector.observe([pair(2.0, None)], now=1.0)
+
+    assert alert.kind == "suspension_lag"
+    assert alert.details["mover"] == "bet365"
+    assert detector.observe([pair(2.0, None)], now=2.0) == []
+
+
+def test_retain_forgets_unlinked_matches() -> None:
+    detector = LineMovementDetector()
+    detector.observe([pair(2.0, 2.0)], now=0.0)
+
+    detector.retain([])
+
+    assert detector._rings == {}
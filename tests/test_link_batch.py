@@ -0,0 +1,69 @@
+import pytest
+from pydantic import ValidationError
+
+from src.ui.dashboard_server import (
+    LINK_BATCH_MAX_ITEMS,
+    LinkBatchRequestPayload,
+    LinkRequestPayload,
+    find_batch_conflicts,
+    validate_batch_items,
+)
+
+
+def link(winamax: tuple[str, str], bet365: tuple[str, str]) -> LinkRequestPayload:
+    return LinkRequestPayload.model_validate(
+        {
+            "winamax_match": {"home_team": winamax[0], "away_team": winamax[1]},
+            "bet365_match": {"home_team": bet365[0], "away_team": bet365[1]},
+        }
+    )
+
+
+def test_batch_without_contradictions_has_no_conflicts() -> None:
+    items = [
+        link(("Madrid", "Sevilla"), ("Real Madrid", "Sevilla FC")),
+        # Repetir el mismo destino no es un conflicto
+        link(("Madrid", "Getafe"), ("Real Madrid", "Getafe CF")),
+    ]
+
+    assert find_batch_conflicts(items) == set()
+
+
+def test_batch_flags_every_item_mapping_a_team_to_different_targets() -> None:
+    items = [
+        link(("Madrid", "Sevilla"), ("Real Madrid", "Sevilla FC")),
+        link(("Celta", "Getafe"), ("Celta Vigo", "Getafe CF")),
+        link(("MADRID", "Betis"), ("Atlético Madrid", "Real Betis")),
+    ]
+
+    assert find_batch_conflicts(items) == {0, 2}
+
+
+def test_batch_payload_limits_item_count() -> None:
+    item = {
+        "winamax_match": {"home_team": "Madrid", "away_team": "Sevilla"},
+        "bet365_match": {"home_team": "Real Madrid", "away_team": "Sevilla FC"},
+    }
+
+    with pytest.raises(ValidationError):
+        LinkBatchRequestPayload.model_validate({"items": []})
+    with pytest.raises(ValidationError):
+        LinkBatchRequestPayload.model_validate({"items": [item] * (LINK_BATCH_MAX_ITEMS + 1)})
+
+
+def test_batch_items_are_validated_one_by_one() -> None:
+    valid_item = {
+        "winamax_match": {"home_team": "Madrid", "away_team": "Sevilla"},
+        "bet365_match": {"home_team": "Real Madrid", "away_team": "Sevilla FC"},
+    }
+    missing_away = {
+        "winamax_match": {"home_team": "Celta"},
+        "bet365_match": {"home_team": "Celta Vigo", "away_team": "Getafe CF"},
+    }
+
+    items, errors = validate_batch_items([valid_item, missing_away, "Madrid"])
+
+    assert [item.winamax_match.home_team for item in items] == ["Madrid"]
+    assert set(errors) == {1, 2}
+    assert "winamax_match.away_team" in errors[1]
+    assert "(elemento)" in errors[2]
@@ -0,0 +1,27 @@
+import json
+
+import pytest
+
+from src.core.logger import setup_logger, shutdown_logger
+
+
+def test_structured_log_keeps_the_exception_for_the_writer_thread(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    log = setup_logger("INFO", structured=True)
+    try:
+        try:
+            raise ValueError("cuota rota")
+        except ValueError:
+            log.exception("Fallo al extraer", extra={"bookmaker": "Bet365"})
+        shutdown_logger()
+    finally:
+        # El logger global vuelve a escribir en la consola real, no en la de captura
+        with capsys.disabled():
+            setup_logger("INFO")
+
+    record = json.loads(capsys.readouterr().err)
+
+    assert record["message"] == "Fallo al extraer"
+    assert record["bookmaker"] == "Bet365"
+    assert "ValueError: cuota rota" in record["exception"]
@@ -0,0 +1,161 @@
+import asyncio
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+from src.core.match_board import CoalescingRenderer, LiveMatchBoard, build_board_content
+from src.engine.team_name_normalizer import TeamNameNormalizer
+from src.models.alerts import Alert
+from src.models.odds import MarketOdds, MatchInfo
+from src.ui.dashboard_renderer import DashboardContent
+from src.ui.dashboard_server import DashboardAssets, DashboardServerConfig, DashboardState
+
+DASHBOARD_CONFIG = DashboardServerConfig(
+    host="127.0.0.1",
+    port=0,
+    refresh_seconds=5,
+    scrape_interval_seconds=1.0,
+    template_path=Path("dashboard.html"),
+    css_path=Path("dashboard.css"),
+    js_path=Path("dashboard.js"),
+)
+
+DASHBOARD_ASSETS = DashboardAssets(template="{last_update}", css="", js="")
+
+
+class RecordingBus:
+    def __init__(self) -> None:
+        self.alerts: list[Alert] = []
+
+    def publish(self, alert: Alert) -> None:
+        self.alerts.append(alert)
+
+
+def build_board(
+    team_name_normalizer: TeamNameNormalizer,
+    dashboard_state: DashboardState,
+    alert_bus: RecordingBus,
+) -> LiveMatchBoard:
+    return LiveMatchBoard(
+        team_name_normalizer,
+        dashboard_state,
+        DASHBOARD_ASSETS,
+        DASHBOARD_CONFIG,
+        alert_bus=alert_bus,
+    )
+
+
+def match_with_odds(home: float, draw: float, away: float) -> MatchInfo:
+    return MatchInfo(
+        home_team="Real Madrid",
+        away_team="Sevilla",
+        markets=[MarketOdds(market="1x2", outcomes={"home": home, "draw": draw, "away": away})],
+    )
+
+
+def fixture(competition: str, home: float) -> MatchInfo:
+    return match_with_odds(home, 3.2, 2.6).model_copy(update={"competition": competition})
+
+
+def test_same_named_fixtures_keep_separate_rows(
+    team_name_normalizer: TeamNameNormalizer,
+    dashboard_state: DashboardState,
+) -> None:
+    alert_bus = RecordingBus()
+    board = build_board(team_name_normalizer, dashboard_state, alert_bus)
+
+    # Mismos equipos en dos competiciones: con una sola fila, la cuota de Winamax
+    # saltaría de 2.0 a 3.0 en cada tick y parecería un movimiento de línea
+    for _ in range(3):
+        board.update(
+            [fixture("LaLiga", 2.0), fixture("Copa", 3.0)],
+            [fixture("LaLiga", 2.0), fixture("Copa", 2.0)],
+        )
+
+    assert len(board.odds_matrix) == 2
+    assert alert_bus.alerts == []
+
+
+def test_live_book_keeps_feeding_the_matrix_while_the_other_is_restored(
+    team_name_normalizer: TeamNameNormalizer,
+    dashboard_state: DashboardState,
+) -> None:
+    alert_bus = RecordingBus()
+    board = build_board(team_name_normalizer, dashboard_state, alert_bus)
+
+    board.update(
+        [match_with_odds(3.0, 1.5, 1.5)],
+        [match_with_odds(1.5, 4.0, 4.0)],
+        stale_books=["Bet365"],
+    )
+
+    # Solo las cuotas de Winamax entran en la matriz y no se compara entre casas
+    (opportunity,) = board.odds_matrix.evaluate(-1.0)
+    assert set(opportunity.bookmaker_overround) == {"winamax"}
+    assert alert_bus.alerts == []
+
+    board.update([match_with_odds(3.0, 1.5, 1.5)], [match_with_odds(1.5, 4.0, 4.0)])
+
+    assert [alert.kind for alert in alert_bus.alerts] == ["arbitrage"]
+
+
+class SlowContent:
+    """Contenidos etiquetados cuyo primer render espera a que el test lo suelte."""
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.built: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def builder(self, label: str) -> Callable[[], DashboardContent]:
+        def build() -> DashboardContent:
+            with self._lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.started.set()
+            self.release.wait(timeout=5)
+            with self._lock:
+                self.in_flight -= 1
+            self.built.append(label)
+            return build_board_content([], [], [], [], 0, 0, label)
+
+        return build
+
+
+def test_renderer_renders_only_the_latest_content_submitted_during_a_slow_render(
+    dashboard_state: DashboardState,
+) -> None:
+    renderer = CoalescingRenderer(dashboard_state, DASHBOARD_ASSETS, DASHBOARD_CONFIG)
+    contents = SlowContent()
+
+    async def submit_during_render() -> dict[str, object]:
+        renderer.submit(contents.builder("tick-1"))
+        await asyncio.to_thread(contents.started.wait, 5)
+        for label in ("tick-2", "tick-3", "tick-4"):
+            renderer.submit(contents.builder(label))
+        busy_metrics = renderer.snapshot()
+        contents.release.set()
+        while dashboard_state.snapshot.version < 2:
+            await dashboard_state.wait_for_version(dashboard_state.snapshot.version, 5)
+        return busy_metrics
+
+    busy_metrics = asyncio.run(submit_during_render())
+
+    # Un render en curso más uno pendiente: tick-2 y tick-3 se descartan sin renderizar
+    assert busy_metrics["queue_depth"] == 2
+    assert busy_metrics["rendering"] is True
+    assert contents.built == ["tick-1", "tick-4"]
+    assert contents.max_in_flight == 1
+    assert renderer.snapshot() == {
+        "queue_depth": 0,
+        "rendering": False,
+        "submitted": 4,
+        "rendered": 2,
+        "dropped": 2,
+        "failed": 0,
+    }
+    assert dashboard_state.snapshot.version == 2
+    assert dashboard_state.snapshot.body_for("all") == b"tick-4"
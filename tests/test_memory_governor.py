@@ -0,0 +1,71 @@
+import asyncio
+
+from src.core.memory import MemoryGovernor, MemorySample
+
+
+class FakeRuntime:
+    name = "Bet365"
+    ready = True
+    process_pids = [1]
+
+    def __init__(self) -> None:
+        self.recycles = 0
+
+    async def recycle(self) -> bool:
+        self.recycles += 1
+        return True
+
+
+def governor_with_rss(rss_values: list[int], **options: float) -> MemoryGovernor:
+    governor = MemoryGovernor(browser_rss_limit_bytes=100, sample_seconds=0.0, **options)
+    readings = iter(rss_values)
+
+    def fake_sample(process_pids: dict[str, list[int]]) -> MemorySample:
+        return MemorySample(
+            taken_at=0.0,
+            python_rss_bytes=None,
+            python_traced_bytes=None,
+            browser_rss_bytes=dict.fromkeys(process_pids, next(readings)),
+            browser_processes=dict.fromkeys(process_pids, 1),
+            gc_objects=0,
+        )
+
+    governor.sample = fake_sample
+    return governor
+
+
+async def run_ticks(governor: MemoryGovernor, runtime: FakeRuntime, ticks: int) -> list[int]:
+    """Recicla tras cada tick lo que toque y devuelve el total acumulado por tick."""
+    recycles: list[int] = []
+    for _ in range(ticks):
+        await governor.tick([runtime])
+        await asyncio.gather(*governor._recycle_tasks.values())
+        recycles.append(runtime.recycles)
+    return recycles
+
+
+def test_rss_trigger_rearms_only_after_dropping_below_limit() -> None:
+    runtime = FakeRuntime()
+    governor = governor_with_rss([200, 200, 200, 50, 200], min_recycle_interval_seconds=0.0)
+
+    recycles = asyncio.run(run_ticks(governor, runtime, 5))
+
+    assert recycles == [1, 1, 1, 1, 2]
+
+
+def test_rss_trigger_state_is_reported() -> None:
+    runtime = FakeRuntime()
+    governor = governor_with_rss([200, 200], min_recycle_interval_seconds=0.0)
+
+    asyncio.run(run_ticks(governor, runtime, 2))
+
+    assert governor.snapshot()["browsers"]["Bet365"]["rss_trigger_armed"] is False
+
+
+def test_minimum_interval_between_recycles() -> None:
+    runtime = FakeRuntime()
+    governor = governor_with_rss([200, 50, 200, 200], min_recycle_interval_seconds=3600.0)
+
+    recycles = asyncio.run(run_ticks(governor, runtime, 4))
+
+    assert recycles == [1, 1, 1, 1]
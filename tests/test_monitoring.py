@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+import pytest
+
+import src.scrapers.bet365
+from src.core import monitoring
+from src.core.monitoring import ScraperRuntime, attach_scraper, start_bet365_scraper
+from src.models.odds import MatchInfo
+
+
+class FakeBrowser:
+    def __init__(self) -> None:
+        self.stopped = False
+
+    async def stop(self) -> None:
+        self.stopped = True
+
+
+class SlowScraper:
+    """Scraper cuyo arranque no termina nunca (Camoufox colgado al lanzar)."""
+
+    def __init__(self, browser: FakeBrowser, starting: asyncio.Event) -> None:
+        self.browser = browser
+        self.closed = False
+        self.starting = starting
+
+    async def start(self) -> bool:
+        self.starting.set()
+        await asyncio.Event().wait()
+        return True
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def test_cancelled_attach_closes_the_half_started_browser(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    browser = FakeBrowser()
+    scrapers: list[SlowScraper] = []
+    starting = asyncio.Event()
+
+    def build_scraper(browser: FakeBrowser, **options: object) -> SlowScraper:
+        scrapers.append(SlowScraper(browser, starting))
+        return scrapers[-1]
+
+    monkeypatch.setattr(monitoring, "build_browser_manager", lambda book: browser)
+    monkeypatch.setattr(monitoring, "BET365_MAX_SHARDS", 0)
+    monkeypatch.setattr(src.scrapers.bet365, "Bet365Scraper", build_scraper)
+    runtime = ScraperRuntime(name="Bet365")
+
+    async def cancel_during_start() -> None:
+        task = asyncio.create_task(attach_scraper(runtime, start_bet365_scraper))
+        await starting.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_during_start())
+
+    assert runtime.browser is None
+    assert scrapers[0].closed
+    assert browser.stopped
+
+
+def test_restored_matches_expire_unconfirmed() -> None:
+    runtime = ScraperRuntime(name="Winamax")
+    runtime.restore([MatchInfo(home_team="Real Madrid", away_team="Sevilla")], expires_at=100.0)
+
+    assert not runtime.expire_restored(now=99.0)
+    assert runtime.stale
+    assert runtime.expire_restored(now=100.0)
+    assert not runtime.stale
+    assert runtime.last_matches == []
+
+
+def test_failed_attach_expires_restored_matches_at_once() -> None:
+    runtime = ScraperRuntime(name="Bet365")
+    runtime.restore(
+        [MatchInfo(home_team="Real Madrid", away_team="Sevilla")],
+        expires_at=time.time() + 3600,
+    )
+
+    async def failed_start() -> None:
+        return None
+
+    assert not asyncio.run(attach_scraper(runtime, failed_start))
+    assert runtime.expire_restored()
+    assert runtime.last_matches == []
@@ -0,0 +1,89 @@
+import pytest
+
+from src.engine.odds_matrix import OddsMatrix, build_arbitrage_alerts
+from src.models.odds import MarketOdds
+
+MATCH_KEY = "Real Madrid vs Sevilla"
+
+
+def market_1x2(home: float, draw: float, away: float) -> MarketOdds:
+    return MarketOdds(market="1x2", outcomes={"home": home, "draw": draw, "away": away})
+
+
+def arbitrage_matrix() -> OddsMatrix:
+    matrix = OddsMatrix(capacity=2)
+    matrix.upsert(MATCH_KEY, "winamax", [market_1x2(2.5, 3.0, 2.5)])
+    matrix.upsert(MATCH_KEY, "bet365", [market_1x2(1.5, 4.5, 5.0)])
+    return matrix
+
+
+def test_evaluate_finds_cross_book_arbitrage() -> None:
+    [opportunity] = arbitrage_matrix().evaluate()
+
+    assert opportunity.match_key == MATCH_KEY
+    assert opportunity.market == "1x2"
+    assert opportunity.best_prices == {
+        "home": ("winamax", 2.5),
+        "draw": ("bet365", 4.5),
+        "away": ("bet365", 5.0),
+    }
+    assert opportunity.margin == pytest.approx(1 - (1 / 2.5 + 1 / 4.5 + 1 / 5.0))
+
+
+def test_upsert_with_no_markets_clears_previous_prices() -> None:
+    matrix = arbitrage_matrix()
+
+    matrix.upsert(MATCH_KEY, "bet365", [])
+
+    assert matrix.evaluate() == []
+
+
+def test_upsert_drops_markets_no_longer_quoted() -> None:
+    matrix = arbitrage_matrix()
+
+    matrix.upsert(
+        MATCH_KEY,
+        "bet365",
+        [MarketOdds(market="next_goal", outcomes={"home": 2.0, "none": 5.0, "away": 3.0})],
+    )
+
+    assert [opportunity.market for opportunity in matrix.evaluate()] == []
+
+
+def test_suspended_outcome_makes_market_incomplete() -> None:
+    matrix = OddsMatrix()
+    matrix.upsert(MATCH_KEY, "winamax", [market_1x2(3.0, 4.0, 1.0)])
+
+    assert matrix.evaluate(min_margin=-1.0) == []
+
+
+def test_evaluate_restricts_to_requested_keys() -> None:
+    matrix = arbitrage_matrix()
+
+    assert matrix.evaluate(match_keys=["otro partido"]) == []
+    assert len(matrix.evaluate(match_keys=[MATCH_KEY, MATCH_KEY])) == 1
+
+
+def test_rows_grow_and_are_reused_after_retain() -> None:
+    matrix = OddsMatrix(capacity=1)
+    for index in range(3):
+        matrix.upsert(f"partido {index}", "winamax", [market_1x2(2.0, 3.0, 4.0)])
+    assert len(matrix) == 3
+
+    matrix.retain(["partido 1"])
+
+    assert len(matrix) == 1
+    matrix.upsert("partido 3", "winamax", [market_1x2(2.0, 3.0, 4.0)])
+    assert len(matrix) == 2
+
+
+def test_alerts_use_the_label_and_keep_the_row_key() -> None:
+    matrix = OddsMatrix(capacity=2)
+    matrix.upsert("copa|Real Madrid|Sevilla", "winamax", [market_1x2(2.5, 3.0, 2.5)], MATCH_KEY)
+    matrix.upsert("copa|Real Madrid|Sevilla", "bet365", [market_1x2(1.5, 4.5, 5.0)], MATCH_KEY)
+
+    [alert] = build_arbitrage_alerts(matrix.evaluate())
+
+    assert alert.match_label == MATCH_KEY
+    assert alert.message.startswith(f"{MATCH_KEY} [1x2]")
+    assert alert.key.startswith("arbitrage:copa|Real Madrid|Sevilla:1x2:")
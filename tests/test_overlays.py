@@ -0,0 +1,80 @@
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+
+from src.scrapers.overlays import OVERLAY_BINDING, OverlayHandler, OverlayRegistry
+
+
+class FakeLocator:
+    def __init__(self) -> None:
+        self.clicks = 0
+
+    @property
+    def first(self) -> FakeLocator:
+        return self
+
+    async def click(self, **options: float) -> None:
+        self.clicks += 1
+
+
+class FakePage:
+    def __init__(self) -> None:
+        self.cookie_button = FakeLocator()
+        self.bindings: dict[str, Callable[..., Awaitable[None]]] = {}
+        self.init_scripts: list[str] = []
+        self.evaluated: list[str] = []
+
+    async def add_locator_handler(
+        self, locator: FakeLocator, handler: object, **options: object
+    ) -> None:
+        return None
+
+    async def expose_binding(self, name: str, callback: Callable[..., Awaitable[None]]) -> None:
+        self.bindings[name] = callback
+
+    async def add_init_script(self, script: str) -> None:
+        self.init_scripts.append(script)
+
+    async def evaluate(self, script: str) -> None:
+        self.evaluated.append(script)
+
+
+def cookie_registry() -> OverlayRegistry:
+    return OverlayRegistry(
+        "Bet365",
+        [
+            OverlayHandler(
+                name="cookies",
+                locator=lambda page: page.cookie_button,
+                selector="button",
+                text="aceptar todo",
+            )
+        ],
+    )
+
+
+def test_install_injects_observer_for_future_and_current_documents() -> None:
+    page = FakePage()
+
+    asyncio.run(cookie_registry().install(page))
+
+    [script] = page.init_scripts
+    assert page.evaluated == [script]
+    specs = [{"name": "cookies", "selector": "button", "text": "aceptar todo"}]
+    assert script.endswith(f"({json.dumps(specs)})")
+    assert OVERLAY_BINDING in page.bindings
+
+
+def test_observer_report_dismisses_and_counts_overlay() -> None:
+    page = FakePage()
+    registry = cookie_registry()
+
+    async def scenario() -> None:
+        await registry.install(page)
+        await page.bindings[OVERLAY_BINDING]({"page": page}, "cookies")
+        await page.bindings[OVERLAY_BINDING]({"page": page}, "desconocido")
+
+    asyncio.run(scenario())
+
+    assert page.cookie_button.clicks == 1
+    assert registry.counters == {"cookies": 1}
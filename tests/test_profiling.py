@@ -0,0 +1,30 @@
+import asyncio
+import math
+from pathlib import Path
+
+import pytest
+
+from src.core.metrics import StageTimer
+from src.core.profiling import ProfileCapture, parse_profile_seconds
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [("", 10.0), ("5", 5.0), ("0.5", 0.5), ("0", None), ("-3", None), ("abc", None)],
+)
+def test_parse_profile_seconds(text: str, expected: float | None) -> None:
+    assert parse_profile_seconds(text) == expected
+
+
+@pytest.mark.parametrize("text", ["nan", "inf", "-inf"])
+def test_parse_profile_seconds_rejects_non_finite(text: str) -> None:
+    assert parse_profile_seconds(text) is None
+
+
+def test_capture_rejects_nan_without_locking(tmp_path: Path) -> None:
+    capture = ProfileCapture(StageTimer(), tmp_path)
+
+    with pytest.raises(ValueError, match="no válida"):
+        asyncio.run(capture.capture(math.nan))
+
+    assert not capture.running
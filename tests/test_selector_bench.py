@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.models.odds import MatchInfo
+from src.scrapers.selector_bench import (
+    SCRAPERS_DIR,
+    compare_with_golden,
+    golden_payload,
+    load_selector_fixture,
+    parse_slate_sizes,
+)
+
+
+def live_match(home_team: str, away_team: str, **fields: object) -> MatchInfo:
+    return MatchInfo(home_team=home_team, away_team=away_team, **fields)
+
+
+@pytest.mark.parametrize("book", ["winamax", "bet365"])
+def test_sample_fixtures_load_with_their_golden(book: str) -> None:
+    fixture = load_selector_fixture(SCRAPERS_DIR / book / "fixtures" / "selector_sample")
+
+    assert fixture.book == book
+    assert "<html" in fixture.html.lower()
+    assert fixture.golden
+    assert (fixture.preloaded_state is not None) is (book == "winamax")
+
+
+def test_fixture_without_state_or_golden(tmp_path: Path) -> None:
+    (tmp_path / "fixture.json").write_text(json.dumps({"book": "bet365"}), encoding="utf-8")
+    (tmp_path / "page.html").write_text("<html></html>", encoding="utf-8")
+
+    fixture = load_selector_fixture(tmp_path)
+
+    assert fixture.preloaded_state is None
+    assert fixture.golden is None
+    assert fixture.golden_path == tmp_path / "golden.json"
+
+
+def test_golden_comparison_ignores_timestamps() -> None:
+    golden = [live_match("Real Madrid", "Sevilla", minute=63)]
+    actual = [live_match("Real Madrid", "Sevilla", minute=63, observed_at_ms=1.0)]
+
+    assert compare_with_golden(actual, golden) == []
+    assert "observed_at_ms" not in golden_payload(actual)[0]
+
+
+def test_golden_comparison_reports_missing_extra_changed_and_duplicated() -> None:
+    golden = [live_match("Real Madrid", "Sevilla", minute=63), live_match("Getafe", "Celta")]
+    actual = [
+        live_match("Real Madrid", "Sevilla", minute=64),
+        live_match("Betis", "Osasuna"),
+        live_match("Betis", "Osasuna"),
+    ]
+
+    assert compare_with_golden(actual, golden) == [
+        "Real Madrid vs Sevilla: minute = 64, esperado 63",
+        "falta Getafe vs Celta",
+        "sobra Betis vs Osasuna",
+        "1 partidos duplicados en la salida",
+    ]
+
+
+def test_parse_slate_sizes_sorts_dedups_and_drops_non_positive() -> None:
+    assert parse_slate_sizes("50,1, 10,,1,0") == [1, 10, 50]
+
+
+def test_parse_slate_sizes_rejects_non_numbers() -> None:
+    with pytest.raises(ValueError, match="invalid literal"):
+        parse_slate_sizes("1,diez")
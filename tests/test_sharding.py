@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from src.scrapers.bet365.sharded import SHARD_MAX_FAILURES, Bet365ShardedScraper, _ShardTab
+from src.scrapers.sharding import ShardPlanner
+
+
+def test_shard_count_grows_with_fixtures_up_to_max_shards() -> None:
+    planner = ShardPlanner(max_fixtures_per_shard=10, max_shards=3)
+
+    assert planner.shard_count(0) == 1
+    assert planner.shard_count(10) == 1
+    assert planner.shard_count(11) == 2
+    assert planner.shard_count(500) == 3
+
+
+def test_plan_balances_largest_competitions_first() -> None:
+    planner = ShardPlanner(max_fixtures_per_shard=10, max_shards=2)
+
+    plan = planner.plan({"A": 8, "B": 6, "C": 4, "D": 2, "Vacía": 0})
+
+    assert sorted(plan.loads) == [10, 10]
+    assert plan.shard_of("A") != plan.shard_of("B")
+    assert plan.shard_of("Vacía") is None
+
+
+def test_plan_keeps_competitions_in_their_previous_shard() -> None:
+    planner = ShardPlanner(max_fixtures_per_shard=10, max_shards=2)
+    previous = planner.plan({"A": 8, "B": 6, "C": 4, "D": 2})
+
+    plan = planner.plan({"A": 8, "B": 6, "C": 5, "D": 2, "E": 1}, previous)
+
+    for competition in ("A", "B", "C", "D"):
+        assert plan.shard_of(competition) == previous.shard_of(competition)
+    assert plan.loads == (11, 11)
+
+
+def test_plan_redistributes_when_sticky_assignment_is_unbalanced() -> None:
+    planner = ShardPlanner(max_fixtures_per_shard=10, max_shards=2, imbalance_tolerance=1.2)
+    previous = planner.plan({"A": 6, "B": 6, "C": 5, "D": 3})
+    assert previous.shard_of("A") == previous.shard_of("C")
+
+    # "A" crece y su shard de siempre quedaría con 25 de 34 partidos
+    plan = planner.plan({"A": 20, "B": 6, "C": 5, "D": 3}, previous)
+
+    assert plan.loads == (20, 14)
+    assert plan.shard_of("A") != plan.shard_of("C")
+
+
+class FakePage:
+    def __init__(self, fail: bool = False, calls_wanted: int = 0) -> None:
+        self.fail = fail
+        self.calls: list[object] = []
+        self.calls_wanted = calls_wanted
+        self.enough_calls = asyncio.Event()
+
+    async def evaluate(self, script: str, argument: object = None) -> list[object]:
+        self.calls.append(argument)
+        if len(self.calls) >= self.calls_wanted:
+            self.enough_calls.set()
+        if self.fail:
+            raise RuntimeError("Target closed")
+        return []
+
+
+def sharded_scraper(sizes: dict[str, int]) -> Bet365ShardedScraper:
+    scraper = Bet365ShardedScraper(None, ShardPlanner(max_fixtures_per_shard=100, max_shards=1))
+
+    async def fake_survey() -> dict[str, int]:
+        return sizes
+
+    scraper._survey = fake_survey
+    return scraper
+
+
+def test_rebalance_reapplies_focus_when_plan_is_unchanged() -> None:
+    scraper = sharded_scraper({"Liga": 3})
+    page = FakePage()
+    shard = _ShardTab(index=0, page=page)
+    scraper._shards = [shard]
+
+    async def rebalance_twice() -> list[bool]:
+        # Tarea ya en marcha: el reequilibrado no debe lanzar otro bucle
+        shard.task = asyncio.get_running_loop().create_future()  # type: ignore[assignment]
+        return [await scraper.rebalance(), await scraper.rebalance()]
+
+    assert asyncio.run(rebalance_twice()) == [True, False]
+    assert page.calls == [["Liga"], ["Liga"]]
+
+
+@pytest.mark.parametrize("page_fails", [True, False])
+def test_shard_drops_matches_after_repeated_failures(page_fails: bool) -> None:
+    scraper = sharded_scraper({})
+    scraper._base_interval_seconds = 0.0
+    page = FakePage(fail=page_fails, calls_wanted=SHARD_MAX_FAILURES)
+    shard = _ShardTab(index=0, page=page, interval_seconds=0.0)
+    shard.matches = ["partido viejo"]  # type: ignore[list-item]
+
+    async def run_until_failures() -> None:
+        task = asyncio.create_task(scraper._run_shard(shard))
+        await asyncio.wait_for(page.enough_calls.wait(), timeout=1.0)
+        task.cancel()
+
+    asyncio.run(run_until_failures())
+
+    assert shard.matches == []
+    assert shard.healthy is not page_fails
@@ -0,0 +1,131 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from src.engine.team_name_journal import TeamNameMappingsJournal, read_journal_entries
+from src.engine.team_name_normalizer import TeamNameNormalizer, save_team_name_mappings
+
+
+def build_journal(
+    tmp_path: Path, **options: float
+) -> tuple[TeamNameMappingsJournal, TeamNameNormalizer]:
+    mapping_file = tmp_path / "team_name_mappings.json"
+    save_team_name_mappings(mapping_file, {"winamax": {"Inter Milan": "Inter"}})
+    journal = TeamNameMappingsJournal(mapping_file, tmp_path / "mappings.journal", **options)
+    normalizer = TeamNameNormalizer(journal.load(), mapping_file, loader=journal.load)
+    return journal, normalizer
+
+
+def link(
+    journal: TeamNameMappingsJournal, normalizer: TeamNameNormalizer, source: str, target: str
+) -> None:
+    normalizer.upsert_matches("winamax", [(source, "Sevilla FC", target, "Sevilla")])
+    journal.extend([("winamax", source, target), ("winamax", "Sevilla FC", "Sevilla")])
+
+
+def saved_mappings(tmp_path: Path) -> dict[str, dict[str, str]]:
+    return json.loads((tmp_path / "team_name_mappings.json").read_text(encoding="utf-8"))
+
+
+def test_flush_appends_batch_without_compacting(tmp_path: Path) -> None:
+    journal, normalizer = build_journal(tmp_path)
+    link(journal, normalizer, "R. Madrid", "Real Madrid")
+
+    asyncio.run(journal.flush(normalizer))
+
+    assert read_journal_entries(tmp_path / "mappings.journal") == [
+        ("winamax", "R. Madrid", "Real Madrid"),
+        ("winamax", "Sevilla FC", "Sevilla"),
+    ]
+    assert "R. Madrid" not in saved_mappings(tmp_path)["winamax"]
+
+
+def test_load_replays_journal_over_snapshot(tmp_path: Path) -> None:
+    journal, normalizer = build_journal(tmp_path)
+    link(journal, normalizer, "R. Madrid", "Real Madrid")
+    asyncio.run(journal.flush(normalizer))
+
+    reloaded = TeamNameMappingsJournal(
+        tmp_path / "team_name_mappings.json", tmp_path / "mappings.journal"
+    ).load()
+
+    assert reloaded["winamax"] == {
+        "Inter Milan": "Inter",
+        "R. Madrid": "Real Madrid",
+        "Sevilla FC": "Sevilla",
+    }
+
+
+def test_compaction_by_entry_count(tmp_path: Path) -> None:
+    journal, normalizer = build_journal(tmp_path, compact_every_entries=2)
+    link(journal, normalizer, "R. Madrid", "Real Madrid")
+
+    asyncio.run(journal.flush(normalizer))
+
+    assert saved_mappings(tmp_path)["winamax"]["R. Madrid"] == "Real Madrid"
+    assert read_journal_entries(tmp_path / "mappings.journal") == []
+
+
+def test_compaction_by_elapsed_time(tmp_path: Path) -> None:
+    journal, normalizer = build_journal(tmp_path, compact_interval_seconds=0.0)
+    link(journal, normalizer, "R. Madrid", "Real Madrid")
+
+    asyncio.run(journal.flush(normalizer))
+
+    assert saved_mappings(tmp_path)["winamax"]["R. Madrid"] == "Real Madrid"
+
+
+def test_cancelled_run_still_flushes_and_compacts(tmp_path: Path) -> None:
+    journal, normalizer = build_journal(tmp_path, flush_interval_seconds=60.0)
+
+    async def scenario() -> None:
+        task = asyncio.create_task(journal.run(asyncio.Event(), normalizer))
+        await asyncio.sleep(0)
+        normalizer.upsert_matches("winamax", [("R. Madrid", "Getafe CF", "Real Madrid", "Getafe")])
+        journal.append("winamax", "R. Madrid", "Real Madrid")
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+    assert saved_mappings(tmp_path)["winamax"]["R. Madrid"] == "Real Madrid"
+    assert read_journal_entries(tmp_path / "mappings.journal") == []
+
+
+def test_truncated_journal_lines_are_ignored(tmp_path: Path) -> None:
+    journal_file = tmp_path / "mappings.journal"
+    journal_file.write_text(
+        '{"site": "winamax", "source": "A", "target": "B"}\n{"site": "winamax", "sour',
+        encoding="utf-8",
+    )
+
+    assert read_journal_entries(journal_file) == [("winamax", "A", "B")]
+
+
+def test_failed_batch_write_is_requeued(tmp_path: Path) -> None:
+    journal, normalizer = build_journal(tmp_path)
+    (tmp_path / "mappings.journal").mkdir()
+    link(journal, normalizer, "R. Madrid", "Real Madrid")
+
+    with pytest.raises(IsADirectoryError):
+        asyncio.run(journal.flush(normalizer))
+    (tmp_path / "mappings.journal").rmdir()
+    asyncio.run(journal.flush(normalizer, force_compaction=True))
+
+    assert saved_mappings(tmp_path)["winamax"]["R. Madrid"] == "Real Madrid"
+
+
+def test_run_compacts_entries_left_by_previous_session(tmp_path: Path) -> None:
+    journal, normalizer = build_journal(tmp_path)
+    link(journal, normalizer, "R. Madrid", "Real Madrid")
+    asyncio.run(journal.flush(normalizer))
+    restarted, normalizer = build_journal(tmp_path)
+    stop_event = asyncio.Event()
+    stop_event.set()
+
+    asyncio.run(restarted.run(stop_event, normalizer))
+
+    assert saved_mappings(tmp_path)["winamax"]["R. Madrid"] == "Real Madrid"
+    assert read_journal_entries(tmp_path / "mappings.journal") == []
@@ -0,0 +1,62 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from src.engine.team_name_normalizer import (
+    TeamNameNormalizer,
+    compile_site_mapping,
+    fold_team_name,
+)
+
+
+@pytest.mark.parametrize(
+    ("team_name", "expected"),
+    [
+        ("Atlético de Madrid", "atletico de madrid"),
+        ("Sevilla FC", "sevilla"),
+        ("R. Madrid", "r madrid"),
+        ("FC", "fc"),
+    ],
+)
+def test_fold_team_name(team_name: str, expected: str) -> None:
+    assert fold_team_name(team_name) == expected
+
+
+def test_compile_resolves_alias_chains_and_cuts_cycles() -> None:
+    compiled = compile_site_mapping({"Man Utd": "Manchester Utd", "Manchester Utd": "Man United"})
+    assert compiled[fold_team_name("Man Utd")] == "Man United"
+
+    cyclic = compile_site_mapping({"A": "B", "B": "A"})
+    assert set(cyclic.values()) <= {"A", "B"}
+
+
+def test_resolve_uses_folded_names() -> None:
+    normalizer = TeamNameNormalizer({"Winamax": {"Sevilla FC": "Sevilla"}})
+
+    assert normalizer.resolve("winamax", "SEVILLA") == "Sevilla"
+    assert normalizer.resolve("winamax", "Betis") == "Betis"
+    assert normalizer.resolve("bet365", "Sevilla FC") == "Sevilla FC"
+
+
+def write_mappings(mapping_file: Path, content: str, mtime_ns: int) -> None:
+    mapping_file.write_text(content, encoding="utf-8")
+    os.utime(mapping_file, ns=(mtime_ns, mtime_ns))
+
+
+def test_failed_reload_is_retried_on_next_check(tmp_path: Path) -> None:
+    mapping_file = tmp_path / "team_name_mappings.json"
+    write_mappings(mapping_file, json.dumps({"winamax": {"A": "B"}}), 1_000_000_000)
+    normalizer = TeamNameNormalizer.from_file(mapping_file)
+
+    write_mappings(mapping_file, '{"winamax": {"A": ', 2_000_000_000)
+    with pytest.raises(json.JSONDecodeError):
+        normalizer.reload_if_changed()
+    assert normalizer.resolve("winamax", "A") == "B"
+
+    # El editor termina de escribir sin que cambie el mtime (misma resolución de reloj)
+    write_mappings(mapping_file, json.dumps({"winamax": {"A": "C"}}), 2_000_000_000)
+    assert normalizer.reload_if_changed()
+    assert normalizer.resolve("winamax", "A") == "C"
+    assert not normalizer.reload_if_changed()
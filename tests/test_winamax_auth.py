@@ -0,0 +1,70 @@
+import asyncio
+
+from src.scrapers.winamax.auth import ACCOUNT_SELECTOR, LOGIN_BUTTON_TEXT, is_winamax_session_active
+
+
+class FakeHeader:
+    """Cabecera que pinta el botón de login o el menú de cuenta al cabo de un rato."""
+
+    def __init__(self) -> None:
+        self.visible: set[str] = set()
+        self.changed = asyncio.Event()
+
+    def render(self, element: str) -> None:
+        self.visible.add(element)
+        self.changed.set()
+
+
+class FakeLocator:
+    def __init__(self, header: FakeHeader, elements: set[str]) -> None:
+        self._header = header
+        self._elements = elements
+
+    @property
+    def first(self) -> FakeLocator:
+        return self
+
+    def or_(self, other: FakeLocator) -> FakeLocator:
+        return FakeLocator(self._header, self._elements | other._elements)
+
+    async def is_visible(self) -> bool:
+        return bool(self._elements & self._header.visible)
+
+    async def wait_for(self, **options: float | str) -> None:
+        async with asyncio.timeout(float(options["timeout"]) / 1000):
+            while not await self.is_visible():
+                self._header.changed.clear()
+                await self._header.changed.wait()
+
+
+class FakePage:
+    def __init__(self, header: FakeHeader) -> None:
+        self._header = header
+
+    def get_by_text(self, text: str) -> FakeLocator:
+        return FakeLocator(self._header, {text})
+
+    def locator(self, selector: str) -> FakeLocator:
+        return FakeLocator(self._header, {selector})
+
+
+def check_session(rendered: str | None) -> bool:
+    async def scenario() -> bool:
+        header = FakeHeader()
+        if rendered is not None:
+            asyncio.get_running_loop().call_later(0.05, header.render, rendered)
+        return await is_winamax_session_active(FakePage(header), timeout_ms=200)
+
+    return asyncio.run(scenario())
+
+
+def test_late_login_button_is_not_a_session() -> None:
+    assert check_session(LOGIN_BUTTON_TEXT) is False
+
+
+def test_account_element_means_session() -> None:
+    assert check_session(ACCOUNT_SELECTOR) is True
+
+
+def test_empty_header_is_not_a_session() -> None:
+    assert check_session(None) is False
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from src.core.workers import (
+    MatchDeltaEncoder,
+    ProcessScraperProxy,
+    WorkerMessage,
+    decode_message,
+    encode_message,
+)
+from src.models.odds import MatchInfo
+
+
+def live_match(home_team: str, score_home: int = 0, observed_at_ms: float = 1000.0) -> MatchInfo:
+    return MatchInfo(
+        home_team=home_team,
+        away_team="Sevilla",
+        match_url=f"/match/{home_team}",
+        score_home=score_home,
+        observed_at_ms=observed_at_ms,
+        received_at_ms=observed_at_ms + 20,
+    )
+
+
+def roundtrip(message: WorkerMessage) -> WorkerMessage:
+    return decode_message(encode_message(message))
+
+
+def test_first_tick_sends_every_match_in_order() -> None:
+    encoder = MatchDeltaEncoder()
+
+    delta = encoder.diff([live_match("Betis", observed_at_ms=900.0), live_match("Celta")])
+
+    assert delta["type"] == "delta"
+    assert delta["seq"] == 1
+    assert delta["order"] == ["/match/Betis", "/match/Celta"]
+    assert [key for key, _ in delta["upsert"]] == ["/match/Betis", "/match/Celta"]
+    assert delta["remove"] == []
+    assert (delta["observed_at_ms"], delta["received_at_ms"]) == (900.0, 1020.0)
+
+
+def test_unchanged_tick_only_carries_the_stamps() -> None:
+    encoder = MatchDeltaEncoder()
+    encoder.diff([live_match("Betis")])
+
+    # Las marcas de tiempo cambian en cada tick y no cuentan como cambio del partido
+    tick = encoder.diff([live_match("Betis", observed_at_ms=2000.0)])
+
+    assert tick == {"type": "tick", "observed_at_ms": 2000.0, "received_at_ms": 2020.0}
+
+
+def test_removal_only_delta_has_no_upserts() -> None:
+    encoder = MatchDeltaEncoder()
+    encoder.diff([live_match("Betis"), live_match("Celta")])
+
+    delta = encoder.diff([live_match("Celta")])
+
+    assert delta["seq"] == 2
+    assert delta["upsert"] == []
+    assert delta["remove"] == ["/match/Betis"]
+    assert delta["order"] == ["/match/Celta"]
+
+
+def test_proxy_applies_removals_and_keeps_the_last_tick_stamps() -> None:
+    encoder = MatchDeltaEncoder()
+    proxy = ProcessScraperProxy("winamax", interval_seconds=1.0)
+
+    proxy._handle_message(roundtrip(encoder.diff([live_match("Betis"), live_match("Celta")])))
+    proxy._handle_message(roundtrip(encoder.diff([live_match("Celta", observed_at_ms=4000.0)])))
+    proxy._handle_message(roundtrip(encoder.diff([live_match("Celta", observed_at_ms=5000.0)])))
+
+    matches = asyncio.run(proxy.get_live_matches())
+
+    assert proxy.last_sequence == 2
+    assert [match.home_team for match in matches] == ["Celta"]
+    # Las marcas son las del último tick aunque no traiga cambios
+    assert (matches[0].observed_at_ms, matches[0].received_at_ms) == (5000.0, 5020.0)
+
+
+def test_proxy_reorders_without_refetching_unchanged_matches() -> None:
+    encoder = MatchDeltaEncoder()
+    proxy = ProcessScraperProxy("winamax", interval_seconds=1.0)
+    proxy._handle_message(roundtrip(encoder.diff([live_match("Betis"), live_match("Celta")])))
+
+    delta = encoder.diff([live_match("Celta"), live_match("Betis", score_home=1)])
+    proxy._handle_message(roundtrip(delta))
+
+    matches = asyncio.run(proxy.get_live_matches())
+    assert [key for key, _ in delta["upsert"]] == ["/match/Betis"]
+    assert [(match.home_team, match.score_home) for match in matches] == [
+        ("Celta", 0),
+        ("Betis", 1),
+    ]
+
+
+def test_dead_worker_drops_its_matches_and_restarts(monkeypatch: pytest.MonkeyPatch) -> None:
+    proxy = ProcessScraperProxy("bet365", interval_seconds=1.0)
+    proxy._handle_message(roundtrip(MatchDeltaEncoder().diff([live_match("Betis")])))
+    starts: list[bool] = []
+
+    async def closed_pipe() -> WorkerMessage:
+        raise EOFError
+
+    async def fake_start() -> bool:
+        starts.append(True)
+        return True
+
+    monkeypatch.setattr(proxy, "_receive", closed_pipe)
+    monkeypatch.setattr(proxy, "start", fake_start)
+
+    asyncio.run(proxy._read_deltas())
+
+    assert starts == [True]
+    assert asyncio.run(proxy.get_live_matches()) == []
+    assert proxy.last_sequence == 0